@@ -0,0 +1,148 @@
+"""
+Local stand-ins for OpenRouter and Tavily with configurable latency.
+They are registered through core.clients.override_client, so the agents run
+their real code paths (prompting, JSON repair, caching, rate limiting) and only
+the network round trip is simulated.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+from core.agents.rule_parser import rule_parse
+from core.clients import override_client
+from core.research import StubSearchBackend
+
+_RESUME_MARKERS = ("Résumé text:\n", "Résumé excerpt:\n", "Résumé:\n")
+_FRAGMENT_MARKER = "Extracted value:\n"
+_CONTEXT_MARKER = "\n\nRelevant résumé text:"
+
+REPORT_PARAGRAPH = (
+    "The candidate's experience with cloud platforms and distributed systems matches current demand. "
+    "Closing the gaps in infrastructure as code and observability would broaden the roles they can target. "
+)
+
+
+# Streamed completions arrive in pieces of this many characters, the first
+# after STREAM_FIRST_SHARE of the call's latency and the rest spread over the remainder.
+STREAM_CHUNK_CHARS = 40
+STREAM_FIRST_SHARE = 0.2
+
+
+@dataclass
+class FakeCompletion:
+    text: str
+    delta: Optional[str] = None
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass
+class FakeSearchResult:
+    text: str
+
+
+class Latency:
+    """Seeded latency model: `mean` seconds, uniformly spread by ±`jitter` (a fraction)."""
+
+    def __init__(self, mean: float, jitter: float = 0.2, seed: int = 0):
+        self.mean = mean
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            return max(0.0, self.mean * self._rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class FakeLLM:
+    """
+    Answers résumé-parsing prompts with the rule-based parse of the embedded
+    résumé, repair prompts with the fragment unchanged, and anything else
+    (analyst, synthesizer) with a canned Markdown report of `report_chars`.
+    """
+
+    def __init__(self, model: str, latency: Latency, report_chars: int = 2000):
+        self.model = model
+        self.latency = latency
+        self.report_chars = report_chars
+
+    def _answer(self, prompt: str) -> str:
+        if _FRAGMENT_MARKER in prompt:
+            return prompt.split(_FRAGMENT_MARKER, 1)[1].split(_CONTEXT_MARKER, 1)[0]
+        for marker in _RESUME_MARKERS:
+            if marker in prompt:
+                resume_text = prompt.split(marker, 1)[1]
+                return json.dumps(rule_parse(resume_text).data, default=str)
+        paragraphs = REPORT_PARAGRAPH * (self.report_chars // len(REPORT_PARAGRAPH) + 1)
+        return "## Gap Analysis\n\n" + paragraphs[:self.report_chars]
+
+    def complete(self, prompt: str, **kwargs: Any) -> FakeCompletion:
+        time.sleep(self.latency.sample())
+        return FakeCompletion(self._answer(prompt))
+
+    async def acomplete(self, prompt: str, **kwargs: Any) -> FakeCompletion:
+        await asyncio.sleep(self.latency.sample())
+        return FakeCompletion(self._answer(prompt))
+
+    def _pieces(self, prompt: str) -> List[Tuple[float, str]]:
+        """The answer in STREAM_CHUNK_CHARS pieces, each with the delay before it arrives."""
+        text, latency = self._answer(prompt), self.latency.sample()
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        rest = latency * (1 - STREAM_FIRST_SHARE) / max(1, len(pieces) - 1)
+        return [(latency * STREAM_FIRST_SHARE if i == 0 else rest, piece) for i, piece in enumerate(pieces)]
+
+    def stream_complete(self, prompt: str, **kwargs: Any) -> Iterator[FakeCompletion]:
+        text = ""
+        for delay, piece in self._pieces(prompt):
+            time.sleep(delay)
+            text += piece
+            yield FakeCompletion(text, delta=piece)
+
+    async def astream_complete(self, prompt: str, **kwargs: Any) -> AsyncIterator[FakeCompletion]:
+        # Like the real client: awaiting the call returns the async generator.
+        pieces = self._pieces(prompt)
+
+        async def gen() -> AsyncIterator[FakeCompletion]:
+            text = ""
+            for delay, piece in pieces:
+                await asyncio.sleep(delay)
+                text += piece
+                yield FakeCompletion(text, delta=piece)
+
+        return gen()
+
+
+class FakeTavily:
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self._results = StubSearchBackend()
+
+    def search(self, query: str, max_results: int = 3) -> List[FakeSearchResult]:
+        time.sleep(self.latency.sample())
+        return [FakeSearchResult(text) for text in self._results.search(query, max_results=max_results)]
+
+
+def install_fakes(
+        llm_latency: float = 0.5,
+        search_latency: float = 0.3,
+        jitter: float = 0.2,
+        report_chars: int = 2000,
+        seed: int = 0,
+) -> None:
+    """Route every OpenRouter and Tavily client through the fakes."""
+    llm_delay = Latency(llm_latency, jitter, seed)
+    search_delay = Latency(search_latency, jitter, seed + 1)
+    override_client("openrouter", lambda model, temperature, max_tokens: FakeLLM(model, llm_delay, report_chars))
+    override_client("tavily", lambda: FakeTavily(search_delay))
+
+
+def uninstall_fakes() -> None:
+    override_client("openrouter", None)
+    override_client("tavily", None)
@@ -0,0 +1,270 @@
+"""
+Offline benchmark: python -m bench.run [--count 5] [--llm-latency 0.5] ...
+
+Generates a synthetic corpus, then measures three phases against the local
+fake LLM and search backend (no API keys, no network):
+  - extract:  ResumeTextExtractorTool per file kind (text PDF, scanned PDF, PNG, JPEG, long CV)
+  - parse:    parse_resume_agent per résumé
+  - workflow: the full agent DAG, `--concurrency` résumés at once, timed per stage
+
+Each row reports count, errors, throughput (items/s of wall time), p50/p95
+latency and the process's peak memory after the phase. Caches live in a fresh
+temporary directory, so every run starts cold.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from bench.synthetic import KINDS, generate_corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class PhaseStats:
+    phase: str
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    peak_heap_mb: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.wall_seconds if self.wall_seconds else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "phase": self.phase,
+            "name": self.name,
+            "count": self.count,
+            "errors": self.errors,
+            "throughput_per_s": round(self.throughput, 3),
+            "p50_ms": round(self.percentile(0.50) * 1000, 1),
+            "p95_ms": round(self.percentile(0.95) * 1000, 1),
+            "peak_rss_mb": self.peak_rss_mb,
+            "peak_heap_mb": self.peak_heap_mb,
+        }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextlib.contextmanager
+def _measure(rows: List[PhaseStats]):
+    """Times the block as the phase's wall clock and records peak memory on its rows."""
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        yield
+    wall = time.perf_counter() - started
+    heap = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1) if tracemalloc.is_tracing() else None
+    for row in rows:
+        row.wall_seconds = row.wall_seconds or wall
+        row.peak_rss_mb = _peak_rss_mb()
+        row.peak_heap_mb = heap
+
+
+# ------------------------ Phases ------------------------ #
+
+def bench_extract(corpus) -> List[PhaseStats]:
+    from core.tools.text_tools import ResumeTextExtractorTool
+
+    extractor = ResumeTextExtractorTool(use_cache=False)
+    rows = {kind: PhaseStats("extract", kind) for kind in dict.fromkeys(item.kind for item in corpus)}
+    with _measure(list(rows.values())):
+        for kind, row in rows.items():
+            started = time.perf_counter()
+            for item in corpus:
+                if item.kind != kind:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    extractor.run(item.path)
+                except Exception as e:
+                    row.errors += 1
+                    print(f"extract {item.path}: {e}", file=sys.stderr)
+                    continue
+                row.latencies.append(time.perf_counter() - t0)
+            row.wall_seconds = time.perf_counter() - started
+    return list(rows.values())
+
+
+def bench_parse(texts: List[str]) -> List[PhaseStats]:
+    from core.agents.parse_resume_agent import parse_resume_agent
+    from core.models import AnalysisState
+
+    row = PhaseStats("parse", "parse_resume_agent")
+    with _measure([row]):
+        for text in texts:
+            t0 = time.perf_counter()
+            state = parse_resume_agent(AnalysisState(raw_resume_text=text))
+            if state.structured_resume is None:
+                row.errors += 1
+                continue
+            row.latencies.append(time.perf_counter() - t0)
+    return [row]
+
+
+def _timed(func: Callable, latencies: List[float]) -> Callable:
+    if asyncio.iscoroutinefunction(func):
+        async def timed_async(state):
+            t0 = time.perf_counter()
+            result = await func(state)
+            latencies.append(time.perf_counter() - t0)
+            return result
+        return timed_async
+
+    def timed(state):
+        t0 = time.perf_counter()
+        result = func(state)
+        latencies.append(time.perf_counter() - t0)
+        return result
+    return timed
+
+
+def bench_workflow(texts: List[str], concurrency: int) -> List[PhaseStats]:
+    from core.models import AnalysisState
+    from core.pipeline import PipelineExecutor
+    from core.workflow import PIPELINE_STAGES
+
+    stage_rows = {stage.name: PhaseStats("workflow", stage.name) for stage in PIPELINE_STAGES}
+    total = PhaseStats("workflow", "end_to_end")
+    executor = PipelineExecutor(
+        replace(stage, func=_timed(stage.func, stage_rows[stage.name].latencies)) for stage in PIPELINE_STAGES
+    )
+
+    async def run_one(state, limit: asyncio.Semaphore):
+        async with limit:
+            t0 = time.perf_counter()
+            try:
+                await executor.run(state)
+            except Exception as e:
+                total.errors += 1
+                print(f"workflow: {e!r}", file=sys.stderr)
+                return
+            total.latencies.append(time.perf_counter() - t0)
+
+    async def run_all():
+        limit = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(run_one(AnalysisState(raw_resume_text=text), limit) for text in texts))
+
+    rows = [*stage_rows.values(), total]
+    try:
+        with _measure(rows):
+            asyncio.run(run_all())
+    finally:
+        executor.shutdown()
+    return rows
+
+
+# ------------------------ Report ------------------------ #
+
+def format_report(rows: List[PhaseStats], settings: Dict[str, Any]) -> str:
+    lines = ["--- 📊 BENCHMARK ---", "  ".join(f"{key}={value}" for key, value in settings.items()), ""]
+    header = f"{'phase':<9} {'name':<20} {'n':>4} {'err':>4} {'items/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'peak RSS MB':>12}"
+    lines += [header, "-" * len(header)]
+    for row in rows:
+        s = row.summary()
+        lines.append(
+            f"{s['phase']:<9} {s['name']:<20} {s['count']:>4} {s['errors']:>4} {s['throughput_per_s']:>9.2f} "
+            f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['peak_rss_mb'] if s['peak_rss_mb'] is not None else '-':>12}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline résumé analyser benchmark.")
+    parser.add_argument("--count", type=int, default=5, help="Résumés generated per kind.")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS), help="Résumé kinds to generate.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Mean fake LLM latency in seconds.")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Mean fake search latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency spread, as a fraction of the mean.")
+    parser.add_argument("--report-chars", type=int, default=2000, help="Length of fake analyst/synthesizer output.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Résumés inside the workflow at once.")
+    parser.add_argument("--phases", nargs="+", choices=("extract", "parse", "workflow"),
+                        default=["extract", "parse", "workflow"])
+    parser.add_argument("--corpus-dir", default=None, help="Where to write the corpus (default: a temp dir).")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report peak Python heap (slower).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # Caches always live in a temporary directory; the corpus does too unless --corpus-dir keeps it.
+    # Open SQLite handles can block the cleanup on Windows; a leftover cache is harmless there.
+    with tempfile.TemporaryDirectory(prefix="resume-bench-", ignore_cleanup_errors=True) as workdir:
+        run_benchmarks(args, workdir)
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: str) -> None:
+    # Must be set before core is imported: cache locations are read at import time.
+    os.environ["RESUME_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["RESUME_TEXT_CACHE"] = "0"
+    os.environ["LLM_CACHE_MODE"] = "off"
+    os.environ["SEARCH_BACKEND"] = "tavily"
+
+    from loguru import logger
+
+    from bench.fakes import install_fakes
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    install_fakes(args.llm_latency, args.search_latency, args.jitter, args.report_chars, args.seed)
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    corpus = generate_corpus(args.corpus_dir or os.path.join(workdir, "corpus"), args.count, args.kinds, args.seed)
+    texts = [item.text for item in corpus]
+
+    rows: List[PhaseStats] = []
+    if "extract" in args.phases:
+        rows += bench_extract(corpus)
+    if "parse" in args.phases:
+        rows += bench_parse(texts)
+    if "workflow" in args.phases:
+        rows += bench_workflow(texts, args.concurrency)
+
+    settings = {
+        "count": args.count, "kinds": ",".join(args.kinds), "llm_latency": args.llm_latency,
+        "search_latency": args.search_latency, "jitter": args.jitter, "concurrency": args.concurrency,
+    }
+    print(format_report(rows, settings))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "results": [row.summary() for row in rows]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
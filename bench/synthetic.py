@@ -0,0 +1,189 @@
+"""
+Synthetic résumé generator for the benchmark suite.
+Résumés are built from a seeded RNG, so a given seed always yields the same
+corpus. Every résumé can be written as a text-layer PDF, a scanned (image-only)
+PDF, or a PNG/JPEG image; long CVs span several pages.
+"""
+
+import io
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import pymupdf as fitz
+from PIL import Image, ImageDraw, ImageFont
+
+KINDS = ("text_pdf", "scanned_pdf", "png", "jpeg", "long_pdf")
+
+FIRST_NAMES = ["Aisha", "Carlos", "Mei", "Jonas", "Priya", "Tom", "Fatima", "Luca", "Sofia", "Kenji", "Amara", "Noah"]
+LAST_NAMES = ["Khan", "Garcia", "Chen", "Müller", "Sharma", "Walsh", "Haddad", "Rossi", "Novak", "Tanaka", "Okafor"]
+CITIES = ["Austin, TX", "Berlin, Germany", "Toronto, Canada", "London, UK", "Bangalore, India", "Seattle, WA"]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Data Scientist", "Backend Developer",
+    "DevOps Engineer", "Machine Learning Engineer", "Product Analyst", "Engineering Manager",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli"]
+UNIVERSITIES = ["University of Toronto", "Stanford University", "Technical University of Munich", "IIT Bombay"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science", "B.Tech in Electronics"]
+SKILLS = {
+    "Languages": ["Python", "Go", "Java", "TypeScript", "SQL", "Rust", "C++"],
+    "Cloud": ["AWS", "GCP", "Azure", "Kubernetes", "Docker", "Terraform"],
+    "Data": ["PostgreSQL", "Kafka", "Spark", "Airflow", "Redis", "Pandas"],
+}
+CERTIFICATIONS = [
+    ("AWS Certified Solutions Architect", "Amazon Web Services"),
+    ("Certified Kubernetes Administrator", "CNCF"),
+    ("Professional Data Engineer", "Google Cloud"),
+]
+ACHIEVEMENTS = [
+    "Designed and shipped {skill} services handling millions of requests per day.",
+    "Reduced p95 latency by {pct}% by profiling hot paths and introducing caching.",
+    "Led a team of {n} engineers delivering a migration to {skill} ahead of schedule.",
+    "Built CI/CD pipelines with {skill}, cutting release time from days to hours.",
+    "Mentored junior engineers and ran weekly design reviews.",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, points
+MARGIN = 54
+FONT_SIZE = 10
+LINE_HEIGHT = 13
+SCAN_DPI = 200
+
+
+@dataclass
+class SyntheticResume:
+    kind: str
+    path: str
+    text: str
+
+
+def resume_text(rng: random.Random, jobs: int = 3, projects: int = 2) -> str:
+    """Plain résumé text with the headings and layouts real résumés use."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".").replace("ü", "u")
+    skills = {category: rng.sample(values, 4) for category, values in SKILLS.items()}
+    flat_skills = [skill for values in skills.values() for skill in values]
+
+    lines = [
+        name,
+        f"{handle}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)} | {rng.choice(CITIES)}",
+        f"https://linkedin.com/in/{handle.replace('.', '-')} | https://github.com/{handle.replace('.', '')}",
+        "",
+        "Summary",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience building reliable, "
+        f"scalable systems with {', '.join(flat_skills[:3])}.",
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for i in range(jobs):
+        end = "Present" if i == 0 else f"{rng.choice(MONTHS)} {year}"
+        year -= rng.randint(1, 3)
+        start = f"{rng.choice(MONTHS)} {year}"
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {rng.choice(CITIES)} | {start} - {end}")
+        for template in rng.sample(ACHIEVEMENTS, 3):
+            lines.append("• " + template.format(skill=rng.choice(flat_skills), pct=rng.randint(10, 60),
+                                                n=rng.randint(3, 12)))
+        lines.append("")
+
+    lines.append("Education")
+    lines.append(f"{rng.choice(DEGREES)} | {rng.choice(UNIVERSITIES)} | {year - 4} - {year}")
+    lines.append("")
+
+    lines.append("Projects")
+    for i in range(projects):
+        lines.append(f"Project {chr(65 + i % 26)}{i // 26 or ''} | https://github.com/{handle.replace('.', '')}/p{i}")
+        lines.append(f"Open-source tool for {rng.choice(['log analysis', 'feature stores', 'load testing'])}.")
+        lines.append(f"Tech: {', '.join(rng.sample(flat_skills, 3))}")
+    lines.append("")
+
+    lines.append("Certifications")
+    for cert, issuer in rng.sample(CERTIFICATIONS, 2):
+        lines.append(f"{cert} | {issuer} | {rng.choice(MONTHS)} {rng.randint(2018, 2024)}")
+    lines.append("")
+
+    lines.append("Skills")
+    for category, values in skills.items():
+        lines.append(f"{category}: {', '.join(values)}")
+    lines.append("")
+    lines.append("Languages")
+    lines.append("English, " + rng.choice(["Spanish", "German", "Hindi", "Mandarin", "French"]))
+    return "\n".join(lines)
+
+
+def _pages(text: str) -> List[List[str]]:
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+    lines = text.splitlines()
+    return [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+
+def write_text_pdf(text: str, path: str) -> None:
+    with fitz.open() as doc:
+        for lines in _pages(text):
+            page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            for i, line in enumerate(lines):
+                page.insert_text((MARGIN, MARGIN + (i + 1) * LINE_HEIGHT), line, fontsize=FONT_SIZE)
+        doc.save(path)
+
+
+def render_pages(text: str, dpi: int = SCAN_DPI) -> List[Image.Image]:
+    """Each page rendered as a greyscale image, like a flatbed scan."""
+    scale = dpi / 72
+    font = ImageFont.load_default(size=round(FONT_SIZE * scale))
+    images = []
+    for lines in _pages(text):
+        image = Image.new("L", (round(PAGE_WIDTH * scale), round(PAGE_HEIGHT * scale)), 255)
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(lines):
+            draw.text((MARGIN * scale, (MARGIN + i * LINE_HEIGHT) * scale), line, fill=0, font=font)
+        images.append(image)
+    return images
+
+
+def write_scanned_pdf(text: str, path: str) -> None:
+    """PDF with one embedded image per page and no text layer, so extraction needs OCR."""
+    with fitz.open() as doc:
+        for image in render_pages(text):
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            page.insert_image(page.rect, stream=buffer.getvalue())
+        doc.save(path)
+
+
+def write_image(text: str, path: str, fmt: str) -> None:
+    """First page only: image résumés are single-page photos or screenshots."""
+    render_pages(text)[0].save(path, format=fmt)
+
+
+def generate_corpus(
+        out_dir: str,
+        count: int = 5,
+        kinds: Sequence[str] = KINDS,
+        seed: int = 0,
+) -> List[SyntheticResume]:
+    """Write `count` résumés of each kind to out_dir."""
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        raise ValueError(f"Unknown résumé kinds {sorted(unknown)}; expected a subset of {KINDS}")
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = []
+    for kind in kinds:
+        for i in range(count):
+            if kind == "long_pdf":
+                text = resume_text(rng, jobs=rng.randint(10, 14), projects=rng.randint(8, 12))
+            else:
+                text = resume_text(rng)
+            extension = {"png": "png", "jpeg": "jpg"}.get(kind, "pdf")
+            path = os.path.join(out_dir, f"{kind}_{i:03d}.{extension}")
+            if kind in ("text_pdf", "long_pdf"):
+                write_text_pdf(text, path)
+            elif kind == "scanned_pdf":
+                write_scanned_pdf(text, path)
+            else:
+                write_image(text, path, "PNG" if kind == "png" else "JPEG")
+            corpus.append(SyntheticResume(kind=kind, path=path, text=text))
+    return corpus
@@ -0,0 +1,203 @@
+# In core/agents/__init__.py
+from typing import AsyncIterator, Iterator
+
+from core.agents.parse_resume_agent import parse_resume_agent
+from core.checkpoints import refresh_requested
+from core.llm import CachedLLM, get_llm
+from core.models import AnalysisState
+from core.research import get_research_cache
+
+ANALYST_MODEL = "google/gemini-pro"
+SYNTHESIZER_MODEL = "deepseek/deepseek-chat"
+
+# --- Agent 2: The Market Researcher (using Tavily) ---
+# This agent uses the parsed résumé to search for current market trends.
+
+def research_market_agent(state: AnalysisState) -> AnalysisState:
+    """
+    Researches job market trends based on the parsed resume.
+    Uses Tavily for real-time, high-quality web search results.
+    """
+    print("\n🤖 Running Agent 2: The Researcher (Tool: Tavily)")
+    if not state.structured_resume:
+        raise ValueError("Cannot run researcher without structured resume data.")
+
+    # Formulate a search query based on the resume
+    most_recent_role = state.structured_resume.work_experience[
+        0].title if state.structured_resume.work_experience else "entry-level"
+    top_skills = [skill for bucket in state.structured_resume.skills for skill in bucket.skills][:5]
+    key_skills = ", ".join(top_skills)
+    query = f"Current job market trends, in-demand skills, and typical salary for a '{most_recent_role}' with skills in {key_skills}."
+
+    print(f"🔎 Conducting search with query: '{query}'")
+
+    # Candidates with the same role and skills share one cached (or in-flight) search
+    state.market_research = get_research_cache().lookup(
+        role=most_recent_role,
+        skills=top_skills,
+        query=query,
+        max_results=3,
+        refresh=refresh_requested(),
+    )
+
+    print("✅ Researcher finished. Market data collected.")
+    return state
+
+
+# --- Agent 3: The Analyst (using Gemini Pro) ---
+# This agent compares the resume against the market research to find gaps.
+
+def analyze_gaps_agent(state: AnalysisState) -> AnalysisState:
+    """
+    Analyzes the gap between the candidate's skills and the market demands.
+    Uses Gemini Pro for its strong reasoning and analytical capabilities.
+    """
+    print("\n🤖 Running Agent 3: The Analyst (Model: Gemini Pro)")
+    prompt = _analyst_prompt(state)
+
+    print("🧠 Performing gap analysis...")
+    response = _analyst_llm().complete(prompt)
+    state.gap_analysis = str(response)
+
+    print("✅ Analyst finished. Gap analysis complete.")
+    return state
+
+
+async def analyze_gaps_agent_async(state: AnalysisState) -> AnalysisState:
+    """Same as analyze_gaps_agent, without blocking the event loop on the completion."""
+    print("\n🤖 Running Agent 3: The Analyst (Model: Gemini Pro)")
+    prompt = _analyst_prompt(state)
+
+    print("🧠 Performing gap analysis...")
+    response = await _analyst_llm().acomplete(prompt)
+    state.gap_analysis = str(response)
+
+    print("✅ Analyst finished. Gap analysis complete.")
+    return state
+
+
+def _analyst_llm() -> CachedLLM:
+    # Initialize the LLM for this agent
+    return get_llm(model=ANALYST_MODEL, temperature=0.2)
+
+
+def _analyst_prompt(state: AnalysisState) -> str:
+    if not state.structured_resume or not state.market_research:
+        raise ValueError("Cannot run analyst without resume data and market research.")
+
+    # Create a detailed prompt for the analysis
+    candidate_profile = state.structured_resume.model_dump_json(indent=2)
+    return f"""
+    You are an expert career analyst. Your task is to perform a detailed gap analysis for a candidate based on their resume and current market research.
+
+    **Candidate's Profile:**
+    ```json
+    {candidate_profile}
+    ```
+
+    **Live Market Research Summary:**
+    ```
+    {state.market_research}
+    ```
+
+{_scored_gaps_section(state)}
+    **Your Analysis Task:**
+    Based on the information above, provide a structured analysis in MARKDOWN format. The analysis must include:
+    1.  **Top 3 Job Recommendations:** Suggest three specific job titles that are a strong match.
+    2.  **Key Strengths:** List the candidate's top 3-5 skills and experiences that are highly relevant to the current market.
+    3.  **Skill Gap Analysis:** Identify the top 3-5 skills that are in-demand according to the market research but are MISSING from the candidate's resume.
+    4.  **Actionable Advice:** For each missing skill, provide a concrete suggestion on how the candidate can learn it (e.g., "Take a course on Coursera for 'Advanced SQL'").
+    """
+
+
+def _scored_gaps_section(state: AnalysisState) -> str:
+    scored = state.scored_gaps
+    if scored is None:
+        return ""
+    return f"""
+    **Skill Scoring (computed from the résumé and the research; treat as ground truth):**
+    - Market coverage: {scored.market_coverage or 0:.0%}
+    - Matched in-demand skills: {", ".join(scored.candidate_strengths) or "none"}
+    - Missing in-demand skills: {", ".join(scored.candidate_gaps) or "none"}
+    - Of those, mentioned without listed or on-the-job evidence: {", ".join(scored.candidate_mentions) or "none"}
+    Base the Key Strengths and Skill Gap Analysis on these lists; your job is to explain them.
+"""
+
+
+# --- Agent 4: The Synthesizer (using DeepSeek) ---
+# This agent takes the technical analysis and writes a user-friendly final report.
+
+def synthesize_report_agent(state: AnalysisState) -> str:
+    """
+    Synthesizes all the information into a polished, user-friendly report.
+    Uses DeepSeek for its high-quality, natural language generation.
+    """
+    print("\n🤖 Running Agent 4: The Synthesizer (Model: DeepSeek)")
+    prompt = _synthesizer_prompt(state)
+
+    print("✍️ Writing final report...")
+    final_report = _synthesizer_llm().complete(prompt)
+
+    print("✅ Synthesizer finished. Report is ready.")
+    return str(final_report)
+
+
+async def synthesize_report_agent_async(state: AnalysisState) -> str:
+    """Same as synthesize_report_agent, without blocking the event loop on the completion."""
+    print("\n🤖 Running Agent 4: The Synthesizer (Model: DeepSeek)")
+    prompt = _synthesizer_prompt(state)
+
+    print("✍️ Writing final report...")
+    final_report = await _synthesizer_llm().acomplete(prompt)
+
+    print("✅ Synthesizer finished. Report is ready.")
+    return str(final_report)
+
+
+def synthesize_report_agent_stream(state: AnalysisState) -> Iterator[str]:
+    """Same as synthesize_report_agent, yielding the report piece by piece as it is written."""
+    print("\n🤖 Running Agent 4: The Synthesizer (Model: DeepSeek)")
+    prompt = _synthesizer_prompt(state)
+
+    print("✍️ Writing final report...")
+    yield from _synthesizer_llm().stream_complete(prompt)
+
+    print("\n✅ Synthesizer finished. Report is ready.")
+
+
+async def synthesize_report_agent_astream(state: AnalysisState) -> AsyncIterator[str]:
+    """Async counterpart of synthesize_report_agent_stream."""
+    print("\n🤖 Running Agent 4: The Synthesizer (Model: DeepSeek)")
+    prompt = _synthesizer_prompt(state)
+
+    print("✍️ Writing final report...")
+    async for text in _synthesizer_llm().astream_complete(prompt):
+        yield text
+
+    print("\n✅ Synthesizer finished. Report is ready.")
+
+
+def _synthesizer_llm() -> CachedLLM:
+    # Initialize the LLM for this agent
+    return get_llm(model=SYNTHESIZER_MODEL, temperature=0.5)
+
+
+def _synthesizer_prompt(state: AnalysisState) -> str:
+    if not state.gap_analysis or not state.structured_resume:
+        raise ValueError("Cannot synthesize report without a gap analysis.")
+
+    candidate_name = state.structured_resume.contact.full_name
+    return f"""
+    You are a friendly and encouraging career coach. Your task is to write a final, polished report for a candidate named {candidate_name}.
+    You will be given a technical gap analysis. Rewrite it into a personalized, easy-to-read, and motivational report.
+
+    Address the candidate directly by their name. Use clear headings, bullet points, and a supportive tone.
+    Do NOT just copy the input; rephrase it to be more conversational.
+
+    **Technical Analysis to Synthesize:**
+    ```markdown
+    {state.gap_analysis}
+    ```
+
+    Now, please write the final, beautiful report for {candidate_name}.
+    """
@@ -3,19 +3,53 @@ Agent 1: Resume Parser
 Responsible for turning raw résumé text → StructuredResume
 """
 
+import contextvars
 import json
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-import langdetect
-from langdetect.lang_detect_exception import LangDetectException
-from llama_index.llms.openrouter import OpenRouter
 from loguru import logger
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
-from core.models import StructuredResume, AnalysisState
-from core.tools.text_tools import ResumeTextExtractorTool
-from core.utils import normalise_dates, extract_emails
+from core.agents.rule_parser import rule_parse
+from core.hedging import hedged
+from core.llm import CachedLLM, get_llm
+from core.models import (
+    AnalysisState,
+    Certification,
+    Contact,
+    EducationItem,
+    ProjectItem,
+    SkillBucket,
+    StructuredResume,
+    WorkItem,
+)
+from core.tools.text_tools import ResumeTextExtractorTool, get_text_cache
+from core.tracing import CHARS_PER_TOKEN, span
+from core.utils import detect_languages, extract_emails, normalise_skill, normalise_structured_dates
+from core.utils.json_repair import loads_lenient
+from core.utils.sections import HEADER_SECTION, Chunk, chunk_sections, sections_by_name
+
+# Rule-based fast path: fields scored below the threshold are re-asked from the LLM,
+# and with more than FAST_PARSE_MAX_LLM_FIELDS of them the whole résumé goes to the LLM.
+FAST_PARSE_ENABLED = os.getenv("FAST_PARSE", "1") != "0"
+FAST_PARSE_MIN_CONFIDENCE = float(os.getenv("FAST_PARSE_MIN_CONFIDENCE", "0.8"))
+FAST_PARSE_MAX_LLM_FIELDS = int(os.getenv("FAST_PARSE_MAX_LLM_FIELDS", "3"))
+# Targeted repair: rounds of re-asking for failing sub-objects, and how much
+# résumé text goes with each request when no matching section is found.
+MAX_REPAIR_ROUNDS = 2
+REPAIR_CONTEXT_CHARS = 4000
+# Chunked parsing: résumés over CHUNKED_PARSE_MIN_TOKENS are split into
+# section-aligned chunks of at most CHUNK_TOKENS, parsed concurrently and merged.
+CHUNKED_PARSE_ENABLED = os.getenv("CHUNKED_PARSE", "1") != "0"
+CHUNKED_PARSE_MIN_TOKENS = int(os.getenv("CHUNKED_PARSE_MIN_TOKENS", "4000"))
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "1500"))
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "8"))
+PARSE_MODEL = "kimi-ai/kimi-2"
+# Model for hedged and second-attempt parses (see core.hedging); the parse model when unset.
+PARSE_HEDGE_MODEL = os.getenv("PARSE_HEDGE_MODEL")
 
 # ------------------------ Prompt Templates ------------------------ #
 
@@ -31,6 +65,34 @@ Résumé text:
 {resume_text}
 """
 
+FIELDS_PROMPT = """
+You are a world-class résumé parser.
+Return **only** a valid JSON object with exactly these keys: {field_names}.
+Each value must conform to the matching property of the schema below.
+Dates should be ISO-8601 (YYYY-MM-DD) or null if missing.
+
+Schema:
+{schema_json}
+
+Résumé text:
+{resume_text}
+"""
+
+CHUNK_PROMPT = """
+You are a world-class résumé parser.
+The text below is one part of a longer résumé. Extract only what appears in it.
+Return **only** a valid JSON object with exactly these keys: {field_names}.
+Use an empty list or null for keys this part does not cover.
+Each value must conform to the matching property of the schema below.
+Dates should be ISO-8601 (YYYY-MM-DD) or null if missing.
+
+Schema:
+{schema_json}
+
+Résumé excerpt:
+{resume_text}
+"""
+
 FALLBACK_PROMPT = """
 The résumé below is poorly formatted or non-English.
 Think step by step and return valid JSON with these keys:
@@ -40,99 +102,541 @@ Think step by step and return valid JSON with these keys:
 - work_experience (list)
 - projects (list)
 - certifications (list)
-- skills (list of {category, skills})
+- skills (list of {{category, skills}})
 - languages (list)
 
 Résumé:
 {resume_text}
 """
 
+REPAIR_PROMPT = """
+A {target} extracted from a résumé failed validation.
+Return **only** the corrected JSON value for it, conforming to the schema below.
+Use null for optional values the résumé does not state.
+
+Validation errors:
+{errors}
+
+Schema:
+{schema_json}
+
+Extracted value:
+{fragment_json}
+
+Relevant résumé text:
+{context}
+"""
+
+
+# ------------------------ Schemas ------------------------ #
+
+LIST_ITEM_MODELS: Dict[str, Type[BaseModel]] = {
+    "education": EducationItem,
+    "work_experience": WorkItem,
+    "projects": ProjectItem,
+    "certifications": Certification,
+    "skills": SkillBucket,
+}
+OBJECT_MODELS: Dict[str, Type[BaseModel]] = {"contact": Contact}
+
+
+@lru_cache(maxsize=None)
+def _schema_json(model: Type[BaseModel]) -> str:
+    """Compact JSON schema, computed once per model."""
+    return json.dumps(model.model_json_schema(), separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def _fields_schema_json(fields: Tuple[str, ...]) -> str:
+    """StructuredResume schema cut down to the given top-level fields."""
+    schema = StructuredResume.model_json_schema()
+    schema["properties"] = {name: schema["properties"][name] for name in fields}
+    schema["required"] = [name for name in schema.get("required", []) if name in fields]
+    return json.dumps(schema, separators=(",", ":"))
+
 
 # ------------------------ Parsing Logic ------------------------ #
 
-def _validate_and_retry(
-        llm: OpenRouter,
-        resume_text: str,
-        attempt: int = 1,
-) -> Optional[StructuredResume]:
+def _hedge_llm(llm: CachedLLM) -> CachedLLM:
+    if not PARSE_HEDGE_MODEL:
+        return llm
+    return get_llm(model=PARSE_HEDGE_MODEL, temperature=llm.temperature, max_tokens=llm.max_tokens)
+
+
+def _full_attempt(llm: CachedLLM, resume_text: str, attempt: int) -> Optional[StructuredResume]:
     prompt = PARSE_PROMPT.format(
         resume_text=resume_text,
-        schema_json=StructuredResume.model_json_schema(),
+        schema_json=_schema_json(StructuredResume),
     )
-    raw_json = llm.complete(prompt).text.strip()
+    with span("parse.full", "parse", attempt=attempt) as record:
+        record.retries = attempt - 1
+        data = loads_lenient(llm.complete(prompt, attempt=attempt).text.strip())
+        record.attributes["valid_json"] = isinstance(data, dict)
+    structured = None
+    if not isinstance(data, dict):
+        logger.warning(f'Invalid JSON even after local repair (attempt {attempt})')
+    else:
+        structured = _validate_with_repair(llm, resume_text, data)
+    if structured is None:
+        # Otherwise the next run is served the same unusable answer from the cache.
+        llm.forget(prompt, attempt=attempt)
+    return structured
+
+
+def _fallback_attempt(llm: CachedLLM, resume_text: str) -> Optional[StructuredResume]:
+    logger.warning("Trying the fallback prompt")
+    prompt = FALLBACK_PROMPT.format(resume_text=resume_text)
+    with span("parse.fallback", "parse") as record:
+        data = loads_lenient(llm.complete(prompt).text.strip())
+        record.attributes["valid_json"] = isinstance(data, dict)
+    if not isinstance(data, dict):
+        logger.error("Fallback prompt also returned invalid JSON")
+        llm.forget(prompt)
+        return None
+    if "contact" not in data:
+        # The fallback prompt asks for flat contact keys.
+        data["contact"] = {key: data.pop(key) for key in list(data) if key in Contact.model_fields}
+    structured = _validate_with_repair(llm, resume_text, data)
+    if structured is None:
+        logger.error("Fallback prompt also failed validation")
+        llm.forget(prompt)
+    return structured
+
+
+def _validate_and_retry(llm: CachedLLM, resume_text: str) -> Optional[StructuredResume]:
+    """
+    Full parse, then a second full parse (on PARSE_HEDGE_MODEL when set), then
+    the fallback prompt. Each starts when the one before fails validation, or
+    earlier as a hedge when it runs past the usual parse latency.
+    """
+    return hedged("parse.hedged", [
+        partial(_full_attempt, llm, resume_text, 1),
+        partial(_full_attempt, _hedge_llm(llm), resume_text, 2),
+        partial(_fallback_attempt, llm, resume_text),
+    ])
+
+
+def _failing_targets(error: ValidationError) -> Dict[Tuple, List[str]]:
+    """
+    Group validation errors by the smallest sub-object worth re-asking for:
+    a list item such as ("education", 1), or a top-level field such as ("contact",).
+    """
+    targets: Dict[Tuple, List[str]] = {}
+    for err in error.errors():
+        loc = err["loc"]
+        if not loc:
+            continue
+        if loc[0] in LIST_ITEM_MODELS and len(loc) > 1 and isinstance(loc[1], int):
+            target = (loc[0], loc[1])
+        else:
+            target = (loc[0],)
+        where = ".".join(str(part) for part in loc)
+        targets.setdefault(target, []).append(f"{where}: {err['msg']}")
+    return targets
+
+
+def _target_schema(target: Tuple) -> str:
+    if len(target) == 2:
+        return _schema_json(LIST_ITEM_MODELS[target[0]])
+    if target[0] in OBJECT_MODELS:
+        return _schema_json(OBJECT_MODELS[target[0]])
+    return _fields_schema_json(target)
+
+
+def _repair_target(
+        llm: CachedLLM,
+        resume_text: str,
+        data: Dict[str, Any],
+        target: Tuple,
+        errors: List[str],
+) -> Optional[Any]:
+    """Re-ask the LLM for one failing sub-object, with only its section as context."""
+    field = target[0]
+    fragment = data[field][target[1]] if len(target) == 2 else data.get(field)
+    sections = sections_by_name(resume_text)
+    context = sections.get(HEADER_SECTION if field == "contact" else field) or resume_text
+    prompt = REPAIR_PROMPT.format(
+        target=f"{field}[{target[1]}] entry" if len(target) == 2 else f'"{field}" value',
+        errors="\n".join(errors),
+        schema_json=_target_schema(target),
+        fragment_json=json.dumps(fragment, default=str),
+        context=context[:REPAIR_CONTEXT_CHARS],
+    )
+    with span("parse.repair", "parse", target=".".join(str(part) for part in target)):
+        repaired = loads_lenient(llm.complete(prompt).text.strip())
+    if len(target) == 1 and isinstance(repaired, dict) and set(repaired) == {field}:
+        repaired = repaired[field]
+    return repaired
+
+
+def _drop_targets(data: Dict[str, Any], targets: List[Tuple]) -> bool:
+    """Last resort: drop failing list items and reset failing optional fields."""
+    for target in sorted(targets, key=lambda t: t[1] if len(t) == 2 else -1, reverse=True):
+        field = target[0]
+        if len(target) == 2:
+            del data[field][target[1]]
+        elif field in OBJECT_MODELS or StructuredResume.model_fields[field].is_required():
+            return False
+        else:
+            data.pop(field, None)
+    return True
 
+
+def _validate_with_repair(
+        llm: CachedLLM,
+        resume_text: str,
+        data: Dict[str, Any],
+) -> Optional[StructuredResume]:
+    """
+    Validate parsed JSON; on failure re-ask only for the failing sub-objects
+    (up to MAX_REPAIR_ROUNDS), then drop whatever still fails.
+    """
+    data = {key: value for key, value in data.items() if key in StructuredResume.model_fields}
+    for round_ in range(MAX_REPAIR_ROUNDS + 1):
+        try:
+            return StructuredResume(**data)
+        except ValidationError as e:
+            targets = _failing_targets(e)
+            logger.warning(f'Validation failed (repair round {round_}): {len(targets)} sub-objects')
+
+        if round_ == MAX_REPAIR_ROUNDS:
+            break
+        for target, errors in targets.items():
+            repaired = _repair_target(llm, resume_text, data, target, errors)
+            if repaired is None:
+                continue
+            if len(target) == 2:
+                data[target[0]][target[1]] = repaired
+            else:
+                data[target[0]] = repaired
+
+    if not _drop_targets(data, list(targets)):
+        return None
     try:
-        data = json.loads(raw_json)
         return StructuredResume(**data)
-    except (json.JSONDecodeError, ValidationError) as e:
-        logger.warning(f'Validation failed (attempt {attempt}): {e}')
-        if attempt >= 2:
-            logger.warning("Switching to fallback prompt")
-            prompt = FALLBACK_PROMPT.format(resume_text=resume_text)
-            raw_json = llm.complete(prompt).text.strip()
-            try:
-                data = json.loads(raw_json)
-                return StructuredResume(**data)
-            except Exception as e2:
-                logger.error(f'Fallback prompt also failed: {e2}')
-                return None
-        return _validate_and_retry(llm, resume_text, attempt + 1)
+    except ValidationError as e:
+        logger.error(f'Could not repair résumé JSON: {e}')
+        return None
 
 
-# ------------------------ Main Agent ------------------------ #
+def _parse_fields(
+        llm: CachedLLM,
+        resume_text: str,
+        fields: List[str],
+        excerpt: bool = False,
+        attempt: int = 1,
+) -> Optional[Dict[str, Any]]:
+    """Ask the LLM for only the given top-level StructuredResume fields (of one chunk, with excerpt)."""
+    prompt = (CHUNK_PROMPT if excerpt else FIELDS_PROMPT).format(
+        field_names=", ".join(fields),
+        schema_json=_fields_schema_json(tuple(fields)),
+        resume_text=resume_text,
+    )
+    with span("parse.fields", "parse", fields=fields):
+        data = loads_lenient(llm.complete(prompt, attempt=attempt).text.strip())
+    if not isinstance(data, dict):
+        logger.warning("Field-level parse returned invalid JSON")
+        llm.forget(prompt, attempt=attempt)
+        return None
+    return {name: data[name] for name in fields if name in data}
 
-def parse_resume_agent(state: AnalysisState) -> AnalysisState:
+
+def _fast_parse(llm: CachedLLM, resume_text: str) -> Optional[StructuredResume]:
     """
-    Entry point for Agent 1.
-    Accepts either:
-      - state.raw_resume_text already filled, or
-      - state.resume_file_path set and text will be extracted here.
+    Rule-based parse first; only fields below FAST_PARSE_MIN_CONFIDENCE go to the LLM.
+    Returns None when the fast path should give way to a full LLM parse.
     """
-    logger.info("🤖 Running Agent 1: Resume Parser")
+    with span("parse.rules", "parse") as record:
+        result = rule_parse(resume_text)
+        low = result.low_confidence_fields(FAST_PARSE_MIN_CONFIDENCE)
+        record.attributes["low_confidence_fields"] = low
+    if len(low) > FAST_PARSE_MAX_LLM_FIELDS:
+        logger.info(f'Fast path: {len(low)} low-confidence fields, using full LLM parse')
+        return None
 
-    # 0. Obtain raw text if not present
+    if low:
+        logger.info(f'Fast path: asking the LLM for {", ".join(low)}')
+        if _is_long(resume_text):
+            fields = _parse_fields_chunked(llm, resume_text, low)
+        else:
+            fields = _parse_fields(llm, resume_text, low)
+        if fields is None:
+            return None
+        result.data.update(fields)
+    else:
+        logger.info("Fast path: all fields parsed without the LLM")
+    return _validate_with_repair(llm, resume_text, result.data)
+
+
+# ------------------------ Chunked Parsing ------------------------ #
+
+# StructuredResume fields each section can contribute. A résumé without
+# recognised headings is one "header" section, so that maps to every field.
+SECTION_FIELDS: Dict[str, List[str]] = {
+    HEADER_SECTION: ["contact", "summary"],
+    "summary": ["summary"],
+    "education": ["education"],
+    "work_experience": ["work_experience"],
+    "projects": ["projects"],
+    "certifications": ["certifications"],
+    "skills": ["skills"],
+    "languages": ["languages"],
+}
+# Fields identifying one list entry, for merging an entry seen in two chunks.
+ITEM_KEYS: Dict[str, Tuple[str, ...]] = {
+    "education": ("institution", "degree"),
+    "work_experience": ("company", "title", "start_date"),
+    "projects": ("name",),
+    "certifications": ("name", "issuer"),
+}
+
+
+def _is_long(resume_text: str) -> bool:
+    return CHUNKED_PARSE_ENABLED and len(resume_text) > CHUNKED_PARSE_MIN_TOKENS * CHARS_PER_TOKEN
+
+
+def _chunk_fields(chunk: Chunk, only_header: bool) -> List[str]:
+    if only_header:
+        return list(StructuredResume.model_fields)
+    fields = [name for section in chunk.sections for name in SECTION_FIELDS.get(section, ())]
+    return list(dict.fromkeys(fields))
+
+
+def _empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _norm(value: Any) -> str:
+    return " ".join(str(value).lower().split()) if value is not None else ""
+
+
+def _merge_item(existing: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Fill gaps in an entry from a second sighting; descriptions and lists are combined."""
+    for key, value in new.items():
+        current = existing.get(key)
+        if _empty(current):
+            existing[key] = value
+        elif isinstance(current, str) and isinstance(value, str) and key == "description":
+            if value not in current:
+                existing[key] = f"{current}\n{value}"
+        elif isinstance(current, list) and isinstance(value, list):
+            seen = {_norm(item) for item in current}
+            for item in value:
+                if _norm(item) not in seen:
+                    seen.add(_norm(item))
+                    current.append(item)
+
+
+def _merge_skills(merged: List[Dict[str, Any]], buckets: List[Any]) -> None:
+    """Buckets merge by category; skills within one are de-duplicated through the taxonomy."""
+    for bucket in buckets:
+        if not isinstance(bucket, dict):
+            continue
+        target = next((item for item in merged if _norm(item.get("category")) == _norm(bucket.get("category"))), None)
+        if target is None:
+            target = {**bucket, "skills": []}
+            merged.append(target)
+        known = {normalise_skill(str(skill)) for skill in target["skills"]}
+        for skill in bucket.get("skills") or ():
+            if normalise_skill(str(skill)) not in known:
+                known.add(normalise_skill(str(skill)))
+                target["skills"].append(skill)
+
+
+def _merge_entries(merged: List[Any], items: List[Any], keys: Tuple[str, ...]) -> None:
+    """Entries with the same identifying fields are combined; anything unrecognisable is kept for validation."""
+    for item in items:
+        if not isinstance(item, dict):
+            merged.append(item)
+            continue
+        key = tuple(_norm(item.get(name)) for name in keys)
+        same = next(
+            (entry for entry in merged if isinstance(entry, dict) and tuple(_norm(entry.get(name)) for name in keys) == key),
+            None,
+        )
+        if same is None:
+            merged.append(dict(item))
+        else:
+            _merge_item(same, item)
+
+
+def _merge_fragments(fragments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-chunk parses in document order: the first value of a scalar
+    wins, list entries are de-duplicated by ITEM_KEYS, skill buckets by
+    category and skills through the taxonomy.
+    """
+    merged: Dict[str, Any] = {}
+    for fragment in fragments:
+        for field, value in fragment.items():
+            if _empty(value):
+                continue
+            if field == "contact" and isinstance(value, dict):
+                _merge_item(merged.setdefault("contact", {}), value)
+            elif field == "skills" and isinstance(value, list):
+                _merge_skills(merged.setdefault("skills", []), value)
+            elif field in ITEM_KEYS and isinstance(value, list):
+                _merge_entries(merged.setdefault(field, []), value, ITEM_KEYS[field])
+            elif field == "languages" and isinstance(value, list):
+                _merge_item(merged, {"languages": value})
+            elif field not in merged:
+                merged[field] = value
+    return merged
+
+
+def _parse_chunk(llm: CachedLLM, text: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+    """One chunk's fields; a chunk slower than usual is hedged, since the slowest chunk sets the latency."""
+    return hedged("parse.chunk", [
+        partial(_parse_fields, llm, text, fields, True),
+        partial(_parse_fields, _hedge_llm(llm), text, fields, True, 2),
+    ])
+
+
+def _parse_chunks(
+        llm: CachedLLM,
+        resume_text: str,
+        wanted: Optional[List[str]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse every chunk that can contribute to `wanted` (default: all fields)
+    concurrently. Fragments come back in document order. None when no chunk
+    applies or any chunk still fails after its retry: a merge without it would
+    silently lose those sections, so the caller parses the whole résumé instead.
+    """
+    chunks = chunk_sections(resume_text, CHUNK_TOKENS * CHARS_PER_TOKEN)
+    only_header = all(chunk.sections == [HEADER_SECTION] for chunk in chunks)
+    jobs = []
+    for chunk in chunks:
+        fields = [name for name in _chunk_fields(chunk, only_header) if wanted is None or name in wanted]
+        if fields:
+            jobs.append((chunk, fields))
+    if not jobs:
+        return None
+
+    with span("parse.chunked", "parse", chunks=len(jobs)):
+        with ThreadPoolExecutor(max_workers=min(CHUNK_CONCURRENCY, len(jobs)), thread_name_prefix="chunk") as pool:
+            # Each call runs in a copy of this context so its span nests under parse.chunked.
+            futures = [
+                pool.submit(contextvars.copy_context().run, _parse_chunk, llm, chunk.text, fields)
+                for chunk, fields in jobs
+            ]
+            fragments = [future.result() for future in futures]
+
+    failed = sum(fragment is None for fragment in fragments)
+    if failed:
+        logger.warning(f'{failed} of {len(jobs)} chunks returned invalid JSON; parsing the résumé whole')
+        return None
+    return fragments
+
+
+def _parse_fields_chunked(llm: CachedLLM, resume_text: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+    """_parse_fields for long résumés: only the chunks holding those fields are sent."""
+    fragments = _parse_chunks(llm, resume_text, fields)
+    if fragments is None:
+        return _parse_fields(llm, resume_text, fields)
+    return _merge_fragments(fragments)
+
+
+def _chunked_parse(llm: CachedLLM, resume_text: str) -> Optional[StructuredResume]:
+    """
+    Parse a long résumé chunk by chunk, so latency follows the slowest chunk
+    rather than the whole document, then validate (and repair) the merge.
+    """
+    fragments = _parse_chunks(llm, resume_text)
+    if fragments is None:
+        return None
+    return _validate_with_repair(llm, resume_text, _merge_fragments(fragments))
+
+
+# ------------------------ Agent Steps ------------------------ #
+# Each step reads and writes a distinct slice of AnalysisState, so the DAG
+# executor in core.workflow can overlap the deterministic ones with research.
+
+def extract_resume_text(state: AnalysisState) -> AnalysisState:
+    """Obtain raw text from resume_file_path if not present."""
     if not state.raw_resume_text and state.resume_file_path:
         logger.info(f'Extracting text from {state.resume_file_path}')
         state.raw_resume_text = ResumeTextExtractorTool().run(state.resume_file_path)
+    return state
+
 
+def parse_structured_resume(state: AnalysisState) -> AnalysisState:
+    """LLM extraction: raw_resume_text → structured_resume."""
     if not state.raw_resume_text:
         logger.error("❌ No résumé text available to parse.")
         return state
 
-    # 1. LLM extraction
-    llm = OpenRouter(
-        model="kimi-ai/kimi-2",
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        temperature=0.0,
-    )
+    llm = get_llm(model=PARSE_MODEL, temperature=0.0)
 
-    structured = _validate_and_retry(llm, state.raw_resume_text)
+    structured = _fast_parse(llm, state.raw_resume_text) if FAST_PARSE_ENABLED else None
+    if structured is None and _is_long(state.raw_resume_text):
+        structured = _chunked_parse(llm, state.raw_resume_text)
+    if structured is None:
+        structured = _validate_and_retry(llm, state.raw_resume_text)
     if structured is None:
         logger.error("❌ Failed to parse résumé after all attempts.")
         return state
 
-    # 2. Deterministic post-processing
-    for edu in structured.education:
-        edu.start_date = normalise_dates(edu.start_date)
-        edu.end_date = normalise_dates(edu.end_date)
+    state.structured_resume = structured
+    return state
+
+
+def normalise_resume_dates(state: AnalysisState) -> AnalysisState:
+    """Deterministic post-processing of education, work and certification dates."""
+    if state.structured_resume is not None:
+        with span("postprocess.dates", "postprocess"):
+            normalise_structured_dates(state.structured_resume)
+    return state
+
+
+def enrich_contact_email(state: AnalysisState) -> AnalysisState:
+    """Fill a missing contact email from the raw text."""
+    structured = state.structured_resume
+    if structured is None or structured.contact.email:
+        return state
+
+    emails = extract_emails(state.raw_resume_text)
+    if emails:
+        structured.contact.email = emails[0]
+    return state
+
 
-    for work in structured.work_experience:
-        work.start_date = normalise_dates(work.start_date)
-        work.end_date = normalise_dates(work.end_date)
+def detect_resume_language(state: AnalysisState) -> AnalysisState:
+    with span("postprocess.language", "postprocess") as record:
+        report = detect_languages(state.raw_resume_text, cache=get_text_cache())
+        record.attributes["language"] = report.language
+    state.detected_language = report.language
+    state.section_languages = report.sections
+    return state
+
+
+# ------------------------ Main Agent ------------------------ #
+
+def parse_resume_agent(state: AnalysisState) -> AnalysisState:
+    """
+    Entry point for Agent 1.
+    Accepts either:
+      - state.raw_resume_text already filled, or
+      - state.resume_file_path set and text will be extracted here.
+    """
+    logger.info("🤖 Running Agent 1: Resume Parser")
+
+    # 0. Obtain raw text if not present
+    state = extract_resume_text(state)
+
+    # 1. LLM extraction
+    state = parse_structured_resume(state)
+    if state.structured_resume is None:
+        return state
+
+    # 2. Deterministic post-processing
+    state = normalise_resume_dates(state)
 
     # 3. Email enrichment
-    if not structured.contact.email:
-        emails = extract_emails(state.raw_resume_text)
-        if emails:
-            structured.contact.email = emails[0]
+    state = enrich_contact_email(state)
 
     # 4. Language detection
-    try:
-        lang = langdetect.detect(state.raw_resume_text)
-    except LangDetectException:
-        lang = "unknown"
-    structured.detected_language = lang  # non-schema attribute is OK for state
+    state = detect_resume_language(state)
 
-    state.structured_resume = structured
-    logger.success(f'✅ Parser finished for {structured.contact.full_name}')
+    logger.success(f'✅ Parser finished for {state.structured_resume.contact.full_name}')
     return state
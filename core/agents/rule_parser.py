@@ -0,0 +1,347 @@
+"""
+Deterministic fast-path résumé parser.
+Fills StructuredResume fields from rule-based section segmentation plus spaCy
+entities, and scores each top-level field so that only the low-confidence ones
+need to go to the LLM.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from core.utils import extract_emails, extract_urls, normalise_dates
+from core.utils.sections import HEADER_SECTION, sections_by_name
+
+# Top-level StructuredResume fields the fast path scores.
+RESUME_FIELDS = (
+    "contact", "summary", "education", "work_experience",
+    "projects", "certifications", "skills", "languages",
+)
+# Sections almost every résumé has: if no heading was found they were probably missed.
+CORE_FIELDS = ("education", "work_experience", "skills")
+MISSING_CORE_CONFIDENCE = 0.3
+MISSING_OPTIONAL_CONFIDENCE = 0.9
+# A list field with any incomplete entry goes to the LLM as a whole; the rules
+# leave missing values unset rather than guess them from neighbouring text.
+INCOMPLETE_ITEMS_CONFIDENCE = 0.5
+
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_DATE = rf"(?:{_MONTH}\.?,?\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}(?:-\d{{2}})?|\d{{4}})"
+_OPEN_END = r"(?:present|current|now|ongoing|today)"
+DATE_RANGE = re.compile(rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_OPEN_END})", re.IGNORECASE)
+SINGLE_DATE = re.compile(_DATE, re.IGNORECASE)
+PHONE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}")
+GPA = re.compile(r"\b(?:c?gpa|grade)\s*[:\-]?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+BULLET = re.compile(r"^\s*(?:[-•*▪●◦‣]|\d+[.)])\s+")
+# ", " only separates fields before a capitalised word that is not a state code ("Austin, TX").
+FIELD_SEPARATORS = re.compile(r"\s*(?:\||—|–|\s-\s|\t|\s{3,}|,\s(?=[A-Z])(?![A-Z]{2}\b))\s*")
+TECH_LABEL = re.compile(r"^(?:tech(?:nologies)?|tech stack|stack|tools|built with)\s*:\s*", re.IGNORECASE)
+LOCATION = re.compile(r"^[A-Z][A-Za-z .]+,\s*[A-Z][A-Za-z .]+$|^remote$", re.IGNORECASE)
+
+INSTITUTION_WORDS = re.compile(r"\b(university|college|institute|school|academy|polytechnic|universit[éa])\b", re.IGNORECASE)
+DEGREE = re.compile(
+    r"\b(bachelor(?:'s)?|master(?:'s)?|doctor(?:ate)?|ph\.?\s?d|mba|b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?a\.?|m\.?\s?a\.?|"
+    r"b\.?\s?tech|m\.?\s?tech|b\.?\s?e\.?|m\.?\s?e\.?|b\.?\s?eng|m\.?\s?eng|associate(?:'s)?|diploma|high school)\b",
+    re.IGNORECASE,
+)
+MAJOR = re.compile(r"\b(?:in|of)\s+([A-Z][A-Za-z&,. ]+?)(?:\s*(?:\||,|—|–|\(|$))")
+TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|manager|analyst|intern|scientist|designer|lead|consultant|director|architect|"
+    r"specialist|officer|associate|administrator|researcher|programmer|head|coordinator|assistant|"
+    r"technician|founder|president|vp|cto|ceo|teacher|professor|fellow)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class RuleParseResult:
+    """Fields in StructuredResume shape plus a 0..1 confidence per top-level field."""
+
+    data: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    def low_confidence_fields(self, threshold: float) -> List[str]:
+        return [name for name in RESUME_FIELDS if self.confidence.get(name, 0.0) < threshold]
+
+
+# ------------------------ spaCy ------------------------ #
+
+@lru_cache(maxsize=1)
+def _nlp():
+    """Loaded once per process; the fast path still works on rules alone without a model."""
+    try:
+        import spacy
+        return spacy.load("en_core_web_sm", disable=["parser", "lemmatizer"])
+    except (ImportError, OSError):
+        logger.warning("spaCy model en_core_web_sm unavailable; fast-path parser uses rules only")
+        return None
+
+
+def _person_names(text: str) -> List[str]:
+    nlp = _nlp()
+    if nlp is None:
+        return []
+    return [ent.text.strip() for ent in nlp(text).ents if ent.label_ == "PERSON"]
+
+
+# ------------------------ Helpers ------------------------ #
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _strip_bullet(line: str) -> str:
+    return BULLET.sub("", line).strip()
+
+
+def _split_fields(line: str) -> List[str]:
+    return [part.strip(" ,;:") for part in FIELD_SEPARATORS.split(line) if part and part.strip(" ,;:")]
+
+
+def _date_range(text: str) -> Tuple[Optional[str], Optional[str], str]:
+    """(start, end, text without the dates). An open end ("Present") is returned as-is."""
+    match = DATE_RANGE.search(text)
+    if match:
+        return match.group("start"), match.group("end"), (text[:match.start()] + " " + text[match.end():]).strip()
+    match = SINGLE_DATE.search(text)
+    if match:
+        return None, match.group(0), (text[:match.start()] + " " + text[match.end():]).strip()
+    return None, None, text
+
+
+def _blocks(text: str) -> List[Tuple[List[str], List[str]]]:
+    """
+    Group a section into entries: a run of non-bullet header lines followed by
+    bullet lines. A header line after bullets starts a new entry.
+    """
+    blocks: List[Tuple[List[str], List[str]]] = []
+    header: List[str] = []
+    bullets: List[str] = []
+    for line in _lines(text):
+        if BULLET.match(line):
+            bullets.append(_strip_bullet(line))
+        elif bullets or (header and DATE_RANGE.search(line) and DATE_RANGE.search(" ".join(header))):
+            blocks.append((header, bullets))
+            header, bullets = [line], []
+        else:
+            header.append(line)
+    if header or bullets:
+        blocks.append((header, bullets))
+    return [(header, bullets) for header, bullets in blocks if header]
+
+
+def _mentioned(skills: List[str], text: str) -> List[str]:
+    lowered = text.lower()
+    return [
+        skill for skill in skills
+        if re.search(rf"(?<![\w+#]){re.escape(skill.lower())}(?![\w+#])", lowered)
+    ]
+
+
+def _completeness(flags: List[bool]) -> float:
+    if not flags:
+        return 0.0
+    return 1.0 if all(flags) else INCOMPLETE_ITEMS_CONFIDENCE
+
+
+def _known(item: Dict[str, Any]) -> Dict[str, Any]:
+    """The item without the values the rules could not find."""
+    return {key: value for key, value in item.items() if value is not None and value != ""}
+
+
+# ------------------------ Section Parsers ------------------------ #
+
+def _parse_contact(header: str, full_text: str) -> Tuple[Dict[str, Any], float]:
+    lines = _lines(header) or _lines(full_text)[:5]
+    emails = extract_emails(header) or extract_emails(full_text)
+    urls = extract_urls(full_text)
+    contact: Dict[str, Any] = {}
+
+    candidates = [
+        line for line in lines[:3]
+        if not re.search(r"[\d@/|:]", line) and 1 < len(line.split()) <= 4
+    ]
+    people = _person_names("\n".join(lines[:3]))
+    name_confidence = 0.0
+    if candidates and people and any(person in candidates[0] for person in people):
+        contact["full_name"], name_confidence = candidates[0], 1.0
+    elif people:
+        contact["full_name"], name_confidence = people[0], 0.8
+    elif candidates and candidates[0].istitle():
+        contact["full_name"], name_confidence = candidates[0], 0.85
+
+    if emails:
+        contact["email"] = emails[0]
+    phone = PHONE.search(header)
+    if phone:
+        contact["phone"] = phone.group(0).strip()
+    for url in urls:
+        if "linkedin.com" in url and "linkedin" not in contact:
+            contact["linkedin"] = url
+        elif "github.com" in url and "github" not in contact:
+            contact["github"] = url
+    for line in lines[1:4]:
+        for part in _split_fields(line):
+            if LOCATION.match(part) and not extract_emails(part):
+                contact.setdefault("location", part)
+
+    confidence = name_confidence * (1.0 if emails else 0.8)
+    return contact, confidence
+
+
+def _parse_education(text: str) -> Tuple[List[Dict[str, Any]], float]:
+    items, complete = [], []
+    for header, bullets in _blocks(text):
+        joined = " | ".join(header + bullets)
+        start, end, rest = _date_range(joined)
+        parts = _split_fields(rest)
+        institution = next((part for part in parts if INSTITUTION_WORDS.search(part)), None)
+        degree = next((part for part in parts if DEGREE.search(part) and part != institution), None)
+        others = [part for part in parts if part != degree]
+        if institution is None and degree and len(others) == 1:
+            # "Degree | School | dates": the one part left beside a known degree is the school.
+            institution = others[0]
+        item: Dict[str, Any] = _known({
+            "institution": institution,
+            "degree": degree,
+            "start_date": normalise_dates(start),
+            "end_date": normalise_dates(end),
+        })
+        if degree:
+            major = MAJOR.search(degree)
+            if major:
+                item["major"] = major.group(1).strip(" ,.")
+        gpa = GPA.search(joined)
+        if gpa:
+            item["gpa"] = float(gpa.group(1))
+        items.append(item)
+        complete.append(bool(institution and degree))
+    return items, _completeness(complete)
+
+
+def _parse_work(text: str, skills: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+    items, complete = [], []
+    for header, bullets in _blocks(text):
+        start, end, rest = _date_range(" | ".join(header))
+        parts = _split_fields(rest)
+        location = next((part for part in parts if LOCATION.match(part)), None)
+        parts = [part for part in parts if part != location]
+        title = next((part for part in parts if TITLE_WORDS.search(part)), None)
+        company = next((part for part in parts if part != title), None)
+        description = "\n".join(bullets) or None
+        items.append(_known({
+            "company": company,
+            "title": title,
+            "location": location,
+            "start_date": normalise_dates(start),
+            "end_date": normalise_dates(end),
+            "description": description,
+            "technologies": _mentioned(skills, description or ""),
+        }))
+        complete.append(bool(title and company and start))
+    return items, _completeness(complete)
+
+
+def _parse_projects(text: str, skills: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+    items, complete = [], []
+    for header, bullets in _blocks(text):
+        urls = extract_urls(" ".join(header + bullets))
+        parts = _split_fields(header[0])
+        name = parts[0] if parts else header[0]
+        body = [line for line in header[1:] + bullets if not TECH_LABEL.match(line)]
+        tech_lines = [TECH_LABEL.sub("", line) for line in header[1:] + bullets if TECH_LABEL.match(line)]
+        technologies = [tech.strip() for line in tech_lines for tech in re.split(r"[,/]", line) if tech.strip()]
+        description = "\n".join(body) or " ".join(parts[1:])
+        for url in urls:
+            description = description.replace(url, "").strip()
+        items.append(_known({
+            "name": name,
+            "description": description,
+            "technologies": technologies or _mentioned(skills, description),
+            "url": urls[0] if urls else None,
+        }))
+        complete.append(bool(name and description))
+    return items, _completeness(complete)
+
+
+def _parse_certifications(text: str) -> Tuple[List[Dict[str, Any]], float]:
+    items, complete = [], []
+    for line in _lines(text):
+        _, issued, rest = _date_range(_strip_bullet(line))
+        parts = _split_fields(rest)
+        if not parts:
+            continue
+        items.append(_known({
+            "name": parts[0],
+            "issuer": parts[1] if len(parts) > 1 else None,
+            "issue_date": normalise_dates(issued),
+        }))
+        complete.append(len(parts) > 1)
+    return items, _completeness(complete)
+
+
+def _parse_skills(text: str) -> Tuple[List[Dict[str, Any]], float]:
+    buckets: Dict[str, List[str]] = {}
+    categorised = True
+    for line in _lines(text):
+        line = _strip_bullet(line)
+        if ":" in line:
+            category, _, values = line.partition(":")
+        else:
+            category, values, categorised = "General", line, False
+        skills = [skill.strip(" .") for skill in re.split(r"[,;|•]", values) if skill.strip(" .")]
+        buckets.setdefault(category.strip(), []).extend(skills)
+    items = [{"category": category, "skills": skills} for category, skills in buckets.items() if skills]
+    if not items:
+        return [], 0.0
+    return items, 1.0 if categorised else 0.85
+
+
+def _parse_languages(text: str) -> Tuple[List[str], float]:
+    languages = []
+    for part in re.split(r"[,;|•\n]", text):
+        part = re.sub(r"\(.*?\)|[-–:].*$", "", _strip_bullet(part)).strip()
+        if part and len(part.split()) <= 2:
+            languages.append(part)
+    return languages, 0.9 if languages else 0.0
+
+
+# ------------------------ Entry Point ------------------------ #
+
+def rule_parse(text: str) -> RuleParseResult:
+    """Parse résumé text without the LLM, scoring each top-level field."""
+    sections = sections_by_name(text)
+    result = RuleParseResult()
+
+    result.data["contact"], result.confidence["contact"] = _parse_contact(sections.get(HEADER_SECTION, ""), text)
+
+    skills, skills_confidence = _parse_skills(sections.get("skills", ""))
+    flat_skills = [skill for bucket in skills for skill in bucket["skills"]]
+
+    parsers = {
+        "education": _parse_education,
+        "work_experience": lambda body: _parse_work(body, flat_skills),
+        "projects": lambda body: _parse_projects(body, flat_skills),
+        "certifications": _parse_certifications,
+        "languages": _parse_languages,
+    }
+    for name, parse in parsers.items():
+        if sections.get(name):
+            result.data[name], result.confidence[name] = parse(sections[name])
+        else:
+            result.data[name] = []
+            result.confidence[name] = MISSING_CORE_CONFIDENCE if name in CORE_FIELDS else MISSING_OPTIONAL_CONFIDENCE
+
+    if sections.get("skills"):
+        result.data["skills"], result.confidence["skills"] = skills, skills_confidence
+    else:
+        result.data["skills"], result.confidence["skills"] = [], MISSING_CORE_CONFIDENCE
+
+    summary = sections.get("summary")
+    result.data["summary"] = " ".join(_lines(summary)) if summary else None
+    result.confidence["summary"] = 0.9 if summary else MISSING_OPTIONAL_CONFIDENCE
+
+    return result
@@ -0,0 +1,249 @@
+"""
+Batch corpus mode.
+Runs the agent chain over a directory or manifest of résumés: text extraction
+in a process pool, agent chains on one long-lived event loop (so async clients
+keep their connections alive across résumés), at most `llm_concurrency` at a
+time, and one JSONL record streamed out per résumé as soon as it finishes.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from core.models import AnalysisState, BatchResult, Span
+from core.resume_store import ResumeStoreWriter
+from core.tools.text_tools import ResumeTextExtractorTool
+from core.tracing import collect_spans, llm_totals
+from core.utils import is_image_file, is_pdf_file
+from core.clients import aclose_loop_clients
+from core.workflow import run_agent_chain_async
+
+T = TypeVar("T")
+
+MANIFEST_SUFFIXES = (".txt", ".jsonl")
+DEFAULT_LLM_CONCURRENCY = 4
+
+
+# ------------------------ Input Discovery ------------------------ #
+
+def discover_resumes(source: str) -> List[str]:
+    """
+    Resolve a batch source into résumé file paths.
+    `source` is a directory (searched recursively for PDFs and images) or a
+    manifest: one path per line (.txt) or one {"path": ...} object per line (.jsonl).
+    Relative manifest entries are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if is_pdf_file(name) or is_image_file(name):
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    if not source.lower().endswith(MANIFEST_SUFFIXES):
+        raise ValueError(f"Batch source must be a directory or a .txt/.jsonl manifest: {source}")
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+    return paths
+
+
+# ------------------------ Pipeline Stages ------------------------ #
+
+def _init_extractor() -> None:
+    # Files are already spread across one process per core; a nested OCR pool
+    # per document would only oversubscribe the CPUs.
+    os.environ["RESUME_OCR_WORKERS"] = "1"
+
+
+def _extract_text(path: str) -> Tuple[str, float, List[Span]]:
+    """
+    Runs in a worker process, so it must stay a picklable top-level function.
+    Its spans are sent back with the text, for the résumé's trace.
+    """
+    started = time.perf_counter()
+    if not (is_pdf_file(path) or is_image_file(path)):
+        raise ValueError("Unsupported file type.")
+    spans: List[Span] = []
+    with collect_spans(spans):
+        text = ResumeTextExtractorTool().run(path)
+    if not text.strip():
+        raise ValueError("No text could be extracted.")
+    return text, time.perf_counter() - started, spans
+
+
+async def _analyse(
+        path: str,
+        text: str,
+        extract_seconds: float,
+        limit: asyncio.Semaphore,
+        store: Optional[ResumeStoreWriter] = None,
+        refresh: Iterable[str] = (),
+        spans: Optional[List[Span]] = None,
+) -> BatchResult:
+    started = time.perf_counter()
+    state = AnalysisState(raw_resume_text=text, resume_file_path=path, spans=spans or [])
+    try:
+        async with limit:
+            report = await run_agent_chain_async(state, refresh)
+    except Exception as e:
+        logger.warning(f'Analysis failed for {path}: {e}')
+        tokens, cost = llm_totals(state.spans)
+        return BatchResult(
+            path=path,
+            status="error",
+            stage="analyse",
+            error=f"{type(e).__name__}: {e}",
+            extract_seconds=extract_seconds,
+            analyse_seconds=time.perf_counter() - started,
+            llm_tokens=tokens,
+            cost_usd=cost,
+        )
+    if store is not None and state.structured_resume is not None:
+        store.append(state.structured_resume, key=path)
+    tokens, cost = llm_totals(state.spans)
+    return BatchResult(
+        path=path,
+        status="ok",
+        report=report,
+        extract_seconds=extract_seconds,
+        analyse_seconds=time.perf_counter() - started,
+        llm_tokens=tokens,
+        cost_usd=cost,
+    )
+
+
+# ------------------------ Output ------------------------ #
+
+class _JsonlSink:
+    """Thread-safe JSONL writer that flushes every record as it lands."""
+
+    def __init__(self, output_path: str):
+        self._own = output_path != "-"
+        self._fh = open(output_path, "a", encoding="utf-8") if self._own else sys.stdout
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {"ok": 0, "error": 0}
+
+    def write(self, result: BatchResult) -> None:
+        with self._lock:
+            self._fh.write(result.model_dump_json() + "\n")
+            self._fh.flush()
+            self.counts[result.status] += 1
+
+    def close(self) -> None:
+        if self._own:
+            self._fh.close()
+
+
+# ------------------------ Batch Runner ------------------------ #
+
+class _AgentLoop:
+    """An event loop on its own thread that every résumé's agent chain shares."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="batch-agents", daemon=True)
+        self._thread.start()
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def close(self) -> None:
+        self.submit(aclose_loop_clients()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+def run_batch_workflow(
+        source: str,
+        output_path: str = "-",
+        extract_workers: Optional[int] = None,
+        llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+        store_path: Optional[str] = None,
+        refresh: Iterable[str] = (),
+) -> Dict[str, int]:
+    """
+    Analyse every résumé in `source` and stream one BatchResult per line to `output_path`
+    ("-" for stdout). Extraction uses `extract_workers` processes (default: one per core);
+    at most `llm_concurrency` résumés are inside the agent chain at once.
+    A failing file is recorded as an error line and never stops the run.
+    With `store_path`, the parsed résumés are also written to a columnar store there.
+    Checkpointed stages are restored unless named in `refresh` (or downstream of one).
+    Returns the number of ok/error records written.
+    """
+    paths = discover_resumes(source)
+    logger.info(f'Batch: {len(paths)} résumés from {source}')
+
+    sink = _JsonlSink(output_path)
+    store = ResumeStoreWriter(store_path) if store_path else None
+    agents = _AgentLoop()
+    limit = asyncio.Semaphore(max(1, llm_concurrency))
+    # Extracted texts wait here for an agent slot; bounding them keeps memory flat
+    # when extraction outruns the API quota.
+    backlog_size = max(1, llm_concurrency) * 2
+    backlog = threading.BoundedSemaphore(backlog_size)
+
+    def _on_analysed(future: Future) -> None:
+        try:
+            sink.write(future.result())
+        finally:
+            backlog.release()
+
+    try:
+        with ProcessPoolExecutor(max_workers=extract_workers, initializer=_init_extractor) as extractors:
+            # Only a backlog's worth of extractions is in flight, so finished texts
+            # cannot pile up while the loop below waits for an agent slot.
+            remaining = iter(paths)
+            extractions: Dict[Future, str] = {}
+            while True:
+                for path in itertools.islice(remaining, backlog_size - len(extractions)):
+                    extractions[extractors.submit(_extract_text, path)] = path
+                if not extractions:
+                    break
+                done, _ = wait(extractions, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = extractions.pop(future)
+                    try:
+                        text, extract_seconds, spans = future.result()
+                    except Exception as e:
+                        logger.warning(f'Extraction failed for {path}: {e}')
+                        sink.write(BatchResult(
+                            path=path,
+                            status="error",
+                            stage="extract",
+                            error=f"{type(e).__name__}: {e}",
+                        ))
+                        continue
+                    backlog.acquire()
+                    agents.submit(
+                        _analyse(path, text, extract_seconds, limit, store, tuple(refresh), spans)
+                    ).add_done_callback(_on_analysed)
+        # Holding every backlog slot means every analysis has been written.
+        for _ in range(backlog_size):
+            backlog.acquire()
+    finally:
+        agents.close()
+        sink.close()
+        if store is not None:
+            store.close()
+            logger.info(f'Wrote {len(store)} parsed résumés to {store_path}')
+
+    logger.info(f'Batch finished: {sink.counts["ok"]} ok, {sink.counts["error"]} failed')
+    return sink.counts
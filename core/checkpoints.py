@@ -0,0 +1,157 @@
+"""
+Durable per-stage checkpoints for the analysis pipeline.
+After a stage runs, the fields it writes are saved under a key built from the
+résumé's content hash, the stage's name and version, a digest of the fields
+it reads and the run settings it depends on (models, search backend). A rerun restores every stage whose key is still present, so
+work resumes from the first stale stage: a changed résumé or parser version
+re-runs the stages that depend on it, and an expired research checkpoint
+(stage TTL) re-runs research and only whatever its new output changes.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+
+from core.models import AnalysisState
+from core.utils.cache import DEFAULT_CACHE_DIR, DiskCache, file_digest
+
+if TYPE_CHECKING:
+    from core.pipeline import Stage
+
+CHECKPOINT_FORMAT = 2
+CHECKPOINT_MAX_BYTES = int(os.getenv("CHECKPOINT_MAX_BYTES", 1024 * 1024 * 1024))
+
+_refreshing: contextvars.ContextVar[bool] = contextvars.ContextVar("checkpoint_refresh", default=False)
+
+
+def refresh_requested() -> bool:
+    """True inside a stage the caller asked to re-run; its own caches of external data should be bypassed too."""
+    return _refreshing.get()
+
+
+def set_refresh(value: bool) -> None:
+    _refreshing.set(value)
+
+
+# ------------------------ Field Paths ------------------------ #
+
+def read_path(obj: Any, path: str) -> Any:
+    """Value at a dotted path; lists map over their items ("structured_resume.skills.category")."""
+
+    def walk(value: Any, parts: List[str]) -> Any:
+        if value is None or not parts:
+            return value
+        if isinstance(value, list):
+            return [walk(item, parts) for item in value]
+        return walk(getattr(value, parts[0]), parts[1:])
+
+    return walk(obj, path.split("."))
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(annotation: Any) -> TypeAdapter:
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter
+
+
+def write_path(obj: Any, path: str, value: Any) -> None:
+    """Inverse of read_path for JSON values: each leaf is re-validated against its model field."""
+
+    def assign(target: Any, parts: List[str], item_value: Any) -> None:
+        if target is None:
+            return
+        if isinstance(target, list):
+            for item, item_part in zip(target, item_value or ()):
+                assign(item, parts, item_part)
+            return
+        name = parts[0]
+        if len(parts) == 1:
+            annotation = type(target).model_fields[name].annotation
+            setattr(target, name, _adapter(annotation).validate_python(item_value))
+        elif item_value is not None:
+            assign(getattr(target, name), parts[1:], item_value)
+
+    assign(obj, path.split("."), value)
+
+
+# ------------------------ Keys ------------------------ #
+
+def resume_digest(state: AnalysisState) -> str:
+    """The résumé's content hash: the file's bytes when there is one, else the extracted text."""
+    if state.resume_file_path and os.path.isfile(state.resume_file_path):
+        return file_digest(state.resume_file_path)
+    return hashlib.sha256(state.raw_resume_text.encode("utf-8")).hexdigest()
+
+
+def checkpoint_key(
+        stage: "Stage",
+        state: AnalysisState,
+        resume: str,
+        config: Optional[Dict[str, Any]] = None,
+) -> str:
+    inputs = {path: read_path(state, path) for path in sorted(stage.reads)}
+    payload = json.dumps(
+        [CHECKPOINT_FORMAT, resume, stage.name, stage.version, to_jsonable_python(inputs), config or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ------------------------ Store ------------------------ #
+
+class CheckpointStore:
+    def __init__(self, store: Optional[DiskCache] = None):
+        self.store = store or DiskCache(
+            os.getenv("CHECKPOINT_PATH", os.path.join(DEFAULT_CACHE_DIR, "checkpoints.sqlite")),
+            max_bytes=CHECKPOINT_MAX_BYTES,
+        )
+
+    def load(self, stage: "Stage", key: str) -> Optional[Dict[str, Any]]:
+        """The saved fields for `key`, unless missing or older than the stage's TTL."""
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if stage.ttl is not None and time.time() - entry["created"] > stage.ttl:
+            return None
+        return entry["fields"]
+
+    def save(self, stage: "Stage", key: str, state: AnalysisState) -> None:
+        fields = {path: read_path(state, path) for path in sorted(stage.writes)}
+        entry = {"stage": stage.name, "version": stage.version, "created": time.time(), "fields": fields}
+        self.store.set(key, json.dumps(to_jsonable_python(entry), ensure_ascii=False))
+
+    @staticmethod
+    def restore(state: AnalysisState, fields: Dict[str, Any]) -> None:
+        for path, value in fields.items():
+            write_path(state, path, value)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+_checkpoints: Optional[CheckpointStore] = None
+_checkpoints_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """The process-wide store, or None when CHECKPOINTS=0."""
+    global _checkpoints
+    if os.getenv("CHECKPOINTS", "1") == "0":
+        return None
+    with _checkpoints_lock:
+        if _checkpoints is None:
+            _checkpoints = CheckpointStore()
+        return _checkpoints
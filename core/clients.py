@@ -0,0 +1,281 @@
+"""
+Process-wide registry of LLM and search clients.
+Clients are built once and reused, and all OpenRouter models share a keep-alive
+HTTP pool (one per event loop for async calls), so TLS handshakes are paid once
+per connection rather than once per agent call. Every request goes through token-bucket rate limits
+per provider and per model, and 429 responses are retried with exponential
+backoff, honouring Retry-After when the provider sends it.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from core.tracing import record_retry
+from core.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from llama_index.llms.openrouter import OpenRouter
+    from llama_index.tools.tavily_research import TavilyToolSpec
+
+# llama_index takes seconds to import; it is only loaded when the first client is built.
+httpx = lazy_import("httpx")
+
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "100"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "120"))
+MAX_RATE_LIMIT_RETRIES = int(os.getenv("MAX_RATE_LIMIT_RETRIES", "5"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Requests per second (and burst) for each provider. Per-model limits come from
+# LLM_MODEL_RPS, e.g. "google/gemini-pro=2,deepseek/deepseek-chat=5".
+PROVIDER_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "openrouter": (float(os.getenv("OPENROUTER_RPS", "10")), float(os.getenv("OPENROUTER_BURST", "20"))),
+    "tavily": (float(os.getenv("TAVILY_RPS", "5")), float(os.getenv("TAVILY_BURST", "10"))),
+}
+
+
+# ------------------------ Rate Limiting ------------------------ #
+
+class TokenBucket:
+    """
+    Token bucket shared by threads and event loops. Callers reserve a token and
+    sleep for however long the deficit takes to refill, so waiters queue up in
+    order instead of polling.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def configure_rate_limit(key: str, rate: float, burst: Optional[float] = None) -> None:
+    """Set the limit for a provider ("openrouter") or model ("openrouter:google/gemini-pro")."""
+    with _buckets_lock:
+        _buckets[key] = TokenBucket(rate, burst)
+
+
+def _load_rate_limits() -> None:
+    for provider, (rate, burst) in PROVIDER_RATE_LIMITS.items():
+        configure_rate_limit(provider, rate, burst)
+    for entry in filter(None, os.getenv("LLM_MODEL_RPS", "").split(",")):
+        model, _, rate = entry.rpartition("=")
+        configure_rate_limit(f"openrouter:{model.strip()}", float(rate))
+
+
+_load_rate_limits()
+
+
+def _limiters(keys: Iterable[str]) -> Iterable[TokenBucket]:
+    with _buckets_lock:
+        return [_buckets[key] for key in keys if key in _buckets]
+
+
+# ------------------------ Backoff ------------------------ #
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return _status_code(error) == 429
+
+
+def _backoff_delay(error: BaseException, attempt: int) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    # Full jitter keeps retrying workers from re-synchronising into another burst.
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def call_with_backoff(keys: Tuple[str, ...], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Rate-limit `fn` under the given bucket keys and retry it on 429."""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        for bucket in _limiters(keys):
+            bucket.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES or not is_rate_limited(e):
+                raise
+            delay = _backoff_delay(e, attempt)
+            logger.warning(f'Rate limited on {keys[-1]}; retrying in {delay:.1f}s')
+            record_retry()
+            time.sleep(delay)
+
+
+async def acall_with_backoff(keys: Tuple[str, ...], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Async counterpart of call_with_backoff for coroutine functions."""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        for bucket in _limiters(keys):
+            await bucket.acquire_async()
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES or not is_rate_limited(e):
+                raise
+            delay = _backoff_delay(e, attempt)
+            logger.warning(f'Rate limited on {keys[-1]}; retrying in {delay:.1f}s')
+            record_retry()
+            await asyncio.sleep(delay)
+
+
+# ------------------------ Client Registry ------------------------ #
+
+_clients: Dict[Tuple, Any] = {}
+# Async HTTP connections are bound to the event loop that opened them, so async
+# clients are kept per loop; aclose_loop_clients closes them before the loop ends.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+# Local stand-ins (benchmarks, offline runs) registered with override_client.
+_overrides: Dict[str, Callable[..., Any]] = {}
+
+
+def overridden_clients() -> List[str]:
+    """Providers currently served by an override_client factory."""
+    with _clients_lock:
+        return sorted(_overrides)
+
+
+def override_client(provider: str, factory: Optional[Callable[..., Any]]) -> None:
+    """
+    Build `provider` ("openrouter" or "tavily") clients with `factory` instead
+    of the real SDK; None restores it. OpenRouter factories are called with
+    (model, temperature, max_tokens), Tavily factories with no arguments. One
+    instance serves both sync and async callers, on every event loop.
+    """
+    with _clients_lock:
+        if factory is None:
+            _overrides.pop(provider, None)
+        else:
+            _overrides[provider] = factory
+        for key in [key for key in _clients if key[:2] == ("override", provider)]:
+            del _clients[key]
+
+
+def _http_limits() -> "httpx.Limits":
+    return httpx.Limits(max_connections=HTTP_POOL_CONNECTIONS, max_keepalive_connections=HTTP_POOL_CONNECTIONS)
+
+
+def _shared(key: Tuple, factory: Callable[[], Any]) -> Any:
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = factory()
+        return _clients[key]
+
+
+def _loop_shared(key: Tuple, factory: Callable[[], Any]) -> Any:
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _loop_clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = factory()
+        return clients[key]
+
+
+async def aclose_loop_clients() -> None:
+    """Close the running loop's async HTTP pool. Await it before the loop ends, or its connections stay open."""
+    with _clients_lock:
+        clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+
+
+def _openrouter(model: str, temperature: float, max_tokens: Optional[int], **http: Any) -> "OpenRouter":
+    from llama_index.llms.openrouter import OpenRouter
+
+    kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+    return OpenRouter(
+        model=model,
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        temperature=temperature,
+        # call_with_backoff owns retries; SDK retries would multiply them and bypass the token buckets.
+        max_retries=0,
+        **http,
+        **kwargs,
+    )
+
+
+def get_openrouter(model: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> "OpenRouter":
+    """One OpenRouter client per (model, sampling settings), all on one keep-alive HTTP pool."""
+    override = _overrides.get("openrouter")
+    if override is not None:
+        return _shared(("override", "openrouter", model, temperature, max_tokens),
+                       lambda: override(model, temperature, max_tokens))
+    http_client = _shared(("httpx",), lambda: httpx.Client(limits=_http_limits(), timeout=HTTP_TIMEOUT))
+    return _shared(
+        ("openrouter", model, temperature, max_tokens),
+        lambda: _openrouter(model, temperature, max_tokens, http_client=http_client),
+    )
+
+
+def get_async_openrouter(model: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> "OpenRouter":
+    """Like get_openrouter, for `acomplete` calls on the running event loop."""
+    if "openrouter" in _overrides:
+        return get_openrouter(model, temperature, max_tokens)
+    async_http_client = _loop_shared(
+        ("httpx-async",), lambda: httpx.AsyncClient(limits=_http_limits(), timeout=HTTP_TIMEOUT)
+    )
+    return _loop_shared(
+        ("openrouter", model, temperature, max_tokens),
+        lambda: _openrouter(model, temperature, max_tokens, async_http_client=async_http_client),
+    )
+
+
+def get_tavily() -> "TavilyToolSpec":
+    def build() -> "TavilyToolSpec":
+        from llama_index.tools.tavily_research import TavilyToolSpec
+        return TavilyToolSpec(api_key=os.getenv("TAVILY_API_KEY"))
+
+    override = _overrides.get("tavily")
+    if override is not None:
+        return _shared(("override", "tavily"), override)
+    return _shared(("tavily",), build)
+
+
+def llm_rate_keys(model: str) -> Tuple[str, str]:
+    return "openrouter", f"openrouter:{model}"
@@ -0,0 +1,291 @@
+"""
+Near-duplicate résumé detection.
+Résumés are fingerprinted with a MinHash signature over word shingles of their
+normalised text (contact details masked; whitespace, case and PDF-exporter
+noise folded away), so a new phone number changes nothing and a reordered or
+added bullet changes only a few shingles. Names are not masked but weigh
+little in the signature, so a match is only reused when the earlier
+candidate's name appears in this résumé's header. Signatures are split into bands and
+indexed in SQLite (locality-sensitive hashing): résumés that share any band are
+candidates, and a candidate is a duplicate when its estimated Jaccard
+similarity reaches the threshold, so a lookup is a handful of indexed probes.
+A résumé close enough to an earlier one reuses its parse, research, scores and
+report instead of four more LLM calls.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
+
+from core.checkpoints import CheckpointStore, read_path, resume_digest
+from core.models import AnalysisState, StructuredResume
+from core.research import RESEARCH_CACHE_TTL
+from core.tracing import span
+from core.utils import extract_emails
+from core.utils.cache import DEFAULT_CACHE_DIR
+from core.utils.lazy import lazy_import
+from core.utils.sections import HEADER_SECTION, sections_by_name
+
+np = lazy_import("numpy")
+
+DEDUPE_PATH = os.getenv("DEDUPE_PATH", os.path.join(DEFAULT_CACHE_DIR, "dedupe.sqlite"))
+# Estimated Jaccard similarity of word shingles at which a résumé counts as a duplicate.
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.8"))
+# Reused analyses carry market research, so they age out with it.
+DEDUPE_TTL = float(os.getenv("DEDUPE_TTL", RESEARCH_CACHE_TTL))
+SHINGLE_WORDS = 3
+# Where to look for the candidate's name when the résumé has no header section.
+HEADER_CHARS = 500
+# 16 bands of 8 rows: pairs at 0.8 similarity collide in some band ~95% of the
+# time, pairs at 0.3 about 0.1% of the time.
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+
+# Fields copied from the earlier analysis; everything else is recomputed from this résumé's text.
+REUSED_FIELDS = ("structured_resume", "market_research", "scored_gaps", "gap_analysis", "final_report")
+
+
+# ------------------------ Signatures ------------------------ #
+
+_EMAIL = re.compile(r"\S+@\S+\.\w+")
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_PHONE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}")
+# A word split across lines by the exporter: "devel-\nopment".
+_HYPHENATED = re.compile(r"(\w)-\s*\n\s*(\w)")
+_WORD = re.compile(r"\w+")
+
+
+def normalise_text(text: str) -> str:
+    """Lowercased words of the résumé with contact details masked and layout noise removed."""
+    text = unicodedata.normalize("NFKC", text)
+    text = " ".join(_HYPHENATED.sub(r"\1\2", text).split())
+    text = _URL.sub(" url ", _EMAIL.sub(" email ", text))
+    text = _PHONE.sub(" phone ", text)
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+_permutations = None
+
+
+def _hash_family() -> "Tuple[np.ndarray, np.ndarray]":
+    """Multipliers and offsets of the NUM_PERMUTATIONS hash functions, derived from fixed seeds."""
+    global _permutations
+    if _permutations is None:
+        seeds = np.array([_hash64(f"minhash:{i}".encode()) for i in range(2 * NUM_PERMUTATIONS)], dtype="uint64")
+        _permutations = (seeds[:NUM_PERMUTATIONS] | np.uint64(1), seeds[NUM_PERMUTATIONS:])
+    return _permutations
+
+
+def minhash(text: str) -> "np.ndarray":
+    """MinHash signature (NUM_PERMUTATIONS × uint32) of the text's word shingles."""
+    words = normalise_text(text).split()
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    hashes = np.array([_hash64(shingle.encode("utf-8")) for shingle in shingles], dtype="uint64")
+    multipliers, offsets = _hash_family()
+    # Multiply-shift hashing: uint64 arithmetic wraps, the top 32 bits are the hash.
+    permuted = (hashes[:, None] * multipliers + offsets) >> np.uint64(32)
+    return permuted.min(axis=0).astype("uint32")
+
+
+def similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def _band_keys(signature: "np.ndarray") -> List[int]:
+    rows = len(signature) // NUM_BANDS
+    # Signed, for SQLite's 64-bit integers.
+    return [
+        _hash64(bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes()) - (1 << 63)
+        for band in range(NUM_BANDS)
+    ]
+
+
+# ------------------------ Index ------------------------ #
+
+@dataclass
+class Match:
+    digest: str
+    similarity: float
+    created: float
+    fields: Dict[str, Any]
+
+
+class DuplicateIndex:
+    """Signatures of analysed résumés with the results worth reusing."""
+
+    def __init__(
+            self,
+            path: str = DEDUPE_PATH,
+            threshold: float = DEDUPE_THRESHOLD,
+            ttl: Optional[float] = DEDUPE_TTL,
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " id INTEGER PRIMARY KEY,"
+            " digest TEXT UNIQUE NOT NULL,"
+            " signature BLOB NOT NULL,"
+            " created REAL NOT NULL,"
+            " fields TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created);"
+            "CREATE TABLE IF NOT EXISTS bands ("
+            " band INTEGER NOT NULL,"
+            " id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,"
+            " PRIMARY KEY (band, id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS bands_id ON bands (id);"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def _oldest(self) -> float:
+        return time.time() - self.ttl if self.ttl is not None else float("-inf")
+
+    def find(self, signature: "np.ndarray") -> Optional[Match]:
+        """The most similar unexpired analysis at or above the threshold, or None."""
+        keys = _band_keys(signature)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT a.id, a.digest, a.signature, a.created FROM analyses a"
+                f" WHERE a.id IN (SELECT id FROM bands WHERE band IN ({', '.join('?' * len(keys))}))"
+                " AND a.created >= ?",
+                (*keys, self._oldest()),
+            ).fetchall()
+            best = None
+            for row_id, digest, stored, created in rows:
+                score = similarity(signature, np.frombuffer(stored, dtype="uint32"))
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, row_id, digest, created)
+            if best is None:
+                return None
+            score, row_id, digest, created = best
+            fields = self._conn.execute("SELECT fields FROM analyses WHERE id = ?", (row_id,)).fetchone()[0]
+        return Match(digest=digest, similarity=score, created=created, fields=json.loads(fields))
+
+    def add(self, digest: str, signature: "np.ndarray", fields: Dict[str, Any]) -> None:
+        """Index (or re-index) the analysis of the résumé with content hash `digest`."""
+        payload = json.dumps(to_jsonable_python(fields), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("DELETE FROM analyses WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM analyses WHERE created < ?", (self._oldest(),))
+            row_id = self._conn.execute(
+                "INSERT INTO analyses (digest, signature, created, fields) VALUES (?, ?, ?, ?)",
+                (digest, signature.astype("uint32").tobytes(), time.time(), payload),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO bands (band, id) VALUES (?, ?)",
+                [(key, row_id) for key in _band_keys(signature)],
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM analyses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_index: Optional[DuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> DuplicateIndex:
+    global _index
+    path = os.getenv("DEDUPE_PATH", DEDUPE_PATH)
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = DuplicateIndex(path)
+        return _index
+
+
+def dedupe_enabled() -> bool:
+    return os.getenv("DEDUPE", "0") == "1"
+
+
+# ------------------------ Pipeline Stages ------------------------ #
+
+def _digits(value: str) -> str:
+    return "".join(char for char in value if char.isdigit())
+
+
+def _refresh_contact(resume: StructuredResume, text: str) -> None:
+    """Swap in this résumé's email and phone when the reused ones no longer appear in it."""
+    contact = resume.contact
+    emails = extract_emails(text)
+    if emails and (contact.email or "").lower() not in {email.lower() for email in emails}:
+        contact.email = emails[0]
+    phones = [match.group(0).strip() for match in _PHONE.finditer(text)]
+    if phones and _digits(contact.phone or "") not in {_digits(phone) for phone in phones}:
+        contact.phone = phones[0]
+
+
+def _same_person(fields: Dict[str, Any], text: str) -> bool:
+    """True when the reused parse's full name appears in this résumé's header, outside its email and URLs."""
+    contact = (fields.get("structured_resume") or {}).get("contact") or {}
+    name = normalise_text(contact.get("full_name") or "").split()
+    header = sections_by_name(text).get(HEADER_SECTION) or text[:HEADER_CHARS]
+    words = set(normalise_text(header).split())
+    # Without a name to compare there is no telling whose report it is.
+    return bool(name) and all(word in words for word in name)
+
+
+def is_duplicate(state: AnalysisState) -> bool:
+    """Skip predicate for the stages whose results a near-duplicate reuses."""
+    return state.duplicate_of is not None
+
+
+def find_duplicate(state: AnalysisState) -> AnalysisState:
+    """Pipeline stage: reuse an earlier analysis of a near-identical résumé when DEDUPE=1."""
+    if not dedupe_enabled() or not state.raw_resume_text.strip():
+        return state
+    with span("postprocess.dedupe", "postprocess") as record:
+        match = get_duplicate_index().find(minhash(state.raw_resume_text))
+        record.attributes["duplicate"] = match is not None
+        if match is None:
+            return state
+        record.attributes["similarity"] = round(match.similarity, 3)
+        if not _same_person(match.fields, state.raw_resume_text):
+            # Same template, different candidate: their parse and report would name the wrong person.
+            record.attributes["duplicate"] = False
+            record.attributes["name_mismatch"] = True
+            return state
+        CheckpointStore.restore(state, match.fields)
+        if state.structured_resume is not None:
+            _refresh_contact(state.structured_resume, state.raw_resume_text)
+        state.duplicate_of = match.digest
+    return state
+
+
+def remember_analysis(state: AnalysisState) -> AnalysisState:
+    """Pipeline stage: index a freshly analysed résumé so later near-duplicates can reuse it."""
+    if not dedupe_enabled() or state.duplicate_of is not None or not state.final_report:
+        return state
+    fields = {name: read_path(state, name) for name in REUSED_FIELDS}
+    get_duplicate_index().add(resume_digest(state), minhash(state.raw_resume_text), fields)
+    return state
+
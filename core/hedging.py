@@ -0,0 +1,197 @@
+"""
+Hedged requests for tail-latency control.
+`hedged` runs a list of interchangeable attempts (the primary request, the same
+request again or on another model, a fallback prompt), taking the first result
+that validates. An attempt that fails validation starts the next one at once, as
+a serial retry would; one that is still running past the primary's
+HEDGE_PERCENTILE latency starts the next one alongside it (a hedge). Hedges are
+paid for from a budget that primaries earn into (HEDGE_BUDGET extra requests per
+primary), so only the slow tail is ever duplicated and median cost is unchanged.
+
+Attempts run on a shared thread pool. Losers still queued are cancelled; one
+already waiting on the network cannot be interrupted, so it finishes in the
+background and its result is dropped.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Sequence, TypeVar
+
+from loguru import logger
+
+from core.llm import count_api_calls
+from core.tracing import span
+
+T = TypeVar("T")
+
+HEDGE_ENABLED = os.getenv("HEDGE", "1") != "0"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+# Deadline used until HEDGE_MIN_SAMPLES primary latencies have been seen.
+HEDGE_DEFAULT_DEADLINE = float(os.getenv("HEDGE_DEFAULT_DEADLINE", "30"))
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 500
+# Extra requests earned per primary request, and the most that can be banked.
+HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.05"))
+HEDGE_BURST = float(os.getenv("HEDGE_BURST", "2"))
+HEDGE_THREADS = int(os.getenv("HEDGE_THREADS", "128"))
+
+
+# ------------------------ Latency and Budget ------------------------ #
+
+class LatencyTracker:
+    """Recent latencies per request kind, for percentile deadlines."""
+
+    def __init__(self, window: int = HEDGE_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """The q-th percentile (0-100) of recent latencies, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+    def deadline(self, name: str, q: float = HEDGE_PERCENTILE) -> float:
+        """Seconds to wait for an attempt before hedging it."""
+        value = self.percentile(name, q)
+        return HEDGE_DEFAULT_DEADLINE if value is None else value
+
+
+class HedgeBudget:
+    """Token bucket of extra requests: each primary adds `ratio`, each hedge spends one."""
+
+    def __init__(self, ratio: float = HEDGE_BUDGET, burst: float = HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self.primaries = 0
+        self.hedges = 0
+        self._credit = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self.primaries += 1
+            self._credit = min(self.burst, self._credit + self.ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._credit < 1:
+                return False
+            self._credit -= 1
+            self.hedges += 1
+            return True
+
+
+_tracker = LatencyTracker()
+_budget = HedgeBudget()
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    return _tracker
+
+
+def get_hedge_budget() -> HedgeBudget:
+    return _budget
+
+
+def _threads() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix="hedge")
+        return _pool
+
+
+# ------------------------ Hedged Calls ------------------------ #
+
+def hedged(
+        name: str,
+        attempts: Sequence[Callable[[], Optional[T]]],
+        kind: str = "parse",
+        tracker: Optional[LatencyTracker] = None,
+        budget: Optional[HedgeBudget] = None,
+) -> Optional[T]:
+    """
+    First non-None result of `attempts`, tried in order. Returns None when all
+    of them return None; if none succeeded and any raised, the first error is
+    re-raised. With HEDGE=0 the attempts simply run one after another.
+    """
+    tracker = tracker or _tracker
+    budget = budget or _budget
+    budget.earn()
+    deadline = tracker.deadline(name) if HEDGE_ENABLED else None
+    remaining = list(enumerate(attempts))
+    running: Dict[Future, int] = {}
+    errors: List[BaseException] = []
+
+    with span(name, kind, deadline=deadline) as record:
+        def timed(attempt: Callable[[], Optional[T]]) -> Optional[T]:
+            started = time.perf_counter()
+            with count_api_calls() as calls:
+                try:
+                    return attempt()
+                finally:
+                    # Every primary that reached the API counts, even one that loses, or the
+                    # percentile drifts low; cache hits would drag the deadline towards zero.
+                    if calls:
+                        tracker.record(name, time.perf_counter() - started)
+
+        def launch() -> None:
+            index, attempt = remaining.pop(0)
+            call = (lambda: timed(attempt)) if index == 0 else attempt
+            # Attempts run in a copy of this context so their spans nest under this one.
+            running[_threads().submit(contextvars.copy_context().run, call)] = index
+
+        launch()
+        hedged_at = time.monotonic()
+        try:
+            while running:
+                timeout = None
+                if deadline is not None and remaining:
+                    timeout = max(0.0, hedged_at + deadline - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    if budget.spend():
+                        logger.info(f'{name}: no answer after {deadline:.1f}s, hedging')
+                        record.attributes["hedges"] = record.attributes.get("hedges", 0) + 1
+                        launch()
+                        hedged_at = time.monotonic()
+                    else:
+                        # Out of budget: wait for what is running instead of hedging.
+                        deadline = None
+                    continue
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f'{name}: attempt {index} failed: {e}')
+                        errors.append(e)
+                        result = None
+                    if result is not None:
+                        record.attributes["winner"] = index
+                        return result
+                if not running and remaining:
+                    launch()
+                    hedged_at = time.monotonic()
+        finally:
+            for future in running:
+                future.cancel()
+            record.attributes["attempts"] = len(attempts) - len(remaining)
+
+    if errors:
+        raise errors[0]
+    return None
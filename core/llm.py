@@ -0,0 +1,279 @@
+"""
+LLM access shared by all agents.
+Completions are cached on disk, keyed by model, prompt hash and sampling parameters.
+A record/replay mode stores completions in a separate, never-evicted file so the
+whole pipeline can run deterministically with no network access.
+
+LLM_CACHE_MODE selects the behaviour:
+  - "cache"  (default) serve cached completions, call the API on a miss
+  - "record" always call the API and record every completion
+  - "replay" serve recorded completions only; a miss raises LLMReplayMissError
+  - "off"    always call the API, store nothing
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from core.clients import (
+    acall_with_backoff,
+    call_with_backoff,
+    get_async_openrouter,
+    get_openrouter,
+    llm_rate_keys,
+)
+from core.tracing import record_llm_usage, span
+from core.utils import DiskCache
+from core.utils.cache import DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    from llama_index.core.base.llms.types import CompletionResponse
+
+LLM_CACHE_MODES = ("cache", "record", "replay", "off")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+_stores: Dict[str, DiskCache] = {}
+_stores_lock = threading.Lock()
+
+
+class LLMReplayMissError(RuntimeError):
+    """Raised in replay mode when a prompt has no recorded completion."""
+
+
+def llm_cache_mode() -> str:
+    mode = os.getenv("LLM_CACHE_MODE", "cache").lower()
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"LLM_CACHE_MODE must be one of {LLM_CACHE_MODES}, got '{mode}'")
+    return mode
+
+
+def _store(name: str) -> DiskCache:
+    # One handle per process; "responses" is the TTL/size-bounded cache,
+    # "recordings" the replay log, which is never evicted.
+    with _stores_lock:
+        if name not in _stores:
+            if name == "responses":
+                _stores[name] = DiskCache(
+                    os.path.join(DEFAULT_CACHE_DIR, "llm_responses.sqlite"),
+                    max_bytes=LLM_CACHE_MAX_BYTES,
+                    ttl=LLM_CACHE_TTL,
+                )
+            else:
+                _stores[name] = DiskCache(
+                    os.getenv("LLM_RECORDINGS_PATH", os.path.join(DEFAULT_CACHE_DIR, "llm_recordings.sqlite")),
+                    max_bytes=None,
+                )
+        return _stores[name]
+
+
+# ------------------------ API Call Counting ------------------------ #
+
+_api_calls: contextvars.ContextVar[Optional[List[None]]] = contextvars.ContextVar("llm_api_calls", default=None)
+
+
+@contextlib.contextmanager
+def count_api_calls() -> Iterator[List[None]]:
+    """
+    Yields a list that gains one item per completion sent to the API (not
+    served from the cache) in this context, including threads started from it.
+    """
+    calls: List[None] = []
+    token = _api_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _api_calls.reset(token)
+
+
+def _note_api_call() -> None:
+    calls = _api_calls.get()
+    if calls is not None:
+        calls.append(None)
+
+
+def completion_key(model: str, prompt: str, **params: Any) -> str:
+    """Cache key for one completion: model, prompt hash and sampling parameters."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps({"model": model, "prompt": prompt_hash, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _completion(text: str) -> "CompletionResponse":
+    # Imported here so cache hits and replay runs never pay for llama_index.core.
+    from llama_index.core.base.llms.types import CompletionResponse
+    return CompletionResponse(text=text)
+
+
+def _first_chunk(open_stream: Any, prompt: str, **kwargs: Any) -> Tuple[Any, Iterator[Any]]:
+    # The request is only sent once the stream is iterated, so the first chunk is
+    # what call_with_backoff has to wait for to see a 429.
+    stream = iter(open_stream(prompt, **kwargs))
+    return next(stream, None), stream
+
+
+async def _afirst_chunk(open_stream: Any, prompt: str, **kwargs: Any) -> Tuple[Any, AsyncIterator[Any]]:
+    stream = (await open_stream(prompt, **kwargs)).__aiter__()
+    try:
+        return await stream.__anext__(), stream
+    except StopAsyncIteration:
+        return None, stream
+
+
+class CachedLLM:
+    """
+    Drop-in for the subset of the OpenRouter LLM the agents use (`complete`/`acomplete`,
+    and `stream_complete`/`astream_complete`, which yield the text as it arrives).
+    Misses go to the pooled, rate-limited client from core.clients; it is only
+    looked up on a miss, so replay mode needs no API key.
+    """
+
+    def __init__(self, model: str, temperature: float = 0.0, max_tokens: Optional[int] = None):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    def complete(self, prompt: str, attempt: int = 1, **kwargs: Any) -> "CompletionResponse":
+        """
+        `attempt` above 1 marks a retry of the same prompt: it is cached under
+        its own key, so it is never served the answer it is retrying.
+        """
+        with span("llm.complete", "llm", model=self.model) as record:
+            key, cached = self._lookup(prompt, kwargs, attempt)
+            if cached is not None:
+                record_llm_usage(record, prompt, cached, cached=True)
+                return cached
+            _note_api_call()
+            client = get_openrouter(self.model, self.temperature, self.max_tokens)
+            response = call_with_backoff(llm_rate_keys(self.model), client.complete, prompt, **kwargs)
+            record_llm_usage(record, prompt, response)
+            self._remember(key, response.text)
+            return response
+
+    async def acomplete(self, prompt: str, attempt: int = 1, **kwargs: Any) -> "CompletionResponse":
+        with span("llm.acomplete", "llm", model=self.model) as record:
+            key, cached = self._lookup(prompt, kwargs, attempt)
+            if cached is not None:
+                record_llm_usage(record, prompt, cached, cached=True)
+                return cached
+            _note_api_call()
+            client = get_async_openrouter(self.model, self.temperature, self.max_tokens)
+            response = await acall_with_backoff(llm_rate_keys(self.model), client.acomplete, prompt, **kwargs)
+            record_llm_usage(record, prompt, response)
+            self._remember(key, response.text)
+            return response
+
+    def stream_complete(self, prompt: str, **kwargs: Any) -> Iterator[str]:
+        """
+        Text deltas as they are generated; a cached completion comes back in one piece.
+        Consume the iterator fully: the completion is only cached once it has ended.
+        """
+        with span("llm.stream", "llm", model=self.model) as record:
+            key, cached = self._lookup(prompt, kwargs)
+            if cached is not None:
+                record_llm_usage(record, prompt, cached, cached=True)
+                yield cached.text
+                return
+            _note_api_call()
+            client = get_openrouter(self.model, self.temperature, self.max_tokens)
+            started = time.perf_counter()
+            first, stream = call_with_backoff(
+                llm_rate_keys(self.model), _first_chunk, client.stream_complete, prompt, **kwargs
+            )
+            parts, last = [], None
+            for last in itertools.chain([first] if first is not None else [], stream):
+                if last.delta:
+                    if not parts:
+                        record.attributes["ttft_seconds"] = round(time.perf_counter() - started, 3)
+                    parts.append(last.delta)
+                    yield last.delta
+            self._finish_stream(record, key, prompt, "".join(parts), last)
+
+    async def astream_complete(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Async counterpart of stream_complete."""
+        with span("llm.astream", "llm", model=self.model) as record:
+            key, cached = self._lookup(prompt, kwargs)
+            if cached is not None:
+                record_llm_usage(record, prompt, cached, cached=True)
+                yield cached.text
+                return
+            _note_api_call()
+            client = get_async_openrouter(self.model, self.temperature, self.max_tokens)
+            started = time.perf_counter()
+            last, stream = await acall_with_backoff(
+                llm_rate_keys(self.model), _afirst_chunk, client.astream_complete, prompt, **kwargs
+            )
+            parts = []
+            while last is not None:
+                if last.delta:
+                    if not parts:
+                        record.attributes["ttft_seconds"] = round(time.perf_counter() - started, 3)
+                    parts.append(last.delta)
+                    yield last.delta
+                try:
+                    last = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+            self._finish_stream(record, key, prompt, "".join(parts), last)
+
+    def _finish_stream(self, record: Any, key: Optional[str], prompt: str, text: str, last: Any) -> None:
+        # The final chunk carries the whole text and the provider's usage, when it reports any.
+        record_llm_usage(record, prompt, last if last is not None else _completion(text))
+        self._remember(key, text)
+
+    def forget(self, prompt: str, attempt: int = 1, **kwargs: Any) -> None:
+        """
+        Drop a cached completion the caller could not use, so later runs ask
+        again. Recordings are kept: replay must see what the recorded run saw.
+        """
+        if llm_cache_mode() != "off":
+            _store("responses").delete(self._key(prompt, kwargs, attempt))
+
+    def _key(self, prompt: str, kwargs: Dict[str, Any], attempt: int = 1) -> str:
+        if attempt > 1:
+            kwargs = {**kwargs, "attempt": attempt}
+        return completion_key(self.model, prompt, temperature=self.temperature, max_tokens=self.max_tokens, **kwargs)
+
+    def _lookup(
+            self,
+            prompt: str,
+            kwargs: Dict[str, Any],
+            attempt: int = 1,
+    ) -> Tuple[Optional[str], Optional["CompletionResponse"]]:
+        """Returns the cache key (None when caching is off) and the stored completion, if any."""
+        mode = llm_cache_mode()
+        if mode == "off":
+            return None, None
+
+        key = self._key(prompt, kwargs, attempt)
+        if mode == "replay":
+            text = _store("recordings").get(key)
+            if text is None:
+                raise LLMReplayMissError(f"No recorded completion for {self.model} (key {key[:12]})")
+            return key, _completion(text)
+
+        if mode == "cache":
+            text = _store("responses").get(key)
+            if text is not None:
+                logger.debug(f'LLM cache hit for {self.model} (key {key[:12]})')
+                return key, _completion(text)
+        return key, None
+
+    def _remember(self, key: Optional[str], text: str) -> None:
+        if key is None:
+            return
+        _store("responses").set(key, text)
+        if llm_cache_mode() == "record":
+            _store("recordings").set(key, text)
+
+
+def get_llm(model: str, temperature: float = 0.0, max_tokens: Optional[int] = None) -> CachedLLM:
+    return CachedLLM(model=model, temperature=temperature, max_tokens=max_tokens)
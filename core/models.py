@@ -1,5 +1,5 @@
 import datetime as dt
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -43,8 +43,10 @@ class WorkItem(BaseModel):
     technologies: List[str] = Field(default_factory=list)
 
     @field_validator("end_date")
-    def _check_dates(self, v, values):
-        if v and values.get("start_date") and v < values["start_date"]:
+    @classmethod
+    def _check_dates(cls, v, values):
+        start = values.data.get("start_date")
+        if v and start and v < start:
             raise ValueError("end_date must be ≥ start_date")
         return v
 
@@ -111,9 +113,44 @@ class GapAnalysis(BaseModel):
     candidate_gaps: List[str] = Field(
         description="Important skills the candidate is missing based on market trends."
     )
+    candidate_mentions: List[str] = Field(
+        default_factory=list,
+        description="Gaps the résumé mentions (in prose or a single project) without enough evidence to be strengths.",
+    )
     improvement_suggestions: str = Field(
         description="Actionable advice for the candidate to bridge the gaps."
     )
+    market_coverage: Optional[float] = Field(
+        default=None,
+        description="Share (0-1) of the market's in-demand skills the candidate has, when scored.",
+    )
+
+
+# --- Tracing ---
+class Span(BaseModel):
+    """One timed unit of work: a pipeline stage, an LLM attempt, a search, an extraction."""
+
+    name: str = Field(description="What was timed, e.g. 'stage.parse' or 'llm.complete'.")
+    kind: Literal["stage", "llm", "search", "extract", "parse", "postprocess"] = Field(
+        description="Category used to group spans when looking for hot spots."
+    )
+    trace_id: str = Field(description="Shared by every span of one résumé's run (32 hex chars).")
+    span_id: str = Field(description="Unique id of this span (16 hex chars).")
+    parent_id: Optional[str] = Field(default=None, description="The enclosing span, if any.")
+    start_time: float = Field(description="Unix time the span started, in seconds.")
+    duration_seconds: float = Field(default=0.0, description="Wall time of the span.")
+    status: Literal["ok", "error"] = Field(default="ok")
+    error: Optional[str] = Field(default=None, description="The exception that ended the span, if any.")
+    model: Optional[str] = Field(default=None, description="The LLM used, for llm spans.")
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    tokens_estimated: bool = Field(
+        default=False,
+        description="True when the provider reported no usage and tokens were estimated from text length.",
+    )
+    retries: int = Field(default=0, description="Rate-limit retries or re-prompts inside this span.")
+    cost_usd: float = Field(default=0.0, description="Estimated provider cost.")
+    attributes: Dict[str, Any] = Field(default_factory=dict)
 
 
 # --- The Central State Object ---
@@ -126,15 +163,98 @@ class AnalysisState(BaseModel):
     raw_resume_text: str = Field(
         description="The original text extracted from the resume file."
     )
+    resume_file_path: Optional[str] = Field(
+        default=None,
+        description="The résumé file, when the Parser Agent should extract the text itself.",
+    )
+    detected_language: Optional[str] = Field(
+        default=None,
+        description="ISO 639-1 code of the résumé's language, set by the Parser Agent.",
+    )
+    section_languages: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Sections written in a language other than detected_language, e.g. {'projects': 'de'}.",
+    )
     structured_resume: Optional[StructuredResume] = Field(
         default=None,
         description="The resume parsed into a structured Pydantic model by the Parser Agent.",
     )
+    duplicate_of: Optional[str] = Field(
+        default=None,
+        description="Content hash of an earlier near-identical résumé whose analysis was reused.",
+    )
     market_research: Optional[str] = Field(
         default=None,
         description="A summary of market trends and required skills from the Researcher Agent.",
     )
+    scored_gaps: Optional[GapAnalysis] = Field(
+        default=None,
+        description="Deterministic strengths and gaps from the skill taxonomy, computed before the Analyst Agent.",
+    )
     gap_analysis: Optional[str] = Field(
         default=None,
         description="A structured analysis of the candidate's skills vs. market demands from the Analyst Agent.",
     )
+    final_report: Optional[str] = Field(
+        default=None,
+        description="The polished report written by the Synthesizer Agent.",
+    )
+    spans: List[Span] = Field(
+        default_factory=list,
+        description="Timing, token and cost records for every stage and external call, in completion order.",
+    )
+
+
+# --- HTTP Service ---
+class JobInfo(BaseModel):
+    """Status of one résumé submitted to the HTTP service."""
+
+    id: str = Field(description="Job id, used in /jobs/{id} URLs.")
+    filename: str = Field(description="Name of the uploaded file.")
+    status: Literal["queued", "running", "done", "error"]
+    created: float = Field(description="Unix time the upload was accepted.")
+    started: Optional[float] = Field(default=None, description="Unix time a worker picked the job up.")
+    finished: Optional[float] = Field(default=None, description="Unix time the job finished or failed.")
+    stages: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Latest event per pipeline stage: started, finished, restored, skipped or failed.",
+    )
+    error: Optional[str] = Field(default=None, description="Why the job failed, if it did.")
+
+
+# --- Batch Output Record ---
+class BatchResult(BaseModel):
+    """One JSONL record of a batch run: the outcome for a single résumé file."""
+
+    path: str = Field(description="The résumé file this record refers to.")
+    status: Literal["ok", "error"] = Field(
+        description="Whether the résumé made it through the whole chain."
+    )
+    stage: Optional[Literal["extract", "analyse"]] = Field(
+        default=None,
+        description="The stage that failed, if any.",
+    )
+    report: Optional[str] = Field(
+        default=None,
+        description="The final report from the Synthesizer Agent.",
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="The error that stopped this résumé, if any.",
+    )
+    extract_seconds: Optional[float] = Field(
+        default=None,
+        description="Wall time spent extracting text.",
+    )
+    analyse_seconds: Optional[float] = Field(
+        default=None,
+        description="Wall time spent in the agent chain.",
+    )
+    llm_tokens: Optional[int] = Field(
+        default=None,
+        description="Prompt plus completion tokens across every LLM call.",
+    )
+    cost_usd: Optional[float] = Field(
+        default=None,
+        description="Estimated LLM cost of the résumé.",
+    )
@@ -0,0 +1,211 @@
+"""
+Asynchronous DAG executor for the agent pipeline.
+Each stage declares the AnalysisState fields it reads and writes as dotted paths
+("structured_resume.skills"). A stage waits only for earlier stages whose fields
+conflict with its own, so independent work overlaps, and many résumés can be
+driven from a single event loop. With a CheckpointStore, stages whose inputs
+are unchanged since a previous run restore their outputs instead of running.
+"""
+
+import asyncio
+import contextvars
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from core.checkpoints import CheckpointStore, checkpoint_key, resume_digest, set_refresh
+from core.models import AnalysisState
+from core.tracing import collect_spans, span
+
+# Sync stages are I/O bound (HTTP calls), so the pool is sized well past the core count.
+DEFAULT_STAGE_THREADS = 64
+
+# Progress hook: called on the event loop with (stage name, event), where event
+# is "started", then one of "finished", "restored" (from a checkpoint), "skipped"
+# or "failed".
+StageListener = Callable[[str, str], None]
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """True when one dotted field path is the other or nested inside it."""
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+def _any_overlap(left: Iterable[str], right: Iterable[str]) -> bool:
+    return any(_overlaps(a, b) for a in left for b in right)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One node of the pipeline. `func` mutates the state in place and may be a
+    plain function (run on the executor's thread pool) or a coroutine function.
+    Bump `version` when the stage's logic or prompt changes, so its old
+    checkpoints go stale; `ttl` (seconds) expires them for time-sensitive stages.
+    The stage is skipped when `skip` returns True once its upstream stages have
+    finished, so it may only look at fields those stages write. `config`
+    fingerprints the run settings the output depends on (models, backends); it
+    is part of the checkpoint key, and returning None skips checkpoints for the run.
+    """
+
+    name: str
+    func: Callable[[AnalysisState], Any]
+    reads: FrozenSet[str] = field(default_factory=frozenset)
+    writes: FrozenSet[str] = field(default_factory=frozenset)
+    version: str = "1"
+    ttl: Optional[float] = None
+    checkpoint: bool = True
+    skip: Optional[Callable[[AnalysisState], bool]] = None
+    config: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+
+    def conflicts_with(self, other: "Stage") -> bool:
+        return (
+                _any_overlap(self.writes, other.reads)
+                or _any_overlap(self.reads, other.writes)
+                or _any_overlap(self.writes, other.writes)
+        )
+
+
+class PipelineExecutor:
+    """
+    Runs stages as a DAG derived from their declared fields: a stage depends on
+    every earlier stage it conflicts with. Declaration order breaks ties, so the
+    result matches running the stages sequentially in that order.
+    """
+
+    def __init__(
+            self,
+            stages: Iterable[Stage],
+            max_threads: int = DEFAULT_STAGE_THREADS,
+            checkpoints: Optional[CheckpointStore] = None,
+    ):
+        self.stages: List[Stage] = list(stages)
+        self.checkpoints = checkpoints
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Stage names must be unique: {names}")
+
+        self.dependencies: Dict[str, Set[str]] = {
+            stage.name: {earlier.name for earlier in self.stages[:i] if earlier.conflicts_with(stage)}
+            for i, stage in enumerate(self.stages)
+        }
+        self._threads = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="stage")
+
+    def downstream(self, names: Iterable[str]) -> Set[str]:
+        """The named stages plus every stage that (transitively) depends on them."""
+        found = set(names)
+        unknown = found - set(self.dependencies)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+        for stage in self.stages:
+            if self.dependencies[stage.name] & found:
+                found.add(stage.name)
+        return found
+
+    async def run(
+            self,
+            state: AnalysisState,
+            refresh: Iterable[str] = (),
+            on_stage: Optional[StageListener] = None,
+    ) -> AnalysisState:
+        """
+        Runs every stage over `state`. Stages named in `refresh`, and everything
+        downstream of them, ignore their checkpoints. `on_stage` is told as each
+        stage starts and ends.
+        """
+        forced = self.downstream(refresh)
+        resume = None
+        if self.checkpoints is not None:
+            resume = await self._offload(resume_digest, state)
+        tasks: Dict[str, asyncio.Task] = {}
+        # Tasks copy the context they are created in, so every stage records into state.spans.
+        with collect_spans(state.spans):
+            for stage in self.stages:
+                upstream = [tasks[name] for name in self.dependencies[stage.name]]
+                tasks[stage.name] = asyncio.create_task(
+                    self._run_stage(stage, state, upstream, resume, stage.name in forced, on_stage)
+                )
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return state
+
+    async def run_many(
+            self,
+            states: Iterable[AnalysisState],
+            concurrency: int = 100,
+            refresh: Iterable[str] = (),
+    ) -> List[Any]:
+        """
+        Runs many states on the current loop, at most `concurrency` at once.
+        Returns the finished state, or the exception raised, for each input in order.
+        """
+        limit = asyncio.Semaphore(concurrency)
+        refresh = tuple(refresh)
+
+        async def _bounded(state: AnalysisState) -> AnalysisState:
+            async with limit:
+                return await self.run(state, refresh)
+
+        return await asyncio.gather(*(_bounded(state) for state in states), return_exceptions=True)
+
+    async def _offload(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._threads, context.run, func, *args)
+
+    async def _run_stage(
+            self,
+            stage: Stage,
+            state: AnalysisState,
+            upstream: List[Awaitable],
+            resume: Optional[str],
+            forced: bool,
+            on_stage: Optional[StageListener] = None,
+    ) -> None:
+        if upstream:
+            await asyncio.gather(*upstream)
+        notify = on_stage or (lambda name, event: None)
+        notify(stage.name, "started")
+        try:
+            outcome = await self._execute(stage, state, resume, forced)
+        except BaseException:
+            notify(stage.name, "failed")
+            raise
+        notify(stage.name, outcome)
+
+    async def _execute(self, stage: Stage, state: AnalysisState, resume: Optional[str], forced: bool) -> str:
+        """Runs one stage, restores it from its checkpoint or skips it; returns which."""
+        # Each stage task runs in its own copy of the context, so this stays local to the stage.
+        set_refresh(forced)
+        with span(f"stage.{stage.name}", "stage") as record:
+            if stage.skip is not None and stage.skip(state):
+                record.attributes["skipped"] = True
+                return "skipped"
+            key = None
+            config = stage.config() if stage.config is not None else {}
+            if resume is not None and stage.checkpoint and config is None:
+                record.attributes["checkpoint"] = "off"
+            elif resume is not None and stage.checkpoint:
+                # Upstream stages have finished, so the inputs the key digests are final.
+                key = checkpoint_key(stage, state, resume, config)
+                saved = None if forced else await self._offload(self.checkpoints.load, stage, key)
+                record.attributes["checkpoint"] = "refresh" if forced else "hit" if saved is not None else "miss"
+                if saved is not None:
+                    await self._offload(self.checkpoints.restore, state, saved)
+                    return "restored"
+            if inspect.iscoroutinefunction(stage.func):
+                await stage.func(state)
+            else:
+                await self._offload(stage.func, state)
+            if key is not None:
+                await self._offload(self.checkpoints.save, stage, key, state)
+            return "finished"
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._threads.shutdown(wait=wait)
+
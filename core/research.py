@@ -0,0 +1,152 @@
+"""
+Market research lookups for the Researcher Agent.
+Results are cached on disk under a normalised profile key (search backend,
+canonical role and sorted skills), and concurrent identical lookups are coalesced into a single
+in-flight search. SEARCH_BACKEND=stub serves canned results for offline runs.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from core.clients import call_with_backoff, get_tavily
+from core.tracing import span
+from core.utils import DiskCache
+from core.utils.cache import DEFAULT_CACHE_DIR
+from core.utils.skills import normalise_skill
+
+SEARCH_BACKENDS = ("tavily", "stub")
+RESEARCH_CACHE_TTL = float(os.getenv("RESEARCH_CACHE_TTL", 24 * 3600))
+RESEARCH_CACHE_MAX_BYTES = int(os.getenv("RESEARCH_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+_ROLE_ALIASES = {"sr": "senior", "jr": "junior", "snr": "senior", "mgr": "manager", "eng": "engineer"}
+
+
+# ------------------------ Profile Keys ------------------------ #
+
+def canonical_role(role: str) -> str:
+    words = re.sub(r"[^a-z0-9+#]+", " ", role.lower().replace("&", " and ")).split()
+    return " ".join(_ROLE_ALIASES.get(word, word) for word in words)
+
+
+def canonical_skills(skills: List[str]) -> List[str]:
+    return sorted({normalise_skill(skill) for skill in skills if skill.strip()})
+
+
+def research_key(role: str, skills: List[str], backend: str = "tavily") -> str:
+    # The backend is part of the key so stub results are never served to a live run.
+    profile = backend + "|" + canonical_role(role) + "|" + ",".join(canonical_skills(skills))
+    return hashlib.sha256(profile.encode("utf-8")).hexdigest()
+
+
+# ------------------------ Search Backends ------------------------ #
+
+class TavilySearchBackend:
+    name = "tavily"
+
+    def search(self, query: str, max_results: int = 3) -> List[str]:
+        results = call_with_backoff(("tavily",), get_tavily().search, query=query, max_results=max_results)
+        return [res.text for res in results]
+
+
+class StubSearchBackend:
+    """Deterministic canned results, so the pipeline runs with no network or quota."""
+
+    name = "stub"
+
+    RESULTS = [
+        "Demand for software engineers remains steady, with employers prioritising cloud platforms "
+        "(AWS, Azure, GCP), Kubernetes, Docker and infrastructure as code such as Terraform.",
+        "Job postings increasingly list Python, SQL, TypeScript and Go, together with experience in "
+        "CI/CD, observability and distributed systems. Machine learning and LLM tooling are growing fast.",
+        "Typical salaries vary by region and seniority; communication, system design and mentoring "
+        "are cited as differentiators for senior roles.",
+    ]
+
+    def search(self, query: str, max_results: int = 3) -> List[str]:
+        return [f"{text} (stub result for: {query})" for text in self.RESULTS[:max_results]]
+
+
+def search_backend_name() -> str:
+    backend = os.getenv("SEARCH_BACKEND", "tavily").lower()
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"SEARCH_BACKEND must be one of {SEARCH_BACKENDS}, got '{backend}'")
+    return backend
+
+
+def get_search_backend():
+    return StubSearchBackend() if search_backend_name() == "stub" else TavilySearchBackend()
+
+
+# ------------------------ Cache ------------------------ #
+
+class MarketResearchCache:
+    def __init__(self, backend=None, store: Optional[DiskCache] = None):
+        self._backend = backend
+        self.store = store or DiskCache(
+            os.path.join(DEFAULT_CACHE_DIR, "research.sqlite"),
+            max_bytes=RESEARCH_CACHE_MAX_BYTES,
+            ttl=RESEARCH_CACHE_TTL,
+        )
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = get_search_backend()
+        return self._backend
+
+    def lookup(self, role: str, skills: List[str], query: str, max_results: int = 3, refresh: bool = False) -> str:
+        """
+        Research summary for a profile. The first caller for a key runs the search;
+        callers arriving while it is in flight wait for its result instead.
+        With `refresh`, a cached summary is ignored and replaced.
+        """
+        key = research_key(role, skills, getattr(self.backend, "name", type(self.backend).__name__))
+        with span("research.lookup", "search", role=canonical_role(role)) as record:
+            summary, record.attributes["source"] = self._lookup(key, role, query, max_results, refresh)
+            return summary
+
+    def _lookup(self, key: str, role: str, query: str, max_results: int, refresh: bool = False) -> Tuple[str, str]:
+        """The summary, and where it came from: "cache", "coalesced" or "search"."""
+        cached = None if refresh else self.store.get(key)
+        if cached is not None:
+            logger.debug(f'Research cache hit for {canonical_role(role)}')
+            return cached, "cache"
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = future = Future()
+        if pending is not None:
+            return pending.result(), "coalesced"
+
+        try:
+            summary = "\n\n".join(self.backend.search(query=query, max_results=max_results))
+            self.store.set(key, summary)
+            future.set_result(summary)
+            return summary, "search"
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+_research_cache: Optional[MarketResearchCache] = None
+_research_cache_lock = threading.Lock()
+
+
+def get_research_cache() -> MarketResearchCache:
+    global _research_cache
+    with _research_cache_lock:
+        if _research_cache is None:
+            _research_cache = MarketResearchCache()
+        return _research_cache
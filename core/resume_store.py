@@ -0,0 +1,337 @@
+"""
+Compact columnar store for parsed résumés.
+
+A store is a directory of .npy columns, one set per table (résumés, education,
+work, projects, certifications, skill buckets), in the spirit of Arrow:
+  - every string (names, companies, titles, skills, ...) is interned once in a
+    shared pool (a UTF-8 blob plus offsets) and columns hold int32 ids, -1 for None;
+  - dates are int32 days since 1970-01-01, gpa is float32 (NaN for None);
+  - list fields are an int64 offsets column plus a flat values column, and
+    nested tables are reached through the parent's offsets.
+Columns are memory-mapped on first use, so opening a store costs nothing and
+analytics read the arrays in place. `get(i)` rebuilds one StructuredResume
+from its rows without re-validating it.
+"""
+
+import datetime as dt
+import json
+import os
+import shutil
+import threading
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.models import (
+    Certification,
+    Contact,
+    EducationItem,
+    ProjectItem,
+    SkillBucket,
+    StructuredResume,
+    WorkItem,
+)
+from core.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+STORE_FORMAT = "resume-store"
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+NULL_ID = -1
+NULL_DATE = -(2 ** 31)
+EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+# Column kinds: interned string id, date, float, list of strings, rows of a child table.
+STR, DATE, FLOAT, STRS, ROWS = "str", "date", "float", "strs", "rows"
+
+SCHEMA: Dict[str, Dict[str, str]] = {
+    "resumes": {
+        "key": STR, "full_name": STR, "email": STR, "phone": STR, "linkedin": STR, "github": STR,
+        "location": STR, "summary": STR, "languages": STRS,
+        "education": ROWS, "work_experience": ROWS, "projects": ROWS, "certifications": ROWS, "skills": ROWS,
+    },
+    "education": {
+        "institution": STR, "degree": STR, "major": STR, "gpa": FLOAT, "start_date": DATE, "end_date": DATE,
+    },
+    "work_experience": {
+        "company": STR, "title": STR, "location": STR, "start_date": DATE, "end_date": DATE,
+        "description": STR, "technologies": STRS,
+    },
+    "projects": {"name": STR, "description": STR, "technologies": STRS, "url": STR},
+    "certifications": {"name": STR, "issuer": STR, "issue_date": DATE, "expiry_date": DATE},
+    "skills": {"category": STR, "skills": STRS},
+}
+
+_ROW_MODELS = {
+    "education": EducationItem,
+    "work_experience": WorkItem,
+    "projects": ProjectItem,
+    "certifications": Certification,
+    "skills": SkillBucket,
+}
+_CONTACT_FIELDS = tuple(Contact.model_fields)
+
+# array typecodes and numpy dtypes of the stored columns.
+_TYPECODES = {STR: "i", DATE: "i", FLOAT: "f", "offsets": "q"}
+_DTYPES = {STR: "int32", DATE: "int32", FLOAT: "float32", "offsets": "int64"}
+
+
+def _column_file(table: str, column: str, part: str = "") -> str:
+    return f"{table}.{column}{'.' + part if part else ''}.npy"
+
+
+def _date_to_days(value: Optional[dt.date]) -> int:
+    return NULL_DATE if value is None else value.toordinal() - EPOCH_ORDINAL
+
+
+def _days_to_date(days: int) -> Optional[dt.date]:
+    return None if days == NULL_DATE else dt.date.fromordinal(days + EPOCH_ORDINAL)
+
+
+# ------------------------ Writer ------------------------ #
+
+class ResumeStoreWriter:
+    """
+    Builds a store from résumés appended one at a time (thread-safe). Nothing
+    is visible at `path` until close(), which replaces any store already there.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._blob = bytearray()
+        self._string_offsets = array("q", [0])
+        self._columns: Dict[Tuple[str, str], array] = {}
+        self._values: Dict[Tuple[str, str], array] = {}
+        for table, columns in SCHEMA.items():
+            for column, kind in columns.items():
+                if kind in (STRS, ROWS):
+                    self._columns[table, column] = array("q", [0])
+                    if kind == STRS:
+                        self._values[table, column] = array("i")
+                else:
+                    self._columns[table, column] = array(_TYPECODES[kind])
+        self._rows = {table: 0 for table in SCHEMA}
+        self._closed = False
+
+    def __len__(self) -> int:
+        return self._rows["resumes"]
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_ID
+        sid = self._ids.get(value)
+        if sid is None:
+            sid = self._ids[value] = len(self._ids)
+            self._blob += value.encode("utf-8")
+            self._string_offsets.append(len(self._blob))
+        return sid
+
+    def _add_row(self, table: str, values: Dict[str, Any]) -> None:
+        for column, kind in SCHEMA[table].items():
+            value = values.get(column)
+            target = self._columns[table, column]
+            if kind == STR:
+                target.append(self.intern(value))
+            elif kind == DATE:
+                target.append(_date_to_days(value))
+            elif kind == FLOAT:
+                target.append(float("nan") if value is None else value)
+            elif kind == STRS:
+                items = self._values[table, column]
+                items.extend(self.intern(item) for item in value or ())
+                target.append(len(items))
+            else:
+                for child in value or ():
+                    self._add_row(column, vars(child))
+                target.append(self._rows[column])
+        self._rows[table] += 1
+
+    def append(self, resume: StructuredResume, key: Optional[str] = None) -> int:
+        """Add a résumé; returns its row number in the store."""
+        values = {**vars(resume), **vars(resume.contact), "key": key}
+        with self._lock:
+            if self._closed:
+                raise ValueError("ResumeStoreWriter is closed")
+            self._add_row("resumes", values)
+            return self._rows["resumes"] - 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            staging = self.path.rstrip(os.sep) + ".tmp"
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+
+            def save(name: str, data: array, dtype: str) -> None:
+                np.save(os.path.join(staging, name), np.frombuffer(data, dtype=dtype))
+
+            save("strings.npy", self._blob, "uint8")
+            save("strings.offsets.npy", self._string_offsets, "int64")
+            for (table, column), data in self._columns.items():
+                kind = SCHEMA[table][column]
+                if kind in (STRS, ROWS):
+                    save(_column_file(table, column, "offsets"), data, "int64")
+                    if kind == STRS:
+                        save(_column_file(table, column), self._values[table, column], "int32")
+                else:
+                    save(_column_file(table, column), data, _DTYPES[kind])
+
+            manifest = {
+                "format": STORE_FORMAT,
+                "version": STORE_VERSION,
+                "strings": len(self._ids),
+                "rows": self._rows,
+                "schema": SCHEMA,
+            }
+            with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(staging, self.path)
+
+    def __enter__(self) -> "ResumeStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_store(path: str, resumes: List[Tuple[StructuredResume, Optional[str]]]) -> int:
+    """Write (résumé, key) pairs as a new store at `path`; returns the number written."""
+    with ResumeStoreWriter(path) as writer:
+        for resume, key in resumes:
+            writer.append(resume, key)
+        return len(writer)
+
+
+# ------------------------ Reader ------------------------ #
+
+class ResumeStore:
+    """
+    Read-only view of a store. Columns are named "table.column", e.g.
+    "work_experience.company" or "resumes.full_name".
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != STORE_FORMAT or manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Not a version {STORE_VERSION} résumé store: {path}")
+        self.rows: Dict[str, int] = manifest["rows"]
+        self.string_count: int = manifest["strings"]
+        self._arrays: Dict[str, "np.ndarray"] = {}
+        self._lookup: Optional[Dict[str, int]] = None
+        self.string = lru_cache(maxsize=65536)(self._decode)
+
+    def __len__(self) -> int:
+        return self.rows["resumes"]
+
+    def _array(self, name: str) -> "np.ndarray":
+        array_ = self._arrays.get(name)
+        if array_ is None:
+            array_ = self._arrays[name] = np.load(os.path.join(self.path, name), mmap_mode="r")
+        return array_
+
+    # ---- strings ----
+
+    def _decode(self, sid: int) -> Optional[str]:
+        if sid < 0:
+            return None
+        offsets = self._array("strings.offsets.npy")
+        return bytes(self._array("strings.npy")[offsets[sid]:offsets[sid + 1]]).decode("utf-8")
+
+    def lookup(self, value: str) -> Optional[int]:
+        """The id of an interned string, for filtering id columns without decoding them."""
+        if self._lookup is None:
+            self._lookup = {self._decode(sid): sid for sid in range(self.string_count)}
+        return self._lookup.get(value)
+
+    # ---- columns ----
+
+    def _kind(self, name: str) -> Tuple[str, str, str]:
+        table, _, column = name.partition(".")
+        kind = SCHEMA.get(table, {}).get(column)
+        if kind is None:
+            raise KeyError(f"Unknown column '{name}'")
+        return table, column, kind
+
+    def column(self, name: str) -> "np.ndarray":
+        """The memory-mapped values of a column (string ids for string and list columns)."""
+        table, column, kind = self._kind(name)
+        if kind == ROWS:
+            raise KeyError(f"'{name}' is a nested table; use offsets('{name}')")
+        return self._array(_column_file(table, column))
+
+    def offsets(self, name: str) -> "np.ndarray":
+        """Row i of a list column or nested table spans values[offsets[i]:offsets[i + 1]]."""
+        table, column, kind = self._kind(name)
+        if kind not in (STRS, ROWS):
+            raise KeyError(f"'{name}' is not a list column")
+        return self._array(_column_file(table, column, "offsets"))
+
+    def dates(self, name: str) -> "np.ndarray":
+        """A date column as datetime64[D], NaT where the date is unknown."""
+        days = self.column(name)
+        values = days.astype("int64").astype("datetime64[D]")
+        values[days == NULL_DATE] = np.datetime64("NaT")
+        return values
+
+    def value_counts(self, name: str, top: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Most common values of a string or list-of-strings column, counted without decoding."""
+        ids = self.column(name)
+        counts = np.bincount(ids[ids >= 0], minlength=self.string_count)
+        order = np.argsort(counts, kind="stable")[::-1]
+        order = order[counts[order] > 0][:top]
+        return [(self.string(int(sid)), int(counts[sid])) for sid in order]
+
+    # ---- records ----
+
+    def _strings(self, table: str, column: str, row: int) -> List[str]:
+        offsets = self.offsets(f"{table}.{column}")
+        ids = self.column(f"{table}.{column}")[offsets[row]:offsets[row + 1]]
+        return [self.string(int(sid)) for sid in ids]
+
+    def _record(self, table: str, row: int) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for column, kind in SCHEMA[table].items():
+            if kind == STR:
+                values[column] = self.string(int(self.column(f"{table}.{column}")[row]))
+            elif kind == DATE:
+                values[column] = _days_to_date(int(self.column(f"{table}.{column}")[row]))
+            elif kind == FLOAT:
+                value = float(self.column(f"{table}.{column}")[row])
+                values[column] = None if value != value else round(value, 4)
+            elif kind == STRS:
+                values[column] = self._strings(table, column, row)
+            else:
+                offsets = self.offsets(f"{table}.{column}")
+                model = _ROW_MODELS[column]
+                values[column] = [
+                    model.model_construct(**self._record(column, child))
+                    for child in range(int(offsets[row]), int(offsets[row + 1]))
+                ]
+        return values
+
+    def key(self, i: int) -> Optional[str]:
+        return self.string(int(self.column("resumes.key")[i]))
+
+    def get(self, i: int) -> StructuredResume:
+        """Rebuild résumé `i` (already validated when it was written)."""
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Résumé {i} out of range for a store of {len(self)}")
+        values = self._record("resumes", i % len(self))
+        contact = Contact.model_construct(**{name: values.pop(name) for name in _CONTACT_FIELDS})
+        values.pop("key")
+        return StructuredResume.model_construct(contact=contact, **values)
+
+    def __getitem__(self, i: int) -> StructuredResume:
+        return self.get(i)
+
+    def __iter__(self) -> Iterator[StructuredResume]:
+        for i in range(len(self)):
+            yield self.get(i)
@@ -0,0 +1,256 @@
+"""
+Deterministic skill-gap scoring.
+Candidate and market skills are mapped through the synonym taxonomy onto one
+vocabulary (the skills the market asks for) and stacked as NumPy matrices, one
+row per résumé, so strengths, gaps and market coverage for a whole cohort come
+out of a handful of array operations. The analyst LLM only writes the
+narrative on top of the result.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from core.models import AnalysisState, GapAnalysis, MarketResearch, StructuredResume
+from core.tracing import span
+from core.utils.lazy import lazy_import
+from core.utils.skills import display_skill, find_skills, normalise_skill
+
+if TYPE_CHECKING:
+    from core.resume_store import ResumeStore
+
+np = lazy_import("numpy")
+
+MAX_STRENGTHS = int(os.getenv("GAP_MAX_STRENGTHS", "5"))
+MAX_GAPS = int(os.getenv("GAP_MAX_GAPS", "5"))
+
+# Candidate evidence per skill: listed in a skills section, used in a job,
+# used in a project, or only mentioned in the summary or a description.
+LISTED_WEIGHT, WORK_WEIGHT, PROJECT_WEIGHT, MENTION_WEIGHT = 1.0, 1.0, 0.5, 0.25
+# Evidence a strength needs: listed or used in a job (or in several projects).
+# Weaker evidence, such as "eager to learn Kubernetes", leaves the skill a gap
+# and is reported separately as a mention.
+STRENGTH_MIN_WEIGHT = WORK_WEIGHT
+# Candidate weight only breaks ties between equally demanded strengths.
+_TIE_BREAK = 1e-3
+
+_ROLE = re.compile(
+    r"\b((?:(?!(?:for|a|an|the|and|or|of|with|as|to|in|on|at|by|is|are)\b)[A-Za-z+#./-]+\s){0,2}"
+    r"(?:engineer|developer|scientist|analyst|architect|manager|designer)s?)\b",
+    re.IGNORECASE,
+)
+
+
+# ------------------------ Skill Sets ------------------------ #
+
+def candidate_skills(resume: StructuredResume) -> Dict[str, float]:
+    """Normalised skills with the weight of evidence behind each."""
+    weights: Dict[str, float] = {}
+
+    def add(skill: str, weight: float) -> None:
+        key = normalise_skill(skill)
+        if key:
+            weights[key] = weights.get(key, 0.0) + weight
+
+    for bucket in resume.skills:
+        for skill in bucket.skills:
+            add(skill, LISTED_WEIGHT)
+    for work in resume.work_experience:
+        for tech in work.technologies:
+            add(tech, WORK_WEIGHT)
+    for project in resume.projects:
+        for tech in project.technologies:
+            add(tech, PROJECT_WEIGHT)
+    prose = [resume.summary or ""] + [work.description or "" for work in resume.work_experience]
+    prose += [project.description for project in resume.projects]
+    for key in find_skills("\n".join(prose)):
+        weights[key] = weights.get(key, 0.0) + MENTION_WEIGHT
+    return weights
+
+
+def market_research_from_text(text: str) -> MarketResearch:
+    """Structure free-text research: taxonomy skills by mentions, role phrases in order."""
+    roles = []
+    for match in _ROLE.finditer(text):
+        role = match.group(1).strip()
+        role = role[:-1] if role.lower().endswith("s") else role
+        role = role[0].upper() + role[1:]
+        if role not in roles:
+            roles.append(role)
+    return MarketResearch(
+        trending_roles=roles,
+        required_skills=[display_skill(key) for key in find_skills(text)],
+        market_summary=text,
+    )
+
+
+def market_weights(market: MarketResearch) -> Dict[str, float]:
+    """Required skills weighted by rank: the first listed counts most."""
+    weights: Dict[str, float] = {}
+    total = len(market.required_skills)
+    for rank, skill in enumerate(market.required_skills):
+        key = normalise_skill(skill)
+        if key and key not in weights:
+            weights[key] = float(total - rank)
+    return weights
+
+
+# ------------------------ Scoring ------------------------ #
+
+@dataclass
+class GapScores:
+    """
+    Scores for a cohort: `candidate` is (résumés × skills), `market` is
+    (résumés × skills), or (1 × skills) when everyone faces the same market.
+    """
+
+    skills: List[str]
+    candidate: "np.ndarray"
+    market: "np.ndarray"
+
+    def __len__(self) -> int:
+        return self.candidate.shape[0]
+
+    @property
+    def strengths(self) -> "np.ndarray":
+        return (self.candidate >= STRENGTH_MIN_WEIGHT) & (self.market > 0)
+
+    @property
+    def gaps(self) -> "np.ndarray":
+        return (self.candidate < STRENGTH_MIN_WEIGHT) & (self.market > 0)
+
+    @property
+    def mentions(self) -> "np.ndarray":
+        """Gaps the résumé has some evidence for, too little to count as strengths."""
+        return (self.candidate > 0) & self.gaps
+
+    @property
+    def coverage(self) -> "np.ndarray":
+        """Share of the market's demand weight each candidate covers, 0..1."""
+        demand = np.broadcast_to(self.market.sum(axis=1), (len(self),))
+        covered = (self.market * (self.candidate >= STRENGTH_MIN_WEIGHT)).sum(axis=1)
+        return np.divide(covered, demand, out=np.zeros(len(self), dtype="float32"), where=demand > 0)
+
+    def gap_counts(self) -> Dict[str, int]:
+        """How many candidates lack each demanded skill, most common first."""
+        counts = self.gaps.sum(axis=0)
+        return {display_skill(self.skills[i]): int(counts[i]) for i in np.argsort(-counts, kind="stable") if counts[i]}
+
+    def _ranked(self, mask: "np.ndarray", score: "np.ndarray", limit: int) -> "np.ndarray":
+        # Column order per row, best first; masked-out skills sort last and are cut below.
+        return np.argsort(np.where(mask, -score, np.inf), axis=1, kind="stable")[:, :limit]
+
+    def analyses(self, max_strengths: int = MAX_STRENGTHS, max_gaps: int = MAX_GAPS) -> List[GapAnalysis]:
+        strengths, gaps, mentions, coverage = self.strengths, self.gaps, self.mentions, self.coverage
+        market = np.broadcast_to(self.market, self.candidate.shape)
+        strength_order = self._ranked(strengths, market + _TIE_BREAK * self.candidate, max_strengths)
+        gap_order = self._ranked(gaps, market, max_gaps)
+        results = []
+        for row in range(len(self)):
+            found = [display_skill(self.skills[i]) for i in strength_order[row] if strengths[row, i]]
+            missing = [display_skill(self.skills[i]) for i in gap_order[row] if gaps[row, i]]
+            results.append(GapAnalysis(
+                candidate_strengths=found,
+                candidate_gaps=missing,
+                candidate_mentions=[skill for i, skill in zip(gap_order[row], missing) if mentions[row, i]],
+                improvement_suggestions=_suggestions(missing, float(coverage[row])),
+                market_coverage=round(float(coverage[row]), 3),
+            ))
+        return results
+
+
+def _suggestions(missing: List[str], coverage: float) -> str:
+    covered = f"The résumé covers {coverage:.0%} of the skills the market asks for."
+    if not missing:
+        return covered + " No in-demand skills are missing."
+    return f"{covered} Build and show evidence of {', '.join(missing)}, in order of demand."
+
+
+def _vocabulary(markets: Sequence[Dict[str, float]]) -> Dict[str, int]:
+    vocabulary: Dict[str, int] = {}
+    for weights in markets:
+        for key in weights:
+            vocabulary.setdefault(key, len(vocabulary))
+    return vocabulary
+
+
+def _matrix(rows: Sequence[Dict[str, float]], vocabulary: Dict[str, int]) -> "np.ndarray":
+    matrix = np.zeros((len(rows), len(vocabulary)), dtype="float32")
+    for row, weights in enumerate(rows):
+        for key, weight in weights.items():
+            column = vocabulary.get(key)
+            if column is not None:
+                matrix[row, column] = weight
+    return matrix
+
+
+def score_matrix(resumes: Sequence[StructuredResume], markets: Sequence[MarketResearch]) -> GapScores:
+    """
+    Score résumés against their markets in one pass. `markets` holds one entry
+    per résumé, or a single entry shared by the whole cohort.
+    """
+    if len(markets) not in (1, len(resumes)):
+        raise ValueError("Pass one market per résumé, or a single market for all of them")
+    market_rows = [market_weights(market) for market in markets]
+    vocabulary = _vocabulary(market_rows)
+    return GapScores(
+        skills=list(vocabulary),
+        candidate=_matrix([candidate_skills(resume) for resume in resumes], vocabulary),
+        market=_matrix(market_rows, vocabulary),
+    )
+
+
+def score_gaps(
+        resumes: Sequence[StructuredResume],
+        markets: Sequence[MarketResearch],
+        max_strengths: int = MAX_STRENGTHS,
+        max_gaps: int = MAX_GAPS,
+) -> List[GapAnalysis]:
+    """Strengths, gaps and coverage for each résumé, in order."""
+    if not resumes:
+        return []
+    return score_matrix(resumes, markets).analyses(max_strengths, max_gaps)
+
+
+def score_store(store: "ResumeStore", market: MarketResearch) -> GapScores:
+    """
+    Score every résumé in a columnar store against one market straight from
+    its columns: listed skills, work and project technologies (descriptions
+    are not scanned).
+    """
+    weights = market_weights(market)
+    vocabulary = _vocabulary([weights])
+    candidate = np.zeros((len(store), len(vocabulary)), dtype="float32")
+    for table, column, weight in (
+            ("skills", "skills", LISTED_WEIGHT),
+            ("work_experience", "technologies", WORK_WEIGHT),
+            ("projects", "technologies", PROJECT_WEIGHT),
+    ):
+        ids = np.asarray(store.column(f"{table}.{column}"))
+        if not len(ids):
+            continue
+        # Map each distinct string id to its vocabulary column (-1 if the market doesn't ask for it).
+        distinct, inverse = np.unique(ids, return_inverse=True)
+        columns = np.array(
+            [vocabulary.get(normalise_skill(store.string(int(sid)) or ""), -1) for sid in distinct], dtype="int64"
+        )[inverse]
+        # Value -> owning row of `table` -> owning résumé.
+        owners = np.repeat(np.arange(store.rows[table]), np.diff(store.offsets(f"{table}.{column}")))
+        owners = np.repeat(np.arange(len(store)), np.diff(store.offsets(f"resumes.{table}")))[owners]
+        known = columns >= 0
+        np.add.at(candidate, (owners[known], columns[known]), weight)
+    market_row = _matrix([weights], vocabulary)
+    return GapScores(skills=list(vocabulary), candidate=candidate, market=market_row)
+
+
+# ------------------------ Pipeline Stage ------------------------ #
+
+def score_resume_gaps(state: AnalysisState) -> AnalysisState:
+    """Deterministic strengths and gaps for the Analyst Agent to write up."""
+    if not state.structured_resume or not state.market_research:
+        raise ValueError("Cannot score gaps without resume data and market research.")
+    with span("postprocess.score_gaps", "postprocess"):
+        market = market_research_from_text(state.market_research)
+        state.scored_gaps = score_gaps([state.structured_resume], [market])[0]
+    return state
@@ -0,0 +1,323 @@
+"""
+Long-running HTTP service: `python main.py --serve`.
+
+Uploads are queued in a bounded asyncio.Queue and answered with 429 (and a
+Retry-After estimate) once it is full. A fixed set of worker coroutines drains
+the queue through the shared pipeline executor, so OCR libraries, the spaCy
+model and LLM/search clients are loaded once per process instead of once per
+résumé. Stage progress and the final report stream to clients over SSE, the
+report piece by piece (report_chunk) while the Synthesizer is writing it.
+
+    POST /jobs               multipart upload (field "file") -> 202 JobInfo
+    GET  /jobs/{id}          JobInfo
+    GET  /jobs/{id}/events   text/event-stream: stage, report_chunk, report, done | error
+    GET  /jobs/{id}/report   the final report (409 until the job is done)
+    GET  /health             queue depth and worker counts
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import FastAPI, File, Header, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from loguru import logger
+
+from core.clients import aclose_loop_clients
+from core.models import AnalysisState, JobInfo
+from core.startup import warm_up
+from core.utils import is_image_file, is_pdf_file
+from core.utils.cache import DEFAULT_CACHE_DIR
+from core.workflow import get_pipeline, stream_report
+
+SERVICE_QUEUE_DEPTH = int(os.getenv("SERVICE_QUEUE_DEPTH", "64"))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "4"))
+SERVICE_UPLOAD_DIR = os.getenv("SERVICE_UPLOAD_DIR", os.path.join(DEFAULT_CACHE_DIR, "uploads"))
+SERVICE_MAX_UPLOAD_BYTES = int(os.getenv("SERVICE_MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+# Finished jobs kept for status and report lookups before the oldest are dropped.
+SERVICE_JOB_HISTORY = int(os.getenv("SERVICE_JOB_HISTORY", "1000"))
+SSE_KEEPALIVE_SECONDS = 15.0
+TERMINAL_EVENTS = ("done", "error")
+
+
+# ------------------------ Jobs ------------------------ #
+
+@dataclass
+class Job:
+    id: str
+    filename: str
+    path: str
+    created: float = field(default_factory=time.time)
+    status: str = "queued"
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    stages: Dict[str, str] = field(default_factory=dict)
+    report: Optional[str] = None
+    error: Optional[str] = None
+    events: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    listeners: List[asyncio.Queue] = field(default_factory=list)
+
+    def info(self) -> JobInfo:
+        return JobInfo(
+            id=self.id,
+            filename=self.filename,
+            status=self.status,
+            created=self.created,
+            started=self.started,
+            finished=self.finished,
+            stages=dict(self.stages),
+            error=self.error,
+        )
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """Record an event and hand it to every open stream. Must be called on the event loop."""
+        self.events.append((event, data))
+        for listener in self.listeners:
+            listener.put_nowait((len(self.events) - 1, event, data))
+
+    async def follow(
+            self,
+            after: int = -1,
+            idle: Optional[float] = None,
+    ) -> AsyncIterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Past events with an index above `after`, then live ones until the job
+        ends. With `idle`, None is yielded whenever that many seconds pass quietly.
+        """
+        listener: asyncio.Queue = asyncio.Queue()
+        self.listeners.append(listener)
+        try:
+            # Events published while the replay is suspended at a yield land in
+            # both self.events and the queue; `after` tracks what was sent.
+            for index, (event, data) in enumerate(self.events):
+                if index > after:
+                    after = index
+                    yield index, event, data
+                if event in TERMINAL_EVENTS:
+                    return
+            while True:
+                try:
+                    index, event, data = await asyncio.wait_for(listener.get(), idle)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if index > after:
+                    after = index
+                    yield index, event, data
+                if event in TERMINAL_EVENTS:
+                    return
+        finally:
+            self.listeners.remove(listener)
+
+
+class JobManager:
+    """Bounded job queue drained by `workers` coroutines on the service's event loop."""
+
+    def __init__(
+            self,
+            queue_depth: int = SERVICE_QUEUE_DEPTH,
+            workers: int = SERVICE_WORKERS,
+            upload_dir: str = SERVICE_UPLOAD_DIR,
+            refresh: Iterable[str] = (),
+    ):
+        self.queue_depth = queue_depth
+        self.workers = workers
+        self.upload_dir = upload_dir
+        self.refresh = tuple(refresh)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.running = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Smoothed job duration, for Retry-After estimates.
+        self._job_seconds = 30.0
+
+    async def start(self) -> None:
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up: one job's time spread over the workers."""
+        return max(1, math.ceil(self._job_seconds / max(1, self.workers)))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def submit(self, filename: str, content: bytes) -> Job:
+        """Queue an upload. Raises asyncio.QueueFull when the queue is at capacity."""
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() has not been awaited")
+        if self._queue.full():
+            raise asyncio.QueueFull
+        job_id = secrets.token_hex(8)
+        suffix = os.path.splitext(filename)[1].lower()
+        path = os.path.join(self.upload_dir, job_id + suffix)
+        with open(path, "wb") as f:
+            f.write(content)
+        job = Job(id=job_id, filename=filename, path=path)
+        self._queue.put_nowait(job)
+        self.jobs[job_id] = job
+        self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ("done", "error")]
+        for job_id in finished[:max(0, len(self.jobs) - SERVICE_JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            try:
+                await self._process(job)
+            finally:
+                self.running -= 1
+                self._queue.task_done()
+
+    async def _process(self, job: Job) -> None:
+        job.status, job.started = "running", time.time()
+        job.publish("status", {"status": "running"})
+
+        def on_stage(name: str, event: str) -> None:
+            job.stages[name] = event
+            job.publish("stage", {"stage": name, "event": event})
+
+        state = AnalysisState(raw_resume_text="", resume_file_path=job.path)
+        try:
+            # The Synthesizer stage is a coroutine, so report chunks arrive on the loop too.
+            with stream_report(lambda text: job.publish("report_chunk", {"text": text})):
+                await get_pipeline().run(state, self.refresh, on_stage=on_stage)
+            if not state.final_report:
+                raise ValueError("The pipeline finished without a report.")
+        except Exception as e:
+            logger.warning(f'Job {job.id} ({job.filename}) failed: {e}')
+            job.status, job.error = "error", f"{type(e).__name__}: {e}"
+            job.finished = time.time()
+            job.publish("error", {"error": job.error})
+            return
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(job.path)
+
+        job.report, job.status, job.finished = state.final_report, "done", time.time()
+        self._job_seconds = 0.8 * self._job_seconds + 0.2 * (job.finished - job.started)
+        job.publish("report", {"text": job.report})
+        job.publish("done", {"seconds": round(job.finished - job.started, 3)})
+
+
+# ------------------------ HTTP API ------------------------ #
+
+def _sse(index: int, event: str, data: Dict[str, Any]) -> str:
+    return f"id: {index}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _event_stream(job: Job, after: int) -> AsyncIterator[str]:
+    async for item in job.follow(after, idle=SSE_KEEPALIVE_SECONDS):
+        # SSE comments keep proxies from closing a quiet stream.
+        yield ": keep-alive\n\n" if item is None else _sse(*item)
+
+
+def create_app(manager: Optional[JobManager] = None, preload: bool = True) -> FastAPI:
+    manager = manager or JobManager()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if preload:
+            timings = await asyncio.to_thread(warm_up)
+            logger.info(f'Warm-up took {sum(timings.values()):.1f}s: {timings}')
+        await manager.start()
+        try:
+            yield
+        finally:
+            await manager.stop()
+            await aclose_loop_clients()
+
+    app = FastAPI(title="AI Résumé Analyser", lifespan=lifespan)
+    app.state.jobs = manager
+
+    def _job(job_id: str) -> Job:
+        job = manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+        return job
+
+    @app.post("/jobs", status_code=202, response_model=JobInfo)
+    async def submit_job(file: UploadFile = File(...)) -> JobInfo:
+        filename = file.filename or "resume"
+        if not (is_pdf_file(filename) or is_image_file(filename)):
+            raise HTTPException(status_code=415, detail="Upload a PDF or an image.")
+        content = await file.read(SERVICE_MAX_UPLOAD_BYTES + 1)
+        if len(content) > SERVICE_MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Uploads are limited to {SERVICE_MAX_UPLOAD_BYTES} bytes.")
+        try:
+            job = manager.submit(filename, content)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=429,
+                detail="The analysis queue is full; retry later.",
+                headers={"Retry-After": str(manager.retry_after())},
+            )
+        return job.info()
+
+    @app.get("/jobs/{job_id}", response_model=JobInfo)
+    async def job_status(job_id: str) -> JobInfo:
+        return _job(job_id).info()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, last_event_id: Optional[int] = Header(default=None)) -> StreamingResponse:
+        job = _job(job_id)
+        return StreamingResponse(
+            _event_stream(job, -1 if last_event_id is None else last_event_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/jobs/{job_id}/report", response_class=PlainTextResponse)
+    async def job_report(job_id: str) -> str:
+        job = _job(job_id)
+        if job.status != "done":
+            raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+        return job.report
+
+    @app.get("/health")
+    async def health() -> Dict[str, int]:
+        return {
+            "queued": manager.queued,
+            "running": manager.running,
+            "workers": manager.workers,
+            "capacity": manager.queue_depth,
+        }
+
+    return app
+
+
+def serve(
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = SERVICE_WORKERS,
+        queue_depth: int = SERVICE_QUEUE_DEPTH,
+        refresh: Iterable[str] = (),
+) -> None:
+    """Run the service in this process; every job shares its loaded models and clients."""
+    import uvicorn
+
+    manager = JobManager(queue_depth=queue_depth, workers=workers, refresh=refresh)
+    uvicorn.run(create_app(manager), host=host, port=port)
@@ -0,0 +1,465 @@
+"""
+Persistent inverted index over parsed résumés, for candidate search without
+re-running the LLM pipeline.
+
+Every résumé contributes one posting per skill (from skill buckets, work and
+project technologies, keyed through the synonym taxonomy) carrying the years of work experience that used it, plus
+one "title:" posting per job title. Postings live in SQLite and are loaded
+into memory per term on first use, so queries are set operations on in-memory
+dicts and inserts are incremental.
+
+Query syntax (case-insensitive):
+    Python AND Kubernetes, 3+ years       trailing clause: total experience
+    (Go OR Rust) AND NOT PHP               AND / OR / NOT and parentheses
+    "machine learning":2+ AND Python^2     per-skill minimum years, ranking weight
+    title:engineer AND Terraform           title: matches job titles containing the words
+Adjacent words without an operator form one phrase: `machine learning`.
+"""
+
+import datetime as dt
+import hashlib
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.models import AnalysisState, StructuredResume
+from core.utils.skills import normalise_skill
+
+SKILL_INDEX_PATH = os.getenv("SKILL_INDEX_PATH", "skill_index.sqlite")
+TITLE_PREFIX = "title:"
+DAYS_PER_YEAR = 365.25
+
+
+# ------------------------ Terms ------------------------ #
+
+def skill_term(skill: str) -> str:
+    """Skills are indexed under their taxonomy key, so "k8s" finds "Kubernetes"."""
+    return normalise_skill(skill)
+
+
+def title_term(title: str) -> str:
+    return TITLE_PREFIX + " ".join(title.lower().split())
+
+
+def _years(intervals: Iterable[Tuple[dt.date, dt.date]]) -> float:
+    """Total length of the union of date intervals, in years (overlapping jobs count once)."""
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += (current_end - current_start).days
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += (current_end - current_start).days
+    return round(total / DAYS_PER_YEAR, 2)
+
+
+def resume_terms(resume: StructuredResume, today: Optional[dt.date] = None) -> Tuple[Dict[str, float], float]:
+    """Index terms with the years of experience behind each, and total experience in years."""
+    today = today or dt.date.today()
+    intervals: Dict[str, List[Tuple[dt.date, dt.date]]] = {}
+    all_jobs = []
+    for work in resume.work_experience:
+        if work.start_date is None:
+            span = None
+        else:
+            span = (work.start_date, max(work.start_date, work.end_date or today))
+            all_jobs.append(span)
+        keys = [skill_term(tech) for tech in work.technologies] + [title_term(work.title)]
+        for key in keys:
+            intervals.setdefault(key, [])
+            if span is not None:
+                intervals[key].append(span)
+
+    terms = {key: _years(spans) for key, spans in intervals.items() if key != TITLE_PREFIX}
+    listed = [skill for bucket in resume.skills for skill in bucket.skills]
+    listed += [tech for project in resume.projects for tech in project.technologies]
+    for skill in listed:
+        terms.setdefault(skill_term(skill), 0.0)
+    terms.pop("", None)
+    return terms, _years(all_jobs)
+
+
+# ------------------------ Query Parsing ------------------------ #
+
+_TOKEN = re.compile(
+    r'\s*(?:(?P<lparen>\()|(?P<rparen>\))|(?P<quoted>"[^"]*")|(?P<field>title:)'
+    r'|(?P<modifier>:\s*\d+(?:\.\d+)?\s*\+|\^\s*\d+(?:\.\d+)?)|(?P<word>[^\s()"^:]+))',
+    re.IGNORECASE,
+)
+_EXPERIENCE = re.compile(r",\s*(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\s*$", re.IGNORECASE)
+_OPERATORS = {"and", "or", "not"}
+
+
+@dataclass
+class Term:
+    term: str
+    min_years: float = 0.0
+    weight: float = 1.0
+
+
+@dataclass
+class Not:
+    operand: object
+
+
+@dataclass
+class Op:
+    op: str  # "and" | "or"
+    operands: List[object]
+
+
+@dataclass
+class Query:
+    expr: object
+    min_total_years: float = 0.0
+
+    def positive_terms(self) -> List[Term]:
+        """Terms that count towards ranking (everything not under a NOT)."""
+        found: List[Term] = []
+
+        def walk(node: object) -> None:
+            if isinstance(node, Term):
+                found.append(node)
+            elif isinstance(node, Op):
+                for operand in node.operands:
+                    walk(operand)
+
+        walk(self.expr)
+        return found
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Cannot parse query near: {text[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        value = match.group(kind).strip()
+        if kind == "word" and value.lower() in _OPERATORS:
+            kind, value = value.lower(), value.lower()
+        elif kind == "field":
+            value = value.lower()
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> object:
+        expr = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.tokens[self.pos][1]!r} in query")
+        return expr
+
+    def parse_or(self) -> object:
+        operands = [self.parse_and()]
+        while self.peek() == "or":
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Op("or", operands)
+
+    def parse_and(self) -> object:
+        operands = [self.parse_not()]
+        while self.peek() == "and":
+            self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else Op("and", operands)
+
+    def parse_not(self) -> object:
+        if self.peek() == "not":
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self) -> object:
+        kind = self.peek()
+        if kind == "lparen":
+            self.take()
+            expr = self.parse_or()
+            if self.peek() != "rparen":
+                raise ValueError("Missing ')' in query")
+            self.take()
+            return expr
+        is_title = kind == "field"
+        if is_title:
+            self.take()
+            kind = self.peek()
+        if kind == "quoted":
+            text = self.take()[1].strip('"')
+        elif kind == "word":
+            words = [self.take()[1]]
+            while self.peek() == "word":
+                words.append(self.take()[1])
+            text = " ".join(words)
+        else:
+            raise ValueError("Query ended early" if kind is None else f"Unexpected {self.tokens[self.pos][1]!r}")
+        term = Term(title_term(text) if is_title else skill_term(text))
+        while self.peek() == "modifier":
+            modifier = self.take()[1]
+            if modifier.startswith("^"):
+                term.weight = float(modifier[1:])
+            else:
+                term.min_years = float(modifier.strip(":+ "))
+        if not term.term or term.term == TITLE_PREFIX:
+            raise ValueError("Empty term in query")
+        return term
+
+
+def parse_query(text: str) -> Query:
+    experience = _EXPERIENCE.search(text)
+    min_total = float(experience.group(1)) if experience else 0.0
+    body = text[:experience.start()] if experience else text
+    if not body.strip():
+        raise ValueError("Query has no terms")
+    return Query(_Parser(_tokenize(body)).parse(), min_total)
+
+
+# ------------------------ Index ------------------------ #
+
+@dataclass
+class Candidate:
+    doc_id: int
+    key: str
+    name: str
+    title: Optional[str]
+    total_years: float
+    score: float
+    matched: Dict[str, float]  # query term -> years of experience with it
+
+
+class SkillIndex:
+    """
+    SQLite-backed inverted index. Postings for a term are read once and kept in
+    memory; add() updates both, so a long-lived index stays current without reloads.
+    """
+
+    def __init__(self, path: str = SKILL_INDEX_PATH):
+        if os.path.dirname(os.path.abspath(path)):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " doc_id INTEGER PRIMARY KEY,"
+            " key TEXT UNIQUE NOT NULL,"
+            " name TEXT NOT NULL,"
+            " title TEXT,"
+            " total_years REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL,"
+            " doc_id INTEGER NOT NULL,"
+            " years REAL NOT NULL,"
+            " PRIMARY KEY (term, doc_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+        self._conn.commit()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._docs: Optional[Dict[int, Tuple[str, str, Optional[str], float]]] = None
+        self._titles: Optional[Set[str]] = None
+        # Merged postings per title: query, dropped whenever documents change.
+        self._title_cache: Dict[str, Dict[int, float]] = {}
+
+    # --- writes ---
+
+    def add(self, resume: StructuredResume, key: Optional[str] = None) -> int:
+        """Index a résumé under `key` (its source path or id), replacing any earlier version."""
+        return self.add_many([(resume, key)])[0]
+
+    def add_many(self, items: Iterable[Tuple[StructuredResume, Optional[str]]]) -> List[int]:
+        """Bulk add() in a single transaction; returns the doc ids in order."""
+        doc_ids = []
+        with self._lock:
+            for resume, key in items:
+                doc_ids.append(self._insert(resume, key))
+            self._conn.commit()
+            self._title_cache.clear()
+        return doc_ids
+
+    def _insert(self, resume: StructuredResume, key: Optional[str]) -> int:
+        key = key or hashlib.sha256(resume.model_dump_json().encode("utf-8")).hexdigest()
+        terms, total_years = resume_terms(resume)
+        title = resume.work_experience[0].title if resume.work_experience else None
+        row = self._conn.execute("SELECT doc_id FROM resumes WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._remove(row[0])
+        cursor = self._conn.execute(
+            "INSERT INTO resumes (key, name, title, total_years) VALUES (?, ?, ?, ?)",
+            (key, resume.contact.full_name, title, total_years),
+        )
+        doc_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc_id, years) VALUES (?, ?, ?)",
+            [(term, doc_id, years) for term, years in terms.items()],
+        )
+        for term, years in terms.items():
+            if term in self._postings:
+                self._postings[term][doc_id] = years
+            if self._titles is not None and term.startswith(TITLE_PREFIX):
+                self._titles.add(term)
+        if self._docs is not None:
+            self._docs[doc_id] = (key, resume.contact.full_name, title, total_years)
+        return doc_id
+
+    def _remove(self, doc_id: int) -> None:
+        for (term,) in self._conn.execute("SELECT term FROM postings WHERE doc_id = ?", (doc_id,)).fetchall():
+            self._postings.get(term, {}).pop(doc_id, None)
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM resumes WHERE doc_id = ?", (doc_id,))
+        if self._docs is not None:
+            self._docs.pop(doc_id, None)
+
+    # --- reads ---
+
+    def _docs_table(self) -> Dict[int, Tuple[str, str, Optional[str], float]]:
+        if self._docs is None:
+            rows = self._conn.execute("SELECT doc_id, key, name, title, total_years FROM resumes")
+            self._docs = {row[0]: row[1:] for row in rows}
+        return self._docs
+
+    def postings(self, term: str) -> Dict[int, float]:
+        """doc_id -> years for one term, loaded from disk on first use."""
+        if term.startswith(TITLE_PREFIX):
+            return self._title_postings(term[len(TITLE_PREFIX):])
+        return self._term_postings(term)
+
+    def _term_postings(self, term: str) -> Dict[int, float]:
+        if term not in self._postings:
+            rows = self._conn.execute("SELECT doc_id, years FROM postings WHERE term = ?", (term,))
+            self._postings[term] = dict(rows)
+        return self._postings[term]
+
+    def _title_postings(self, words: str) -> Dict[int, float]:
+        """Union of every indexed title containing the query words."""
+        if words in self._title_cache:
+            return self._title_cache[words]
+        if self._titles is None:
+            rows = self._conn.execute("SELECT DISTINCT term FROM postings WHERE term >= ? AND term < ?",
+                                      (TITLE_PREFIX, TITLE_PREFIX[:-1] + chr(ord(TITLE_PREFIX[-1]) + 1)))
+            self._titles = {row[0] for row in rows}
+        pattern = re.compile(rf"\b{re.escape(words)}\b")
+        merged: Dict[int, float] = {}
+        for title in self._titles:
+            if pattern.search(title[len(TITLE_PREFIX):]):
+                for doc_id, years in self._term_postings(title).items():
+                    merged[doc_id] = max(years, merged.get(doc_id, 0.0))
+        self._title_cache[words] = merged
+        return merged
+
+    def _evaluate(self, node: object) -> Set[int]:
+        if isinstance(node, Term):
+            postings = self.postings(node.term)
+            if not node.min_years:
+                return set(postings)
+            return {doc_id for doc_id, years in postings.items() if years >= node.min_years}
+        if isinstance(node, Not):
+            return set(self._docs_table()) - self._evaluate(node.operand)
+        operands = node.operands
+        if node.op == "or":
+            return set().union(*(self._evaluate(operand) for operand in operands))
+        # Intersect the most selective positive operands first; NOTs are subtracted.
+        positives = [operand for operand in operands if not isinstance(operand, Not)]
+        negatives = [operand.operand for operand in operands if isinstance(operand, Not)]
+        if not positives:
+            result = set(self._docs_table())
+        else:
+            sets = sorted((self._evaluate(operand) for operand in positives), key=len)
+            result = sets[0].intersection(*sets[1:])
+        for negative in negatives:
+            if not result:
+                break
+            result -= self._evaluate(negative)
+        return result
+
+    def search(self, query: str, limit: int = 20) -> List[Candidate]:
+        """Candidates matching the query, best first (weighted, idf-scaled years of experience)."""
+        parsed = parse_query(query)
+        with self._lock:
+            docs = self._docs_table()
+            matches = self._evaluate(parsed.expr)
+            if parsed.min_total_years:
+                matches = {doc_id for doc_id in matches if docs[doc_id][3] >= parsed.min_total_years}
+
+            # Score term by term, walking whichever of postings or matches is smaller.
+            total = max(len(docs), 1)
+            scores = dict.fromkeys(matches, 0.0)
+            matched: Dict[int, Dict[str, float]] = {}
+            for term in parsed.positive_terms():
+                postings = self.postings(term.term)
+                weight = term.weight * math.log(1 + total / (1 + len(postings)))
+                if len(postings) < len(scores):
+                    hits = ((doc_id, years) for doc_id, years in postings.items() if doc_id in scores)
+                else:
+                    hits = ((doc_id, postings[doc_id]) for doc_id in scores if doc_id in postings)
+                for doc_id, years in hits:
+                    scores[doc_id] += weight * (1 + math.log1p(years))
+                    matched.setdefault(doc_id, {})[term.term] = years
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], docs[item[0]][3]))
+            return [
+                Candidate(
+                    doc_id=doc_id,
+                    key=docs[doc_id][0],
+                    name=docs[doc_id][1],
+                    title=docs[doc_id][2],
+                    total_years=docs[doc_id][3],
+                    score=round(score, 4),
+                    matched=matched.get(doc_id, {}),
+                )
+                for doc_id, score in best
+            ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs_table())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[SkillIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index(path: Optional[str] = None) -> SkillIndex:
+    """The process-wide index at `path` (default SKILL_INDEX_PATH)."""
+    global _index
+    path = path or os.getenv("SKILL_INDEX_PATH", SKILL_INDEX_PATH)
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = SkillIndex(path)
+        return _index
+
+
+def index_resume(state: AnalysisState) -> AnalysisState:
+    """Pipeline stage: add the parsed résumé to the skill index when SKILL_INDEX=1."""
+    if os.getenv("SKILL_INDEX", "0") == "1" and state.structured_resume is not None:
+        key = state.resume_file_path or hashlib.sha256(state.raw_resume_text.encode("utf-8")).hexdigest()
+        get_skill_index().add(state.structured_resume, key=key)
+    return state
@@ -0,0 +1,139 @@
+"""
+Cold-start report for the CLI and workers (`main.py --startup-report`).
+Each entry point is imported in a fresh interpreter under `-X importtime`, so
+the numbers are what a new worker or serverless invocation really pays; heavy
+dependencies deferred to first use are profiled the same way, one by one.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from core.utils.lazy import deferred_modules, load_deferred
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# What the CLI, batch extraction workers and the text-only path import at startup.
+STARTUP_MODULES = ("main", "core.batch", "core.tools.text_tools")
+# Imported inside the functions that need them rather than through lazy_import.
+LOCAL_IMPORTS = (
+    "llama_index.core",
+    "llama_index.llms.openrouter",
+    "llama_index.tools.tavily_research",
+    "spacy",
+)
+REPORT_TOP = 12
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    records: List[ImportRecord]
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        roots = [record for record in self.records if record.module == self.target]
+        return roots[-1].cumulative_us / 1000 if roots else 0.0
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Records from `-X importtime` stderr: `import time: self [us] | cumulative | imported package`."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        records.append(ImportRecord(
+            module=name.strip(),
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1]),
+            depth=(len(name) - len(name.lstrip())) // 2,
+        ))
+    return records
+
+
+def profile_import(module: str) -> ImportProfile:
+    """Import `module` in a fresh interpreter and collect its import timings."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    error = None
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["import failed"])[-1]
+    return ImportProfile(target=module, records=parse_importtime(proc.stderr), error=error)
+
+
+def _heaviest(profile: ImportProfile, top: int) -> List[ImportRecord]:
+    records = [record for record in profile.records if record.module != profile.target]
+    return sorted(records, key=lambda record: record.self_us, reverse=True)[:top]
+
+
+def startup_report(modules: Sequence[str] = STARTUP_MODULES, top: int = REPORT_TOP) -> str:
+    lines = ["--- 🕒 STARTUP REPORT (fresh interpreter, -X importtime) ---"]
+    for module in modules:
+        profile = profile_import(module)
+        if profile.error:
+            lines.append(f"{module:<40} failed: {profile.error}")
+            continue
+        lines.append(f"{module:<40} {profile.total_ms:>9.1f} ms  ({len(profile.records)} modules)")
+        for record in _heaviest(profile, top):
+            lines.append(
+                f"    {record.module:<36} {record.self_us / 1000:>9.1f} ms self"
+                f"  {record.cumulative_us / 1000:>9.1f} ms cumulative"
+            )
+
+    lines.append("--- Deferred until first use ---")
+    # Registered by the modules imported so far (main imports them all).
+    for name in dict.fromkeys([*deferred_modules(), *LOCAL_IMPORTS]):
+        profile = profile_import(name)
+        if profile.error:
+            lines.append(f"{name:<40} not available ({profile.error})")
+        else:
+            lines.append(f"{name:<40} {profile.total_ms:>9.1f} ms")
+    return "\n".join(lines)
+
+
+# ------------------------ Warm-up ------------------------ #
+
+def warm_up() -> Dict[str, float]:
+    """
+    Pay the deferred import and model-load costs up front, for long-running
+    processes that would otherwise pay them on their first résumé. Returns
+    the seconds spent per step; dependencies that are not installed are skipped.
+    """
+    from core.agents.rule_parser import _nlp
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    load_deferred()
+    timings["deferred modules"] = time.perf_counter() - started
+    for module in LOCAL_IMPORTS:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        timings[module] = time.perf_counter() - started
+    started = time.perf_counter()
+    _nlp()
+    timings["spaCy model"] = time.perf_counter() - started
+    return timings
+
@@ -1,14 +1,42 @@
 # tools/text_tools.py
 
+import os
+import threading
+from typing import Iterator, Optional
+
+from core.tracing import span
 from core.utils import (
+    DiskCache,
     extract_text_from_image,
-    extract_text_from_pdf,
+    extractor_settings,
+    file_digest,
     is_image_file,
     is_pdf_file,
+    iter_pdf_pages,
 )
+from core.utils.cache import DEFAULT_CACHE_DIR
+
+TEXT_CACHE_MAX_BYTES = int(os.getenv("RESUME_TEXT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+_text_cache: Optional[DiskCache] = None
+_text_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> Optional[DiskCache]:
+    """Process-wide extracted-text cache; disabled with RESUME_TEXT_CACHE=0."""
+    global _text_cache
+    if os.getenv("RESUME_TEXT_CACHE", "1") == "0":
+        return None
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "text.sqlite"), max_bytes=TEXT_CACHE_MAX_BYTES)
+        return _text_cache
 
 
 class ResumeTextExtractorTool:
+    def __init__(self, cache: Optional[DiskCache] = None, use_cache: bool = True):
+        self.cache = (cache or get_text_cache()) if use_cache else None
+
     def name(self) -> str:
         return "extract_resume_text"
 
@@ -16,9 +44,38 @@ class ResumeTextExtractorTool:
         return "Extract text from a resume file (PDF or image)."
 
     def run(self, file_path: str) -> str:
+        if not (is_image_file(file_path) or is_pdf_file(file_path)):
+            return "Unsupported file type."
+        with span("extract.text", "extract", file=os.path.basename(file_path)) as record:
+            text = "\n".join(chunk for chunk in self.iter_text(file_path) if chunk).strip()
+            record.attributes["chars"] = len(text)
+            return text
+
+    def iter_text(self, file_path: str) -> Iterator[str]:
+        """
+        Lazily yields résumé text page by page, so a consumer never holds more
+        than the page in hand. A cache hit arrives as one chunk.
+        """
+        if self.cache is None:
+            yield from self._iter_extract(file_path)
+            return
+
+        # Keyed by content, so renamed files and duplicate uploads hit too.
+        key = f"{file_digest(file_path)}:{extractor_settings()}"
+        text = self.cache.get(key)
+        if text is not None:
+            yield text
+            return
+
+        pages = []
+        for page in self._iter_extract(file_path):
+            pages.append(page)
+            yield page
+        self.cache.set(key, "\n".join(page for page in pages if page).strip())
+
+    @staticmethod
+    def _iter_extract(file_path: str) -> Iterator[str]:
         if is_image_file(file_path):
-            return extract_text_from_image(file_path)
+            yield extract_text_from_image(file_path)
         elif is_pdf_file(file_path):
-            return extract_text_from_pdf(file_path)
-        else:
-            return "Unsupported file type."
+            yield from iter_pdf_pages(file_path)
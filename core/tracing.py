@@ -0,0 +1,225 @@
+"""
+Structured tracing for the analysis pipeline.
+`span(...)` times a block and records it as a Span on the AnalysisState being
+processed: pipeline stages, every LLM attempt (with token counts, retries and
+estimated cost), searches, extraction and post-processing. The state to record
+into travels in a context variable, so spans opened in stage threads and tasks
+land on the right résumé. Spans export as plain JSON or as OTLP/JSON-style
+resourceSpans for OpenTelemetry tooling.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.models import Span
+
+SERVICE_NAME = "ai-resume-analyser"
+TRACE_FORMATS = ("json", "otel")
+CHARS_PER_TOKEN = 4
+
+# USD per million (prompt, completion) tokens. Extend or override with
+# LLM_PRICES, e.g. "google/gemini-pro=0.5/1.5,deepseek/deepseek-chat=0.27/1.1".
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "kimi-ai/kimi-2": (0.60, 2.50),
+    "google/gemini-pro": (0.50, 1.50),
+    "deepseek/deepseek-chat": (0.27, 1.10),
+}
+for _entry in filter(None, os.getenv("LLM_PRICES", "").split(",")):
+    _model, _, _prices = _entry.rpartition("=")
+    _prompt_price, _, _completion_price = _prices.partition("/")
+    MODEL_PRICES[_model.strip()] = (float(_prompt_price), float(_completion_price or _prompt_price))
+
+
+class _Collector:
+    def __init__(self, spans: List[Span], trace_id: str):
+        self.spans = spans
+        self.trace_id = trace_id
+        self._lock = threading.Lock()
+
+    def add(self, record: Span) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+
+_collector: contextvars.ContextVar[Optional[_Collector]] = contextvars.ContextVar("trace_collector", default=None)
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+
+
+# ------------------------ Recording ------------------------ #
+
+@contextlib.contextmanager
+def collect_spans(spans: List[Span]) -> Iterator[None]:
+    """
+    Record spans finished in this context into `spans` (usually state.spans).
+    Tasks and executor threads started from the context inherit it.
+    """
+    trace_id = spans[0].trace_id if spans else secrets.token_hex(16)
+    token = _collector.set(_Collector(spans, trace_id))
+    try:
+        yield
+    finally:
+        _collector.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str, model: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+    """Time the block as a child of the current span. Outside collect_spans nothing is stored."""
+    collector = _collector.get()
+    parent = _current.get()
+    record = Span(
+        name=name,
+        kind=kind,
+        trace_id=collector.trace_id if collector else "0" * 32,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        start_time=time.time(),
+        model=model,
+        attributes=attributes,
+    )
+    token = _current.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record.status = "error"
+        record.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record.duration_seconds = time.perf_counter() - started
+        _current.reset(token)
+        if collector is not None:
+            collector.add(record)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def record_retry() -> None:
+    """Count a retry against the innermost open span."""
+    record = _current.get()
+    if record is not None:
+        record.retries += 1
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _reported_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens from a llama_index response's raw provider payload."""
+    raw = getattr(response, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else getattr(raw, "usage", None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        prompt, completion = usage.get("prompt_tokens"), usage.get("completion_tokens")
+    else:
+        prompt, completion = getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+    if prompt is None or completion is None:
+        return None
+    return int(prompt), int(completion)
+
+
+def record_llm_usage(record: Span, prompt: str, response: Any, cached: bool = False) -> None:
+    """Token counts (reported, or estimated from length) and cost; cache hits cost nothing."""
+    usage = None if cached else _reported_usage(response)
+    if usage is None:
+        usage = (len(prompt) // CHARS_PER_TOKEN, len(getattr(response, "text", "") or "") // CHARS_PER_TOKEN)
+        record.tokens_estimated = True
+    record.prompt_tokens, record.completion_tokens = usage
+    record.cost_usd = 0.0 if cached else llm_cost(record.model or "", *usage)
+    record.attributes["cached"] = cached
+
+
+# ------------------------ Export ------------------------ #
+
+def summarise_spans(spans: List[Span]) -> Dict[str, Dict[str, float]]:
+    """Totals per span name, slowest first: where the time and money went."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for record in spans:
+        entry = totals.setdefault(record.name, {"count": 0, "seconds": 0.0, "tokens": 0, "retries": 0, "cost_usd": 0.0})
+        entry["count"] += 1
+        entry["seconds"] += record.duration_seconds
+        entry["tokens"] += record.prompt_tokens + record.completion_tokens
+        entry["retries"] += record.retries
+        entry["cost_usd"] += record.cost_usd
+    return dict(sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True))
+
+
+def llm_totals(spans: List[Span]) -> Tuple[int, float]:
+    """Total tokens and estimated cost across the LLM spans."""
+    llm_spans = [record for record in spans if record.kind == "llm"]
+    return (
+        sum(record.prompt_tokens + record.completion_tokens for record in llm_spans),
+        sum(record.cost_usd for record in llm_spans),
+    )
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otel_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def spans_to_otel(spans: List[Span], service_name: str = SERVICE_NAME) -> Dict[str, Any]:
+    """OTLP/JSON-shaped export (resourceSpans → scopeSpans → spans)."""
+    otel_spans = []
+    for record in spans:
+        attributes = {
+            **{f"resume.{key}": value for key, value in record.attributes.items()},
+            "resume.span.kind": record.kind,
+            "resume.retries": record.retries,
+            "resume.cost_usd": record.cost_usd,
+        }
+        if record.model:
+            attributes.update({
+                "gen_ai.request.model": record.model,
+                "gen_ai.usage.input_tokens": record.prompt_tokens,
+                "gen_ai.usage.output_tokens": record.completion_tokens,
+            })
+        start_ns = int(record.start_time * 1e9)
+        otel_spans.append({
+            "traceId": record.trace_id,
+            "spanId": record.span_id,
+            "parentSpanId": record.parent_id or "",
+            "name": record.name,
+            # SPAN_KIND_CLIENT for calls that leave the process, SPAN_KIND_INTERNAL otherwise.
+            "kind": 3 if record.kind in ("llm", "search") else 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(record.duration_seconds * 1e9)),
+            "attributes": [{"key": key, "value": _otel_value(value)} for key, value in attributes.items()],
+            "status": {"code": 2, "message": record.error} if record.status == "error" else {"code": 1},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "core.tracing"}, "spans": otel_spans}],
+        }]
+    }
+
+
+def export_spans(spans: List[Span], fmt: str = "json") -> str:
+    if fmt not in TRACE_FORMATS:
+        raise ValueError(f"Trace format must be one of {TRACE_FORMATS}, got '{fmt}'")
+    if fmt == "otel":
+        return json.dumps(spans_to_otel(spans), indent=2)
+    return json.dumps([record.model_dump() for record in spans], indent=2)
+
+
+def write_trace(spans: List[Span], path: str, fmt: str = "json") -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(export_spans(spans, fmt))
@@ -1,3 +1,7 @@
-from .utils import normalise_dates, extract_emails, extract_urls, detect_language, is_image_file, is_pdf_file, \
+from .cache import DiskCache, file_digest
+from .dates import normalise_dates, normalise_structured_dates
+from .language import LanguageReport, detect_language, detect_languages
+from .skills import display_skill, find_skills, normalise_skill
+from .utils import extract_emails, extract_urls, is_image_file, is_pdf_file, \
     extract_text_from_image, extract_text_from_pdf, \
-    extract_text_from_scanned_pdf
+    extract_text_from_scanned_pdf, extractor_settings, iter_pdf_pages, iter_scanned_pdf_pages
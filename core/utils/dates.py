@@ -0,0 +1,137 @@
+"""
+Fast, memoised date normalisation for résumé dates.
+The handful of formats résumés actually use are matched by precompiled patterns;
+only strings none of them recognise fall back to dateparser, which is given its
+settings per call so concurrent callers never share mutable configuration.
+"""
+
+import datetime as dt
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Set, Union
+
+from core.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from core.models import StructuredResume
+
+# Only strings no fast path recognises need dateparser, so it is loaded on first fallback.
+dateparser = lazy_import("dateparser")
+
+DATE_CACHE_SIZE = 4096
+DATEPARSER_SETTINGS = {"PREFER_DAY_OF_MONTH": "first"}
+
+NULL_VALUES = {"", "none", "null", "nan", "n/a", "na", "-", "unknown"}
+# Open-ended ends ("Jan 2020 – Present") normalise to None: the item is ongoing.
+OPEN_ENDED = {"present", "current", "currently", "now", "today", "ongoing", "to date", "till date"}
+
+MONTHS: Dict[str, int] = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+    # Academic terms
+    "spring": 3, "summer": 6, "fall": 9, "autumn": 9, "winter": 1,
+}
+
+_ISO = re.compile(r"^(\d{4})-(\d{1,2})(?:-(\d{1,2}))?(?:[t ].*)?$")
+_YEAR = re.compile(r"^(\d{4})$")
+_MONTH_YEAR = re.compile(r"^([a-z]+)\.?,?\s+'?(\d{4})$")
+_DAY_MONTH_YEAR = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]+)\.?,?\s+(\d{4})$")
+_MONTH_DAY_YEAR = re.compile(r"^([a-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})$")
+_NUMERIC_MONTH_YEAR = re.compile(r"^(\d{1,2})\s*[/.-]\s*(\d{4})$")
+_YEAR_NUMERIC_MONTH = re.compile(r"^(\d{4})\s*[/.]\s*(\d{1,2})$")
+
+
+def _date(year: int, month: int = 1, day: int = 1) -> Optional[dt.date]:
+    try:
+        return dt.date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _fast_path(key: str) -> Union[dt.date, None, bool]:
+    """The parsed date, None for a recognised-but-invalid value, or False if no pattern matched."""
+    match = _YEAR.match(key)
+    if match:
+        return _date(int(match.group(1)))
+    match = _ISO.match(key)
+    if match:
+        return _date(int(match.group(1)), int(match.group(2)), int(match.group(3) or 1))
+    match = _MONTH_YEAR.match(key)
+    if match and match.group(1) in MONTHS:
+        return _date(int(match.group(2)), MONTHS[match.group(1)])
+    match = _NUMERIC_MONTH_YEAR.match(key)
+    if match:
+        return _date(int(match.group(2)), int(match.group(1)))
+    match = _YEAR_NUMERIC_MONTH.match(key)
+    if match:
+        return _date(int(match.group(1)), int(match.group(2)))
+    match = _DAY_MONTH_YEAR.match(key)
+    if match and match.group(2) in MONTHS:
+        return _date(int(match.group(3)), MONTHS[match.group(2)], int(match.group(1)))
+    match = _MONTH_DAY_YEAR.match(key)
+    if match and match.group(1) in MONTHS:
+        return _date(int(match.group(3)), MONTHS[match.group(1)], int(match.group(2)))
+    return False
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse(key: str) -> Optional[dt.date]:
+    parsed = _fast_path(key)
+    if parsed is not False:
+        return parsed
+    fallback = dateparser.parse(key, settings=DATEPARSER_SETTINGS)
+    return fallback.date() if fallback else None
+
+
+def _key(raw: str) -> str:
+    return " ".join(raw.lower().replace("’", "'").split())
+
+
+def is_open_ended(raw: Union[str, dt.date, None]) -> bool:
+    return isinstance(raw, str) and _key(raw) in OPEN_ENDED
+
+
+def normalise_dates(raw: Union[str, dt.date, None]) -> Optional[dt.date]:
+    """
+    Normalize raw date strings into ISO-format date objects.
+    Returns None if parsing fails, the input is invalid, or it is open-ended ("Present").
+    """
+    if isinstance(raw, dt.datetime):
+        return raw.date()
+    if isinstance(raw, dt.date):
+        return raw
+    if not isinstance(raw, str):
+        return None
+    key = _key(raw)
+    if key in NULL_VALUES or key in OPEN_ENDED:
+        return None
+    return _parse(key)
+
+
+def normalise_structured_dates(resume: "StructuredResume") -> "StructuredResume":
+    """
+    Normalise every date on a StructuredResume in one pass. Each distinct raw
+    value is parsed once, however many items share it.
+    """
+    holders = (
+        [(item, ("start_date", "end_date")) for item in resume.education]
+        + [(item, ("start_date", "end_date")) for item in resume.work_experience]
+        + [(item, ("issue_date", "expiry_date")) for item in resume.certifications]
+    )
+    raw_values: Set[Union[str, dt.date]] = {
+        getattr(item, name) for item, names in holders for name in names if getattr(item, name) is not None
+    }
+    parsed = {raw: normalise_dates(raw) for raw in raw_values}
+    for item, names in holders:
+        for name in names:
+            raw = getattr(item, name)
+            if raw is not None:
+                setattr(item, name, parsed[raw])
+    return resume
+
+
+def date_cache_info():
+    """Hit/miss statistics of the memo cache (functools.lru_cache info)."""
+    return _parse.cache_info()
@@ -0,0 +1,129 @@
+"""
+Local fixes for the JSON damage LLMs typically produce: code fences, prose
+around the object, trailing commas and output truncated mid-value.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+MAX_TRUNCATION_STEPS = 50
+_DECODER = json.JSONDecoder()
+
+
+def _scan(text: str) -> Tuple[List[str], List[int], int, bool]:
+    """
+    Open brackets, positions of commas outside strings, position of the last
+    comma or opening bracket outside strings (-1 if none), and whether text
+    ends inside a string.
+    """
+    stack: List[str] = []
+    commas: List[int] = []
+    boundary = -1
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            boundary = i
+        elif ch in "}]" and stack:
+            stack.pop()
+        elif ch == ",":
+            commas.append(i)
+            boundary = i
+    return stack, commas, boundary, in_string
+
+
+def _drop_trailing_commas(text: str) -> str:
+    """Removes commas that directly precede a closing bracket, leaving string contents alone."""
+    out: List[str] = []
+    comma: Optional[int] = None
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string, comma = True, None
+        elif ch == ",":
+            comma = len(out)
+        elif ch in "}]":
+            if comma is not None:
+                del out[comma]
+            comma = None
+        elif not ch.isspace():
+            comma = None
+        out.append(ch)
+    return "".join(out)
+
+
+def _close(text: str) -> str:
+    _, _, boundary, in_string = _scan(text)
+    if in_string or text.rstrip().endswith(":"):
+        # The last key or value was cut off: drop it rather than keep a partial string.
+        text = text[:boundary + 1]
+    stack, _, _, _ = _scan(text)
+    text = text.rstrip().rstrip(",")
+    return _drop_trailing_commas(text + "".join(reversed(stack)))
+
+
+def repair_json(raw: str) -> str:
+    """Best-effort cleanup of raw LLM output into parseable JSON text."""
+    text = raw.strip()
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    elif text.startswith("```"):
+        # Opening fence with the closing one cut off.
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if starts:
+        text = text[min(starts):]
+        try:
+            # A complete value followed by more text, e.g. a second object or trailing prose.
+            return text[:_DECODER.raw_decode(text)[1]]
+        except json.JSONDecodeError:
+            pass
+        closer = "}" if text[0] == "{" else "]"
+        stack, _, _, in_string = _scan(text)
+        if not stack and not in_string:
+            text = text[:text.rfind(closer) + 1]
+
+    return _drop_trailing_commas(text)
+
+
+def loads_lenient(raw: str) -> Optional[Any]:
+    """
+    json.loads with local repairs. Truncated output is closed off, dropping the
+    value that was cut short. Returns None if nothing parseable is left.
+    """
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        pass
+
+    text = repair_json(raw)
+    for _ in range(MAX_TRUNCATION_STEPS):
+        try:
+            return json.loads(_close(text))
+        except json.JSONDecodeError:
+            _, commas, _, _ = _scan(text)
+            if not commas:
+                return None
+            # Drop the last (partial) element and try again.
+            text = text[:commas[-1]]
+    return None
@@ -0,0 +1,141 @@
+"""
+Deterministic, bounded-cost language detection for résumé text.
+langdetect profiles are loaded once and every detector runs with a fixed seed,
+so the same text always gets the same answer. Each section is classified from
+an evenly spaced sample of at most LANG_SAMPLE_CHARS characters, and the
+résumé's language is the section vote weighted by text length.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from core.utils.cache import DiskCache
+from core.utils.lazy import lazy_import
+from core.utils.sections import HEADER_SECTION, sections_by_name
+
+if TYPE_CHECKING:
+    from langdetect.detector_factory import DetectorFactory
+
+langdetect = lazy_import("langdetect")
+
+# Bump whenever a change here would alter the detected languages, so cached results are invalidated.
+LANGUAGE_VERSION = "1"
+LANG_SEED = 0
+LANG_SAMPLE_CHARS = 1500
+LANG_SAMPLE_WINDOWS = 3
+# Sections with less text than this are too short to classify reliably.
+MIN_SECTION_CHARS = 80
+MIN_SECTION_PROBABILITY = 0.8
+UNKNOWN = "unknown"
+
+# Lists of names and technologies read as noise to langdetect; they only vote
+# when no prose section is long enough.
+_KEYWORD_SECTIONS = {HEADER_SECTION, "skills", "languages"}
+
+_factory: Optional["DetectorFactory"] = None
+_factory_lock = threading.Lock()
+
+
+@dataclass
+class LanguageReport:
+    language: str = UNKNOWN
+    # Sections whose language differs from the résumé's, e.g. {"projects": "de"}.
+    sections: Dict[str, str] = field(default_factory=dict)
+
+
+def _get_factory() -> "DetectorFactory":
+    global _factory
+    with _factory_lock:
+        if _factory is None:
+            factory = langdetect.DetectorFactory()
+            factory.load_profile(langdetect.PROFILES_DIRECTORY)
+            factory.set_seed(LANG_SEED)
+            _factory = factory
+        return _factory
+
+
+def sample_text(text: str, limit: int = LANG_SAMPLE_CHARS, windows: int = LANG_SAMPLE_WINDOWS) -> str:
+    """At most `limit` characters, taken as evenly spaced windows across the text."""
+    if len(text) <= limit:
+        return text
+    width = limit // windows
+    step = (len(text) - width) / (windows - 1) if windows > 1 else 0
+    return "\n".join(text[int(i * step):int(i * step) + width] for i in range(windows))
+
+
+def _classify(text: str) -> Tuple[str, float]:
+    detector = _get_factory().create()
+    detector.append(sample_text(text))
+    try:
+        best = detector.get_probabilities()[0]
+    except (langdetect.LangDetectException, IndexError):
+        return UNKNOWN, 0.0
+    return best.lang, best.prob
+
+
+def _letters(text: str) -> int:
+    return sum(ch.isalpha() for ch in text)
+
+
+def _detect(text: str) -> LanguageReport:
+    votes: Counter = Counter()
+    section_languages: List[Tuple[str, str]] = []
+    fallback: Counter = Counter()
+
+    # Repeated headings are merged, so cost is bounded by the number of section kinds.
+    for name, section_text in sections_by_name(text).items():
+        size = _letters(section_text)
+        if size < MIN_SECTION_CHARS:
+            continue
+        language, probability = _classify(section_text)
+        if language == UNKNOWN:
+            continue
+        if name in _KEYWORD_SECTIONS:
+            fallback[language] += size
+            continue
+        votes[language] += size
+        if probability >= MIN_SECTION_PROBABILITY:
+            section_languages.append((name, language))
+
+    votes = votes or fallback
+    if not votes:
+        # Nothing long enough on its own: classify the whole (short) text.
+        return LanguageReport(language=_classify(text)[0])
+
+    language = votes.most_common(1)[0][0]
+    return LanguageReport(
+        language=language,
+        sections={name: lang for name, lang in section_languages if lang != language},
+    )
+
+
+def detect_languages(text: str, cache: Optional[DiskCache] = None) -> LanguageReport:
+    """
+    Language of the résumé and of any sections written in another language.
+    Pass the extracted-text cache to store the report next to the text.
+    """
+    if not text or not text.strip():
+        return LanguageReport()
+
+    key = f"lang:{hashlib.sha256(text.encode('utf-8')).hexdigest()}:{LANGUAGE_VERSION}"
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return LanguageReport(**json.loads(cached))
+
+    report = _detect(text)
+    if cache is not None:
+        cache.set(key, json.dumps(asdict(report)))
+    return report
+
+
+def detect_language(text: str) -> str:
+    """
+    Detect the language of the given text.
+    Returns ISO 639-1 language code (e.g., 'en', 'fr').
+    """
+    return detect_languages(text).language
@@ -0,0 +1,53 @@
+"""
+Deferred imports for heavy optional dependencies.
+`lazy_import("pdfplumber")` returns a module object whose code only runs on the
+first attribute access, so importing a module that *may* need pdfplumber,
+PyMuPDF, Tesseract or llama_index costs nothing until it actually does.
+"""
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Dict
+
+_lazy_modules: Dict[str, ModuleType] = {}
+_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    The module `name`, loaded on first use. Parent packages are imported right
+    away (they are needed to locate the module); a missing module still raises
+    ModuleNotFoundError at this call, not on first use.
+    """
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        if name in _lazy_modules:
+            return _lazy_modules[name]
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        _lazy_modules[name] = module
+        return module
+
+
+def load_deferred() -> None:
+    """Run every registered module that has not loaded yet, e.g. before a long-running process takes traffic."""
+    with _lock:
+        pending = [module for module in _lazy_modules.values() if isinstance(module, importlib.util._LazyModule)]
+    for module in pending:
+        # Any attribute access makes LazyLoader execute the module.
+        getattr(module, "__spec__")
+
+
+def deferred_modules() -> Dict[str, bool]:
+    """Every module registered with lazy_import, and whether it has been loaded yet."""
+    with _lock:
+        return {name: not isinstance(module, importlib.util._LazyModule) for name, module in _lazy_modules.items()}
@@ -0,0 +1,164 @@
+"""
+Rule-based résumé section segmenter.
+Splits raw résumé text on recognised headings (Education, Experience, Skills, ...)
+and maps each heading onto a canonical section name; `chunk_sections` packs
+the sections into size-bounded chunks for parsing long CVs piece by piece.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+HEADER_SECTION = "header"
+
+SECTION_ALIASES: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me", "about"],
+    "education": ["education", "academic background", "education and training", "academics", "qualifications"],
+    "work_experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience", "internships",
+    ],
+    "projects": ["projects", "personal projects", "academic projects", "selected projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses and certifications", "courses"],
+    "skills": [
+        "skills", "technical skills", "core competencies", "key skills", "technologies", "tools",
+        "skills and technologies", "technical proficiencies", "competencies",
+    ],
+    "languages": ["languages", "spoken languages", "language skills"],
+}
+
+_HEADING_TO_SECTION = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_NOISE = re.compile(r"[^a-z& ]+")
+MAX_HEADING_WORDS = 4
+
+
+@dataclass
+class Section:
+    name: str
+    heading: str
+    text: str
+
+
+def match_heading(line: str) -> str:
+    """Canonical section name for a heading line, or "" if the line is not a heading."""
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped.split()) > MAX_HEADING_WORDS:
+        return ""
+    key = " ".join(_HEADING_NOISE.sub(" ", stripped.lower().replace("&", " and ")).split())
+    # "Experience (continued)", as repeated on later pages and chunks.
+    key = key.removesuffix(" continued")
+    return _HEADING_TO_SECTION.get(key, "")
+
+
+def segment_sections(text: str) -> List[Section]:
+    """
+    Split résumé text into sections in document order. Text before the first
+    heading (name, contact line) becomes the "header" section. A repeated
+    heading yields a second section with the same name.
+    """
+    sections: List[Section] = []
+    name, heading, lines = HEADER_SECTION, "", []
+
+    for line in text.splitlines():
+        section = match_heading(line)
+        if section:
+            if lines or name != HEADER_SECTION:
+                sections.append(Section(name=name, heading=heading, text="\n".join(lines).strip()))
+            name, heading, lines = section, line.strip(), []
+        else:
+            lines.append(line)
+
+    sections.append(Section(name=name, heading=heading, text="\n".join(lines).strip()))
+    return [section for section in sections if section.text or section.name != HEADER_SECTION]
+
+
+def sections_by_name(text: str) -> Dict[str, str]:
+    """Section texts keyed by canonical name; repeated sections are concatenated."""
+    merged: Dict[str, List[str]] = {}
+    for section in segment_sections(text):
+        merged.setdefault(section.name, []).append(section.text)
+    return {name: "\n".join(parts).strip() for name, parts in merged.items()}
+
+
+# ------------------------ Chunking ------------------------ #
+
+# Bulleted lines belong to the entry above them; a plain line after a bullet starts a new entry.
+_BULLET = re.compile(r"^\s*[•\-*–·▪◦●]\s")
+
+
+@dataclass
+class Chunk:
+    sections: List[str]
+    text: str
+
+
+def _entries(text: str) -> List[str]:
+    """Split a section into entries (one job, degree, project...) at blank lines and bullet runs."""
+    entries: List[List[str]] = [[]]
+    previous_bullet = False
+    for line in text.splitlines():
+        bullet = bool(_BULLET.match(line))
+        if not line.strip() or (previous_bullet and not bullet):
+            if entries[-1]:
+                entries.append([])
+        if line.strip():
+            entries[-1].append(line)
+        previous_bullet = bullet
+    return ["\n".join(lines) for lines in entries if lines]
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Cut an entry longer than max_chars at line breaks, or mid-line as a last resort."""
+    parts: List[str] = []
+    current = ""
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            parts.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + 1 + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _section_pieces(section: Section, max_chars: int) -> List[str]:
+    """The section as one piece, or as entry-aligned pieces that each repeat its heading."""
+    full = f"{section.heading}\n{section.text}".strip()
+    if len(full) <= max_chars:
+        return [full]
+    heading = f"{section.heading or section.name.replace('_', ' ').title()} (continued)"
+    budget = max(1, max_chars - len(heading) - 1)
+    pieces: List[str] = []
+    current = ""
+    for entry in _entries(section.text):
+        for part in _split_long(entry, budget) if len(entry) > budget else [entry]:
+            if current and len(current) + 2 + len(part) > budget:
+                pieces.append(current)
+                current = ""
+            current = f"{current}\n\n{part}" if current else part
+    if current:
+        pieces.append(current)
+    pieces[0] = f"{section.heading}\n{pieces[0]}".strip()
+    return pieces[:1] + [f"{heading}\n{piece}" for piece in pieces[1:]]
+
+
+def chunk_sections(text: str, max_chars: int) -> List[Chunk]:
+    """
+    Pack the résumé's sections, in document order, into chunks of at most
+    max_chars. A section too long for one chunk is split between entries, and
+    every later part keeps a "(continued)" heading.
+    """
+    chunks: List[Chunk] = []
+    for section in segment_sections(text):
+        for piece in _section_pieces(section, max_chars):
+            last = chunks[-1] if chunks else None
+            if last is not None and len(last.text) + 2 + len(piece) <= max_chars:
+                last.text = f"{last.text}\n\n{piece}"
+                if last.sections[-1] != section.name:
+                    last.sections.append(section.name)
+            else:
+                chunks.append(Chunk(sections=[section.name], text=piece))
+    return chunks
@@ -0,0 +1,156 @@
+"""
+Skill synonym taxonomy.
+`normalise_skill` maps the many spellings of a skill ("k8s", "Kubernetes",
+"kubernetes ") onto one lowercase key, and `find_skills` spots taxonomy skills
+in free text such as market research. Extra entries can be loaded from a JSON
+file of {"Display Name": ["alias", ...]} named by SKILL_TAXONOMY_PATH.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Display name -> aliases. Keys are matched case-insensitively.
+SKILL_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    "Python": ("python3", "py"),
+    "JavaScript": ("js", "ecmascript", "es6"),
+    "TypeScript": ("ts",),
+    "Go": ("golang",),
+    "Rust": (),
+    "Java": (),
+    "C++": ("cpp", "c plus plus"),
+    "C#": ("csharp", "c sharp"),
+    ".NET": ("dotnet", ".net core"),
+    "Ruby": (),
+    "PHP": (),
+    "Scala": (),
+    "Kotlin": (),
+    "Swift": (),
+    "R": (),
+    "SQL": (),
+    "PostgreSQL": ("postgres", "psql"),
+    "MySQL": (),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Elasticsearch": ("elastic search",),
+    "AWS": ("amazon web services",),
+    "Azure": ("microsoft azure",),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Kubernetes": ("k8s",),
+    "Docker": (),
+    "Terraform": (),
+    "Infrastructure as Code": ("iac",),
+    "Ansible": (),
+    "CI/CD": ("cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "Git": (),
+    "Linux": (),
+    "React": ("react.js", "reactjs"),
+    "Angular": ("angularjs",),
+    "Vue": ("vue.js", "vuejs"),
+    "Node.js": ("nodejs", "node"),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "Spring": ("spring boot",),
+    "Machine Learning": ("ml",),
+    "Deep Learning": (),
+    "NLP": ("natural language processing",),
+    "LLMs": ("llm", "large language models", "generative ai", "genai"),
+    "PyTorch": ("torch",),
+    "TensorFlow": (),
+    "Pandas": (),
+    "NumPy": (),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "Spark": ("apache spark", "pyspark"),
+    "Kafka": ("apache kafka",),
+    "Airflow": ("apache airflow",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Distributed Systems": (),
+    "System Design": (),
+    "Microservices": ("microservice", "micro-services"),
+    "REST APIs": ("rest", "rest api", "restful apis"),
+    "GraphQL": (),
+    "Observability": (),
+    "Prometheus": (),
+    "Grafana": (),
+    "Communication": (),
+    "Mentoring": ("mentorship",),
+    "Agile": ("scrum",),
+}
+
+# Short names that are ordinary words or letters in prose; in free text they
+# only count when written exactly like this.
+CASE_SENSITIVE_FORMS = {"Go", "R", "C", "ML", "TS", "JS", "REST", "Node", "Rust", "Swift", "Spring"}
+
+
+def _key(skill: str) -> str:
+    return " ".join(skill.lower().split()).strip(" ,;:")
+
+
+def _load_taxonomy() -> Dict[str, Tuple[str, ...]]:
+    taxonomy = dict(SKILL_TAXONOMY)
+    path = os.getenv("SKILL_TAXONOMY_PATH")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for display, aliases in json.load(f).items():
+                taxonomy[display] = tuple(taxonomy.get(display, ())) + tuple(aliases)
+    return taxonomy
+
+
+_TAXONOMY = _load_taxonomy()
+_CANONICAL: Dict[str, str] = {}
+_DISPLAY: Dict[str, str] = {}
+for _display, _aliases in _TAXONOMY.items():
+    _DISPLAY[_key(_display)] = _display
+    for _form in (_display, *_aliases):
+        _CANONICAL[_key(_form)] = _key(_display)
+
+
+@lru_cache(maxsize=16384)
+def normalise_skill(skill: str) -> str:
+    """The taxonomy key of a skill, or its lowercased, whitespace-collapsed form if unknown."""
+    key = _key(skill)
+    return _CANONICAL.get(key, key)
+
+
+def display_skill(key: str) -> str:
+    """The display name of a normalised skill key ("k8s" -> "Kubernetes")."""
+    return _DISPLAY.get(key, key)
+
+
+# Words keep inner "+#./-" (C++, Node.js, CI/CD, go-to) and a leading "." (.NET).
+_WORD = re.compile(r"\.?[\w+#]+(?:[./-][\w+#]+)*\+*")
+# First word of every form -> the most words a form starting with it has.
+_FIRST_WORDS: Dict[str, int] = {}
+for _form in _CANONICAL:
+    _first, *_rest = _form.split()
+    _FIRST_WORDS[_first] = max(_FIRST_WORDS.get(_first, 0), len(_rest) + 1)
+_EXACT_KEYS = {_key(form) for form in CASE_SENSITIVE_FORMS}
+
+
+def find_skills(text: str) -> Dict[str, int]:
+    """Taxonomy skills mentioned in `text`, as {key: mentions}, most mentioned first."""
+    words = _WORD.findall(text)
+    lowered = [word.lower() for word in words]
+    counts: Dict[str, int] = {}
+    i = 0
+    while i < len(words):
+        longest = _FIRST_WORDS.get(lowered[i])
+        if longest is None:
+            i += 1
+            continue
+        # Longest phrase first, so "google cloud platform" wins over "google cloud".
+        for size in range(min(longest, len(words) - i), 0, -1):
+            form = " ".join(lowered[i:i + size])
+            key = _CANONICAL.get(form)
+            if key is None or (form in _EXACT_KEYS and " ".join(words[i:i + size]) not in CASE_SENSITIVE_FORMS):
+                continue
+            counts[key] = counts.get(key, 0) + 1
+            i += size
+            break
+        else:
+            i += 1
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
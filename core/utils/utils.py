@@ -1,14 +1,29 @@
-import datetime as dt
+import atexit
+import os
 import re
-from typing import List, Optional
-
-import dateparser
-import langdetect
-import pdfplumber
-import pymupdf as fitz
-import pytesseract
-from PIL import Image
-from dateparser.conf import settings as dateparser_settings
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from core.utils.lazy import lazy_import
+
+# Loaded on first use: a worker that only reads text-layer PDFs never imports the OCR stack.
+pdfplumber = lazy_import("pdfplumber")
+fitz = lazy_import("pymupdf")
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+
+# Bump whenever a change to extraction would alter its output, so cached text is invalidated.
+EXTRACTOR_VERSION = "2"
+OCR_LANG = os.getenv("TESSERACT_LANG", "eng")
+# OCR resolution adapts to page size: the long side is rendered at ~OCR_TARGET_PIXELS,
+# which puts Letter/A4 at ~300 DPI without blowing up oversized pages.
+OCR_TARGET_PIXELS = 3300
+OCR_MIN_DPI = 150
+OCR_MAX_DPI = 300
+# Pages with fewer characters than this in their text layer are treated as scanned.
+MIN_TEXT_LAYER_CHARS = 20
 
 
 # ------------------------ File Type Detection ------------------------ #
@@ -25,51 +40,131 @@ def is_pdf_file(filename: str) -> bool:
 
 def extract_text_from_image(image_path: str) -> str:
     image = Image.open(image_path)
-    text = pytesseract.image_to_string(image)
+    text = pytesseract.image_to_string(image, lang=OCR_LANG)
     return text.strip()
 
 
 def extract_text_from_pdf(pdf_path: str) -> str:
-    text = ""
+    """
+    Uses the text layer where a page has one and OCRs only the pages that don't,
+    so a single scanned page inside an otherwise digital PDF is not lost.
+    """
+    return "\n".join(page for page in iter_pdf_pages(pdf_path) if page).strip()
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
 
-    # If no text was extracted using pdfplumber, fallback to OCR
-    if not text.strip():
-        print("⚠️ No text found in PDF — using OCR fallback")
-        text = extract_text_from_scanned_pdf(pdf_path)
+def extract_text_from_scanned_pdf(pdf_path: str) -> str:
+    """Converts PDF pages to images and applies OCR (Tesseract)."""
+    return "\n".join(iter_scanned_pdf_pages(pdf_path))
 
-    return text.strip()
 
+def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """
+    Yields the text of each page in order as soon as it is available.
+    Each pdfplumber page is closed straight after extraction, so its layout
+    cache is dropped instead of living for the whole document.
+    """
 
-def extract_text_from_scanned_pdf(pdf_path: str) -> str:
-    """Converts PDF pages to images and applies OCR (Tesseract)."""
-    text = ""
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            pix = page.get_pixmap(dpi=300)
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            text += pytesseract.image_to_string(img) + "\n"
-    return text
+    def layer_pages() -> Iterator[Tuple[int, str]]:
+        with pdfplumber.open(pdf_path) as pdf:
+            for number, page in enumerate(pdf.pages):
+                page_text = (page.extract_text() or "").strip()
+                page.close()
+                yield number, page_text
+
+    return _iter_with_ocr(pdf_path, layer_pages())
 
 
-# ------------------------ Date Normalization ------------------------ #
+def iter_scanned_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """Yields the OCR text of each page in order, ignoring any text layer."""
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+    return _iter_with_ocr(pdf_path, ((number, "") for number in range(page_count)))
 
-def normalise_dates(raw: Optional[str]) -> Optional[dt.date]:
+
+def _iter_with_ocr(pdf_path: str, pages: Iterable[Tuple[int, str]]) -> Iterator[str]:
     """
-    Normalize raw date strings into ISO-format date objects.
-    Returns None if parsing fails or input is invalid.
+    Yields page texts in order, OCRing pages whose text layer is too thin.
+    OCR runs ahead in the shared process pool, but only a few pages are in
+    flight at once, so peak memory does not grow with the page count.
     """
-    if not raw or raw.lower() in {"none", "null", "nan"}:
-        return None
+    workers = ocr_workers()
+    window = workers * 2
+    pending: Deque[Tuple[str, Optional[Future]]] = deque()
+
+    def resolve(layer_text: str, ocr: Optional[Future]) -> str:
+        if ocr is None:
+            return layer_text
+        ocr_text = ocr.result()
+        # Keep the text layer if OCR comes back with less than it had.
+        return ocr_text if len(ocr_text) > len(layer_text) else layer_text
+
+    try:
+        for number, layer_text in pages:
+            if len(layer_text) >= MIN_TEXT_LAYER_CHARS:
+                pending.append((layer_text, None))
+            elif workers <= 1:
+                ocr_text = _ocr_pdf_page(pdf_path, number)
+                pending.append((ocr_text if len(ocr_text) > len(layer_text) else layer_text, None))
+            else:
+                pending.append((layer_text, _ocr_pool().submit(_ocr_pdf_page, pdf_path, number)))
+
+            while pending and (pending[0][1] is None or pending[0][1].done() or len(pending) > window):
+                yield resolve(*pending.popleft())
+
+        while pending:
+            yield resolve(*pending.popleft())
+    finally:
+        # A caller that stops early leaves no queued pages behind in the shared pool.
+        for _, ocr in pending:
+            if ocr is not None:
+                ocr.cancel()
 
-    dateparser_settings.PREFER_DAY_OF_MONTH = "first"
-    parsed = dateparser.parse(raw, settings=dateparser_settings)
-    return parsed.date() if parsed else None
+
+def ocr_dpi(width_pt: float, height_pt: float) -> int:
+    """Rendering DPI for a page of the given size in PDF points (1/72 in)."""
+    long_side_in = max(width_pt, height_pt, 1.0) / 72
+    return int(min(OCR_MAX_DPI, max(OCR_MIN_DPI, OCR_TARGET_PIXELS / long_side_in)))
+
+
+def ocr_workers() -> int:
+    """OCR worker processes; RESUME_OCR_WORKERS overrides the core count."""
+    return int(os.getenv("RESUME_OCR_WORKERS", "0")) or os.cpu_count() or 1
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _ocr_pool() -> ProcessPoolExecutor:
+    """One OCR process pool per process, started on first use, so its workers outlive single documents."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=ocr_workers())
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def _ocr_pdf_page(pdf_path: str, number: int) -> str:
+    # Runs in a worker process: each worker opens its own handle on the document.
+    with fitz.open(pdf_path) as doc:
+        page = doc[number]
+        pix = page.get_pixmap(dpi=ocr_dpi(page.rect.width, page.rect.height))
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        # The PIL image holds its own copy; drop the pixmap before the slow OCR call.
+        del pix
+        try:
+            return pytesseract.image_to_string(img, lang=OCR_LANG).strip()
+        finally:
+            img.close()
+
+
+def extractor_settings() -> str:
+    """Settings that change extraction output; part of the text cache key."""
+    return (
+        f"v{EXTRACTOR_VERSION};lang={OCR_LANG};"
+        f"dpi={OCR_MIN_DPI}-{OCR_MAX_DPI}@{OCR_TARGET_PIXELS}px;min_chars={MIN_TEXT_LAYER_CHARS}"
+    )
 
 
 # ------------------------ Email Extraction ------------------------ #
@@ -88,16 +183,3 @@ def extract_urls(text: str) -> List[str]:
     Extract all URLs from raw text.
     """
     return re.findall(r"(https?://\S+)", text)
-
-
-# ------------------------ Language Detection ------------------------ #
-
-def detect_language(text: str) -> str:
-    """
-    Detect the language of the given text.
-    Returns ISO 639-1 language code (e.g., 'en', 'fr').
-    """
-    try:
-        return langdetect.detect(text)
-    except Exception:
-        return "unknown"
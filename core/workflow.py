@@ -1,34 +1,291 @@
+import asyncio
+import contextlib
+import contextvars
 import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
 
-from llama_index.core import SimpleDirectoryReader
-
-from agents import (
-    parse_resume_agent,
+from core.agents import (
+    ANALYST_MODEL,
+    SYNTHESIZER_MODEL,
     research_market_agent,
-    analyze_gaps_agent,
-    synthesize_report_agent
+    analyze_gaps_agent_async,
+    synthesize_report_agent_astream,
+    synthesize_report_agent_async
+)
+from core.agents.parse_resume_agent import (
+    CHUNKED_PARSE_ENABLED,
+    FAST_PARSE_ENABLED,
+    PARSE_HEDGE_MODEL,
+    PARSE_MODEL,
+    detect_resume_language,
+    enrich_contact_email,
+    extract_resume_text,
+    normalise_resume_dates,
+    parse_structured_resume,
+)
+from core.checkpoints import get_checkpoint_store
+from core.clients import aclose_loop_clients, overridden_clients
+from core.dedupe import REUSED_FIELDS, find_duplicate, is_duplicate, remember_analysis
+from core.llm import llm_cache_mode
+from core.models import AnalysisState
+from core.pipeline import PipelineExecutor, Stage
+from core.research import RESEARCH_CACHE_TTL, search_backend_name
+from core.scoring import score_resume_gaps
+from core.skill_index import index_resume
+from core.tracing import write_trace
+
+T = TypeVar("T")
+
+ReportListener = Callable[[str], None]
+
+_report_listener: contextvars.ContextVar[Optional[ReportListener]] = contextvars.ContextVar(
+    "report_listener", default=None
+)
+
+
+@contextlib.contextmanager
+def stream_report(listener: Optional[ReportListener]) -> Iterator[None]:
+    """
+    Pipeline runs started inside the block hand the final report to `listener`
+    piece by piece as the Synthesizer writes it. A report restored from a
+    checkpoint or reused from a near-duplicate is not streamed.
+    """
+    token = _report_listener.set(listener)
+    try:
+        yield
+    finally:
+        _report_listener.reset(token)
+
+
+async def _synthesize_stage(state: AnalysisState) -> AnalysisState:
+    # The executor starts this stage as soon as the analysis is final, so only the report is left to wait for.
+    listener = _report_listener.get()
+    if listener is None:
+        state.final_report = await synthesize_report_agent_async(state)
+        return state
+    parts = []
+    async for text in synthesize_report_agent_astream(state):
+        parts.append(text)
+        listener(text)
+    state.final_report = "".join(parts)
+    return state
+
+
+# ------------------------ Checkpoint Settings ------------------------ #
+
+def _llm_config(*models: Optional[str], **settings: Any) -> Optional[Dict[str, Any]]:
+    """
+    Run settings behind an LLM stage's output. None, so nothing is restored or
+    saved, when LLM_CACHE_MODE asks for every completion to come from the API.
+    """
+    mode = llm_cache_mode()
+    if mode in ("off", "record"):
+        return None
+    return {
+        "models": [model for model in models if model],
+        "replay": mode == "replay",
+        "fake": "openrouter" in overridden_clients(),
+        **settings,
+    }
+
+
+def _parse_config() -> Optional[Dict[str, Any]]:
+    return _llm_config(PARSE_MODEL, PARSE_HEDGE_MODEL, fast=FAST_PARSE_ENABLED, chunked=CHUNKED_PARSE_ENABLED)
+
+
+def _research_config() -> Dict[str, Any]:
+    return {"backend": search_backend_name(), "fake": "tavily" in overridden_clients()}
+
+
+DATE_FIELDS = (
+    "structured_resume.education.start_date",
+    "structured_resume.education.end_date",
+    "structured_resume.work_experience.start_date",
+    "structured_resume.work_experience.end_date",
+    "structured_resume.certifications.issue_date",
+    "structured_resume.certifications.expiry_date",
 )
-from models import AnalysisState
+
+# Field paths are what lets date/email/language post-processing overlap with the
+# Tavily call: research only reads work titles and skills. The same fields, plus
+# each stage's config settings, key its checkpoint, so they must cover
+# everything a stage uses.
+# With DEDUPE=1, a near-duplicate of an analysed résumé skips the LLM stages.
+PIPELINE_STAGES = [
+    Stage(
+        "extract",
+        extract_resume_text,
+        reads=frozenset({"raw_resume_text", "resume_file_path"}),
+        writes=frozenset({"raw_resume_text"}),
+        # Extracted text is already cached by file digest.
+        checkpoint=False,
+    ),
+    Stage(
+        "dedupe",
+        find_duplicate,
+        reads=frozenset({"raw_resume_text"}),
+        writes=frozenset({*REUSED_FIELDS, "duplicate_of"}),
+        # The answer depends on what has been indexed since, not only on the inputs.
+        checkpoint=False,
+    ),
+    Stage(
+        "parse",
+        parse_structured_resume,
+        reads=frozenset({"raw_resume_text"}),
+        writes=frozenset({"structured_resume"}),
+        skip=is_duplicate,
+        config=_parse_config,
+    ),
+    Stage(
+        "language",
+        detect_resume_language,
+        reads=frozenset({"raw_resume_text"}),
+        writes=frozenset({"detected_language", "section_languages"}),
+    ),
+    Stage(
+        "dates",
+        normalise_resume_dates,
+        reads=frozenset(DATE_FIELDS),
+        writes=frozenset(DATE_FIELDS),
+    ),
+    Stage(
+        "email",
+        enrich_contact_email,
+        reads=frozenset({"raw_resume_text", "structured_resume.contact.email"}),
+        writes=frozenset({"structured_resume.contact.email"}),
+    ),
+    Stage(
+        "index",
+        index_resume,
+        reads=frozenset({"structured_resume", "raw_resume_text", "resume_file_path"}),
+        checkpoint=False,
+    ),
+    Stage(
+        "research",
+        research_market_agent,
+        reads=frozenset({"structured_resume.work_experience.title", "structured_resume.skills"}),
+        writes=frozenset({"market_research"}),
+        ttl=RESEARCH_CACHE_TTL,
+        skip=is_duplicate,
+        config=_research_config,
+    ),
+    Stage(
+        "score",
+        score_resume_gaps,
+        reads=frozenset({"structured_resume", "market_research"}),
+        writes=frozenset({"scored_gaps"}),
+        # 2: mention-only skills are gaps, not strengths.
+        version="2",
+        skip=is_duplicate,
+    ),
+    Stage(
+        "analyse",
+        analyze_gaps_agent_async,
+        reads=frozenset({"structured_resume", "market_research", "scored_gaps"}),
+        writes=frozenset({"gap_analysis"}),
+        skip=is_duplicate,
+        config=lambda: _llm_config(ANALYST_MODEL),
+    ),
+    Stage(
+        "synthesise",
+        _synthesize_stage,
+        reads=frozenset({"structured_resume.contact.full_name", "gap_analysis"}),
+        writes=frozenset({"final_report"}),
+        skip=is_duplicate,
+        config=lambda: _llm_config(SYNTHESIZER_MODEL),
+    ),
+    Stage(
+        "remember",
+        remember_analysis,
+        reads=frozenset({*REUSED_FIELDS, "raw_resume_text", "resume_file_path", "duplicate_of"}),
+        checkpoint=False,
+    ),
+]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_pipeline() -> PipelineExecutor:
+    """The process-wide executor, shared so its thread pool is reused across résumés."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = PipelineExecutor(PIPELINE_STAGES, checkpoints=get_checkpoint_store())
+        return _executor
+
+
+async def run_agent_chain_async(
+        state: AnalysisState,
+        refresh: Iterable[str] = (),
+        on_report: Optional[ReportListener] = None,
+) -> str:
+    with stream_report(on_report):
+        state = await get_pipeline().run(state, refresh)
+    return state.final_report
+
+
+async def run_agent_chains_async(
+        states: Iterable[AnalysisState],
+        concurrency: int = 100,
+        refresh: Iterable[str] = (),
+) -> List:
+    """
+    Analyse many résumés on one event loop. Returns the final report, or the
+    exception that stopped it, for each state in order.
+    """
+    results = await get_pipeline().run_many(states, concurrency=concurrency, refresh=refresh)
+    return [result if isinstance(result, BaseException) else result.final_report for result in results]
+
+
+async def _closing_clients(coroutine: Awaitable[T]) -> T:
+    # asyncio.run discards its loop afterwards, and with it any keep-alive connection.
+    try:
+        return await coroutine
+    finally:
+        await aclose_loop_clients()
 
 
-def run_multi_agent_workflow(resume_path: str) -> str:
+def run_agent_chain(
+        state: AnalysisState,
+        refresh: Iterable[str] = (),
+        on_report: Optional[ReportListener] = None,
+) -> str:
+    """
+    Runs the agent chain over a state whose résumé text is already ingested.
+    Shared by the single-file workflow and the batch runner. Stages named in
+    `refresh` (and their dependents) re-run even if checkpointed; `on_report`
+    receives the final report as it streams in.
+    """
+    return asyncio.run(_closing_clients(run_agent_chain_async(state, refresh, on_report)))
+
+
+def run_multi_agent_workflow(
+        resume_path: str,
+        trace_path: Optional[str] = None,
+        trace_format: str = "json",
+        refresh: Iterable[str] = (),
+        on_report: Optional[ReportListener] = None,
+) -> str:
     """
     Orchestrates the full multi-agent resume analysis workflow.
+    With trace_path, the run's spans are written there as JSON or OTLP-style records.
+    With on_report, the final report is streamed to it while it is being written.
     """
     print("--- Workflow Started ---")
 
-    # Ingest resume and initialize state
-    try:
-        resume_text = SimpleDirectoryReader(input_files=[resume_path]).load_data()[0].text
-        state = AnalysisState(resume_text=resume_text)
-    except Exception as e:
-        return f"Error loading resume: {e}"
+    if not os.path.isfile(resume_path):
+        return f"Error loading resume: no such file '{resume_path}'"
+    # The extract stage reads the file through the text cache, with OCR for scanned pages.
+    state = AnalysisState(raw_resume_text="", resume_file_path=resume_path)
 
     # Agent Chain
-    state = parse_resume_agent(state)
-    # state = research_market_agent(state) # Uncomment as you build
-    # state = analyze_gaps_agent(state)    # Uncomment as you build
-    final_report = synthesize_report_agent(state)  # Will use placeholder for now
+    try:
+        final_report = run_agent_chain(state, refresh, on_report)
+    finally:
+        if trace_path:
+            write_trace(state.spans, trace_path, trace_format)
 
     print("\n--- Workflow Finished ---")
     return final_report
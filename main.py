@@ -1,18 +1,222 @@
+import argparse
 import os
 
 from dotenv import load_dotenv
 
-from core.workflow import run_multi_agent_workflow
+from core.batch import DEFAULT_LLM_CONCURRENCY, run_batch_workflow
+from core.llm import LLM_CACHE_MODES
+from core.research import SEARCH_BACKENDS
+from core.skill_index import SKILL_INDEX_PATH, get_skill_index
+from core.startup import startup_report
+from core.tracing import TRACE_FORMATS
+from core.workflow import PIPELINE_STAGES, run_multi_agent_workflow
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Multi-agent résumé analyser.")
+    parser.add_argument(
+        "resume_path",
+        nargs="?",
+        default="data/resumes/sample_resume.pdf",  # IMPORTANT: Add your resume file here
+        help="Résumé to analyse in single-file mode.",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="SOURCE",
+        help="Directory or .txt/.jsonl manifest of résumés to analyse in batch mode.",
+    )
+    parser.add_argument(
+        "--output",
+        default="results.jsonl",
+        help="JSONL file batch results are appended to ('-' for stdout).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used for text extraction (default: one per core).",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Also write the batch's parsed résumés to a columnar store in DIR.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_LLM_CONCURRENCY,
+        help="Résumés allowed inside the agent chain at once.",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=LLM_CACHE_MODES,
+        default=None,
+        help="LLM response cache mode; 'replay' runs offline from recorded completions.",
+    )
+    parser.add_argument(
+        "--search-backend",
+        choices=SEARCH_BACKENDS,
+        default=None,
+        help="Market research backend; 'stub' serves canned results offline.",
+    )
+    parser.add_argument(
+        "--index",
+        metavar="PATH",
+        nargs="?",
+        const=SKILL_INDEX_PATH,
+        default=None,
+        help=f"Add parsed résumés to the skill index at PATH (default {SKILL_INDEX_PATH}); with --search, the index to query.",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help='Search the skill index, e.g. "Python AND Kubernetes, 3+ years", and exit.',
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Candidates shown by --search.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="append",
+        metavar="STAGE",
+        choices=[stage.name for stage in PIPELINE_STAGES],
+        default=[],
+        help="Re-run STAGE and everything downstream of it, ignoring checkpoints (e.g. research); repeat for more stages.",
+    )
+    parser.add_argument(
+        "--no-checkpoints",
+        action="store_true",
+        help="Neither restore nor save per-stage checkpoints.",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Reuse the analysis of an earlier near-identical résumé instead of re-running the LLM stages.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the final report as it is written instead of when it is finished.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Write the single-file run's spans (timings, tokens, cost) to PATH.",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="json",
+        help="Span export format: plain JSON or OpenTelemetry-style (OTLP/JSON) records.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the HTTP service (needs the 'service' extra: FastAPI and uvicorn).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address the service listens on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port the service listens on.")
+    parser.add_argument(
+        "--service-workers",
+        type=int,
+        default=None,
+        help="Uploads the service analyses at once (default: SERVICE_WORKERS or 4).",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=None,
+        help="Uploads the service queues before answering 429 (default: SERVICE_QUEUE_DEPTH or 64).",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Print per-module import timings of a cold start and exit.",
+    )
+    return parser.parse_args()
+
+
+def search_index(query: str, index_path: str, top: int) -> None:
+    if not os.path.exists(index_path):
+        print(f"🚨 ERROR: Skill index not found at '{index_path}'. Build it with --index.")
+        return
+    try:
+        candidates = get_skill_index(index_path).search(query, limit=top)
+    except ValueError as e:
+        print(f"🚨 ERROR: {e}")
+        return
+    print(f"🔎 {len(candidates)} candidates for: {query}\n")
+    for rank, candidate in enumerate(candidates, 1):
+        matched = ", ".join(f"{term} ({years:g}y)" for term, years in candidate.matched.items())
+        print(f"{rank:>3}. {candidate.name} — {candidate.title or 'n/a'}, {candidate.total_years:g}y total "
+              f"[score {candidate.score:g}] {matched}\n     {candidate.key}")
 
 
 def main():
+    args = parse_args()
+    if args.startup_report:
+        print(startup_report())
+        return
+    if args.search:
+        search_index(args.search, args.index or SKILL_INDEX_PATH, args.top)
+        return
+
     # Load environment variables from .env file
     load_dotenv()
-    if not os.getenv("OPENROUTER_API_KEY") or not os.getenv("TAVILY_API_KEY"):
+    if args.llm_cache:
+        os.environ["LLM_CACHE_MODE"] = args.llm_cache
+    if args.search_backend:
+        os.environ["SEARCH_BACKEND"] = args.search_backend
+    if args.no_checkpoints:
+        os.environ["CHECKPOINTS"] = "0"
+    if args.dedupe:
+        os.environ["DEDUPE"] = "1"
+    if args.index:
+        os.environ["SKILL_INDEX"] = "1"
+        os.environ["SKILL_INDEX_PATH"] = args.index
+    needs_openrouter = os.getenv("LLM_CACHE_MODE") != "replay"
+    needs_tavily = os.getenv("SEARCH_BACKEND", "tavily") != "stub"
+    if (needs_openrouter and not os.getenv("OPENROUTER_API_KEY")) or (needs_tavily and not os.getenv("TAVILY_API_KEY")):
         print("🚨 ERROR: API keys for OpenRouter and Tavily must be set in .env file.")
         return
 
-    resume_path = "data/resumes/sample_resume.pdf"  # IMPORTANT: Add your resume file here
+    if args.serve:
+        try:
+            from core.service import SERVICE_QUEUE_DEPTH, SERVICE_WORKERS, serve
+        except ImportError as e:
+            print(f"🚨 ERROR: The service needs FastAPI and uvicorn ({e}). Install with: pip install '.[service]'")
+            return
+        workers = args.service_workers or SERVICE_WORKERS
+        print(f"🚀 Serving résumé analysis on http://{args.host}:{args.port} ({workers} workers)\n")
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            queue_depth=args.queue_depth or SERVICE_QUEUE_DEPTH,
+            refresh=args.refresh,
+        )
+        return
+
+    if args.batch:
+        if not os.path.exists(args.batch):
+            print(f"🚨 ERROR: Batch source not found at '{args.batch}'.")
+            return
+        print(f"🚀 Starting batch analysis for: {args.batch} → {args.output}\n")
+        counts = run_batch_workflow(
+            args.batch,
+            output_path=args.output,
+            extract_workers=args.workers,
+            llm_concurrency=args.concurrency,
+            store_path=args.store,
+            refresh=args.refresh,
+        )
+        print(f"\n✅ Batch finished: {counts['ok']} succeeded, {counts['error']} failed.")
+        return
+
+    resume_path = args.resume_path
 
     if not os.path.exists(resume_path):
         print(f"🚨 ERROR: Resume file not found at '{resume_path}'.")
@@ -20,8 +224,26 @@ def main():
         return
 
     print(f"🚀 Starting Multi-Agent Resume Analysis for: {resume_path}\n")
-    final_report = run_multi_agent_workflow(resume_path)
+    streamed = []
+
+    def show_report(text: str) -> None:
+        if not streamed:
+            print("\n\n--- ✅ FINAL REPORT ---")
+            print("--------------------------------------------------")
+        streamed.append(text)
+        print(text, end="", flush=True)
 
+    final_report = run_multi_agent_workflow(
+        resume_path,
+        trace_path=args.trace,
+        trace_format=args.trace_format,
+        refresh=args.refresh,
+        on_report=show_report if args.stream else None,
+    )
+
+    if streamed:
+        print("\n--------------------------------------------------")
+        return
     print("\n\n--- ✅ FINAL REPORT ---")
     print("--------------------------------------------------")
     print(final_report)
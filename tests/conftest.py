@@ -0,0 +1,24 @@
+import pytest
+
+import core.research
+from bench.fakes import install_fakes, uninstall_fakes
+from core.clients import PROVIDER_RATE_LIMITS, configure_rate_limit
+from core.research import MarketResearchCache
+from core.utils import DiskCache
+
+
+@pytest.fixture
+def fakes(tmp_path, monkeypatch):
+    """OpenRouter and Tavily served by the bench fakes, with no rate limit and no caches shared between tests."""
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+    monkeypatch.setenv("RESUME_TEXT_CACHE", "0")
+    monkeypatch.delenv("SEARCH_BACKEND", raising=False)
+    research = MarketResearchCache(store=DiskCache(str(tmp_path / "research.sqlite")))
+    monkeypatch.setattr(core.research, "_research_cache", research)
+    for provider in PROVIDER_RATE_LIMITS:
+        configure_rate_limit(provider, 10000, 10000)
+    install_fakes(llm_latency=0.01, search_latency=0.01, jitter=0.0, report_chars=300)
+    yield
+    uninstall_fakes()
+    for provider, (rate, burst) in PROVIDER_RATE_LIMITS.items():
+        configure_rate_limit(provider, rate, burst)
@@ -0,0 +1,100 @@
+import asyncio
+import random
+
+import pytest
+
+import core.llm
+from bench.synthetic import resume_text
+from core.checkpoints import CheckpointStore, checkpoint_key
+from core.models import AnalysisState
+from core.pipeline import PipelineExecutor, Stage
+from core.utils import DiskCache
+from core.workflow import PIPELINE_STAGES
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(DiskCache(str(tmp_path / "checkpoints.sqlite")))
+
+
+def _run(executor, state, refresh=()):
+    events = {}
+    asyncio.run(executor.run(state, refresh, lambda name, event: events.__setitem__(name, event)))
+    return events
+
+
+def test_key_covers_reads_version_and_config():
+    stage = Stage("research", lambda state: state, reads=frozenset({"structured_resume.skills"}))
+    state = AnalysisState(raw_resume_text="text")
+    key = checkpoint_key(stage, state, "digest", {"backend": "tavily"})
+
+    state.market_research = "unrelated"
+    assert checkpoint_key(stage, state, "digest", {"backend": "tavily"}) == key
+    assert checkpoint_key(stage, state, "other", {"backend": "tavily"}) != key
+    assert checkpoint_key(stage, state, "digest", {"backend": "stub"}) != key
+    newer = Stage("research", stage.func, reads=stage.reads, version="2")
+    assert checkpoint_key(newer, state, "digest", {"backend": "tavily"}) != key
+
+
+def test_refresh_reruns_the_stage_and_everything_downstream(store):
+    calls = []
+
+    def stage(name, reads, writes):
+        def func(state):
+            calls.append(name)
+            setattr(state, next(iter(writes)), f"{name} output")
+        return Stage(name, func, reads=frozenset(reads), writes=frozenset(writes))
+
+    executor = PipelineExecutor([
+        stage("research", {"raw_resume_text"}, {"market_research"}),
+        stage("language", {"raw_resume_text"}, {"detected_language"}),
+        stage("analyse", {"market_research"}, {"gap_analysis"}),
+    ], checkpoints=store)
+
+    assert set(_run(executor, AnalysisState(raw_resume_text="cv")).values()) == {"finished"}
+    state = AnalysisState(raw_resume_text="cv")
+    assert set(_run(executor, state).values()) == {"restored"}
+    assert state.gap_analysis == "analyse output"
+
+    calls.clear()
+    events = _run(executor, AnalysisState(raw_resume_text="cv"), refresh=("research",))
+    assert events == {"research": "finished", "language": "restored", "analyse": "finished"}
+    assert sorted(calls) == ["analyse", "research"]
+
+
+def test_changed_resume_misses_its_checkpoints(store):
+    executor = PipelineExecutor(
+        [Stage("research", lambda state: state, reads=frozenset({"raw_resume_text"}), writes=frozenset({"market_research"}))],
+        checkpoints=store,
+    )
+    _run(executor, AnalysisState(raw_resume_text="cv"))
+    assert _run(executor, AnalysisState(raw_resume_text="edited cv")) == {"research": "finished"}
+
+
+def test_expired_checkpoint_reruns(store):
+    stage = Stage("research", lambda state: state, writes=frozenset({"market_research"}), ttl=-1)
+    executor = PipelineExecutor([stage], checkpoints=store)
+    _run(executor, AnalysisState(raw_resume_text="cv"))
+    assert _run(executor, AnalysisState(raw_resume_text="cv")) == {"research": "finished"}
+
+
+def test_agent_chain_resumes_from_checkpoints(fakes, store, tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "cache")
+    monkeypatch.setattr(core.llm, "_stores", {"responses": DiskCache(str(tmp_path / "llm.sqlite"))})
+    text = resume_text(random.Random(7))
+    executor = PipelineExecutor(PIPELINE_STAGES, checkpoints=store)
+    first = AnalysisState(raw_resume_text=text)
+    _run(executor, first)
+
+    second = AnalysisState(raw_resume_text=text)
+    events = _run(executor, second, refresh=("research",))
+    assert events["parse"] == "restored"
+    assert {events[name] for name in ("research", "score", "analyse", "synthesise")} == {"finished"}
+    assert second.structured_resume == first.structured_resume
+    assert second.final_report == first.final_report
+
+    # With the LLM cache off every completion must come from the API, so LLM stages never restore.
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+    events = _run(executor, AnalysisState(raw_resume_text=text))
+    executor.shutdown()
+    assert events["parse"] == "finished" and events["research"] == "restored"
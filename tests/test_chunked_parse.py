@@ -0,0 +1,79 @@
+import importlib
+import random
+
+import pytest
+
+from bench.synthetic import resume_text
+from core.agents.rule_parser import rule_parse
+from core.models import AnalysisState
+from core.tracing import CHARS_PER_TOKEN, collect_spans
+
+# core.agents re-exports a function under the module's name.
+parser = importlib.import_module("core.agents.parse_resume_agent")
+
+
+@pytest.fixture
+def long_resume(fakes, monkeypatch):
+    text = resume_text(random.Random(11), jobs=14, projects=10)
+    monkeypatch.setattr(parser, "FAST_PARSE_ENABLED", False)
+    monkeypatch.setattr(parser, "CHUNKED_PARSE_MIN_TOKENS", len(text) // CHARS_PER_TOKEN - 1)
+    monkeypatch.setattr(parser, "CHUNK_TOKENS", 400)
+    return text
+
+
+def test_fragments_merge_in_document_order():
+    merged = parser._merge_fragments([
+        {
+            "contact": {"full_name": "Mei Chen", "email": None},
+            "summary": "Backend engineer.",
+            "work_experience": [{"company": "Acme", "title": "Engineer", "start_date": "2020-01-01",
+                                 "description": "Built billing.", "technologies": ["Go"]}],
+            "skills": [{"category": "Languages", "skills": ["Python", "Go"]}],
+        },
+        {
+            "contact": {"full_name": "M. Chen", "email": "mei@example.com"},
+            "summary": "Ignored: the first summary wins.",
+            "work_experience": [
+                {"company": "acme", "title": "engineer", "start_date": "2020-01-01",
+                 "description": "Ran on-call.", "technologies": ["go", "Kafka"]},
+                {"company": "Globex", "title": "Engineer", "start_date": "2018-01-01"},
+            ],
+            "skills": [{"category": "languages", "skills": ["python", "Rust"]}, []],
+        },
+    ])
+
+    assert merged["contact"] == {"full_name": "Mei Chen", "email": "mei@example.com"}
+    assert merged["summary"] == "Backend engineer."
+    first, second = merged["work_experience"]
+    assert first["description"] == "Built billing.\nRan on-call."
+    assert first["technologies"] == ["Go", "Kafka"]
+    assert second["company"] == "Globex"
+    assert merged["skills"] == [{"category": "Languages", "skills": ["Python", "Go", "Rust"]}]
+
+
+def test_long_resume_is_parsed_in_chunks(long_resume):
+    state = AnalysisState(raw_resume_text=long_resume)
+    with collect_spans(state.spans):
+        parser.parse_structured_resume(state)
+
+    chunked = [record for record in state.spans if record.name == "parse.chunked"]
+    assert chunked and chunked[0].attributes["chunks"] > 1
+    expected = rule_parse(long_resume).data
+    assert len(state.structured_resume.work_experience) == len(expected["work_experience"])
+    assert len(state.structured_resume.projects) == len(expected["projects"])
+
+
+def test_failed_chunk_falls_back_to_a_whole_resume_parse(long_resume, monkeypatch):
+    parse_fields, calls = parser._parse_fields, []
+
+    def work_chunks_fail(llm, text, fields, excerpt=False, attempt=1):
+        calls.append(excerpt)
+        if excerpt and "work_experience" in fields:
+            return None
+        return parse_fields(llm, text, fields, excerpt, attempt)
+
+    monkeypatch.setattr(parser, "_parse_fields", work_chunks_fail)
+    state = parser.parse_structured_resume(AnalysisState(raw_resume_text=long_resume))
+
+    assert True in calls
+    assert len(state.structured_resume.work_experience) == len(rule_parse(long_resume).data["work_experience"])
@@ -0,0 +1,24 @@
+from core.clients import is_rate_limited
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class APIError(Exception):
+    def __init__(self, message, status_code=None, response=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+def test_rate_limit_is_read_from_the_status_code():
+    assert is_rate_limited(APIError("Too Many Requests", status_code=429))
+    assert is_rate_limited(APIError("Too Many Requests", response=Response(429)))
+    assert not is_rate_limited(APIError("Server error", status_code=500))
+
+
+def test_message_text_is_not_a_rate_limit():
+    assert not is_rate_limited(ValueError("invoice 14290 failed validation"))
+    assert not is_rate_limited(RuntimeError("rate limit of the parser exceeded"))
@@ -0,0 +1,72 @@
+import datetime as dt
+
+import pytest
+
+import core.utils.dates
+from core.models import StructuredResume, WorkItem
+from core.utils.dates import date_cache_info, normalise_dates, normalise_structured_dates
+
+
+class Dateparser:
+    def __init__(self):
+        self.calls = []
+
+    def parse(self, text, settings=None):
+        self.calls.append(text)
+        return dt.datetime(2001, 2, 3) if text == "the spring of 2001" else None
+
+
+@pytest.fixture(autouse=True)
+def dateparser(monkeypatch):
+    fallback = Dateparser()
+    monkeypatch.setattr(core.utils.dates, "dateparser", fallback)
+    core.utils.dates._parse.cache_clear()
+    yield fallback
+    core.utils.dates._parse.cache_clear()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("2019", dt.date(2019, 1, 1)),
+    ("2020-03-15", dt.date(2020, 3, 15)),
+    ("2020-03", dt.date(2020, 3, 1)),
+    ("2020-03-15T10:00:00", dt.date(2020, 3, 15)),
+    ("Jan 2020", dt.date(2020, 1, 1)),
+    ("September, 2021", dt.date(2021, 9, 1)),
+    ("Sept. 2021", dt.date(2021, 9, 1)),
+    ("Fall 2018", dt.date(2018, 9, 1)),
+    ("03/2021", dt.date(2021, 3, 1)),
+    ("2021.04", dt.date(2021, 4, 1)),
+    ("15th March 2020", dt.date(2020, 3, 15)),
+    ("March 15, 2020", dt.date(2020, 3, 15)),
+    ("  MAR   2020 ", dt.date(2020, 3, 1)),
+])
+def test_common_formats_skip_dateparser(dateparser, raw, expected):
+    assert normalise_dates(raw) == expected
+    assert dateparser.calls == []
+
+
+@pytest.mark.parametrize("raw", ["Present", "current", "n/a", "", None, "2020-13", "31 Feb 2020"])
+def test_open_ended_empty_and_invalid_values_are_none(dateparser, raw):
+    assert normalise_dates(raw) is None
+    assert dateparser.calls == []
+
+
+def test_unrecognised_strings_fall_back_to_dateparser(dateparser):
+    assert normalise_dates("The spring of 2001") == dt.date(2001, 2, 3)
+    assert normalise_dates("the spring  of 2001") == dt.date(2001, 2, 3)
+    assert dateparser.calls == ["the spring of 2001"]
+
+
+def test_structured_resume_dates_are_parsed_once_per_value():
+    # Raw strings, as they arrive before validation coerces them.
+    resume = StructuredResume.model_construct(education=[], certifications=[], work_experience=[
+        WorkItem.model_construct(company="Acme", title="Engineer", start_date="Jan 2020", end_date="Present"),
+        WorkItem.model_construct(company="Globex", title="Engineer", start_date="Jan 2018", end_date="Jan 2020"),
+    ])
+
+    normalise_structured_dates(resume)
+
+    jobs = resume.work_experience
+    assert (jobs[0].start_date, jobs[0].end_date) == (dt.date(2020, 1, 1), None)
+    assert (jobs[1].start_date, jobs[1].end_date) == (dt.date(2018, 1, 1), dt.date(2020, 1, 1))
+    assert date_cache_info().misses == 2
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from bench.synthetic import resume_text
+from core.dedupe import DEDUPE_THRESHOLD, DuplicateIndex, find_duplicate, minhash, remember_analysis, similarity
+from core.models import AnalysisState, StructuredResume
+
+
+@pytest.fixture(autouse=True)
+def dedupe_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEDUPE", "1")
+    monkeypatch.setenv("DEDUPE_PATH", str(tmp_path / "dedupe.sqlite"))
+
+
+def _analysed(text: str) -> AnalysisState:
+    name = text.splitlines()[0]
+    state = AnalysisState(raw_resume_text=text)
+    state.structured_resume = StructuredResume.model_validate({"contact": {"full_name": name}})
+    state.market_research = "Kubernetes is in demand."
+    state.gap_analysis = "Strong Python, missing Kubernetes."
+    state.final_report = f"Dear {name}, here is your report."
+    return state
+
+
+def test_edited_resume_reuses_the_analysis():
+    original = resume_text(random.Random(1))
+    remember_analysis(_analysed(original))
+    lines = original.splitlines()
+    lines[1] = "new.address@example.org | +44 20 7946 0958 | London, UK"
+    lines.insert(9, "• Ran the on-call rotation.")
+    edited = AnalysisState(raw_resume_text="\n".join(lines))
+
+    find_duplicate(edited)
+
+    assert edited.duplicate_of is not None
+    assert edited.final_report == _analysed(original).final_report
+    assert edited.structured_resume.contact.email == "new.address@example.org"
+
+
+def test_different_resumes_are_not_duplicates():
+    first, second = resume_text(random.Random(1)), resume_text(random.Random(2))
+    assert similarity(minhash(first), minhash(second)) < DEDUPE_THRESHOLD
+    remember_analysis(_analysed(first))
+    state = AnalysisState(raw_resume_text=second)
+
+    find_duplicate(state)
+
+    assert state.duplicate_of is None
+    assert state.final_report is None
+
+
+def test_threshold_decides_the_match(tmp_path):
+    original = resume_text(random.Random(1))
+    edited = original.replace("Summary", "Profile", 1) + "\n• Ran the on-call rotation."
+    score = similarity(minhash(original), minhash(edited))
+    assert DEDUPE_THRESHOLD <= score < 1
+
+    loose = DuplicateIndex(str(tmp_path / "loose.sqlite"), threshold=score)
+    strict = DuplicateIndex(str(tmp_path / "strict.sqlite"), threshold=min(1.0, score + 0.01))
+    for index in (loose, strict):
+        index.add("original", minhash(original), {"final_report": "report"})
+
+    assert loose.find(minhash(edited)).fields == {"final_report": "report"}
+    assert strict.find(minhash(edited)) is None
+
+
+def test_resumes_differing_only_in_name_do_not_share_a_report():
+    original = resume_text(random.Random(1))
+    name = original.splitlines()[0]
+    renamed = original.replace(name, "Zelda Quispe", 1)
+    # The signatures alone cannot tell them apart.
+    assert similarity(minhash(original), minhash(renamed)) >= DEDUPE_THRESHOLD
+    remember_analysis(_analysed(original))
+    state = AnalysisState(raw_resume_text=renamed)
+
+    find_duplicate(state)
+
+    assert state.duplicate_of is None
+    assert state.final_report is None
+    assert state.structured_resume is None
+
+
+def test_disabled_without_dedupe(monkeypatch):
+    text = resume_text(random.Random(1))
+    remember_analysis(_analysed(text))
+    monkeypatch.setenv("DEDUPE", "0")
+    state = AnalysisState(raw_resume_text=text)
+
+    find_duplicate(state)
+
+    assert state.duplicate_of is None
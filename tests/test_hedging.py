@@ -0,0 +1,73 @@
+import time
+
+from core.hedging import HEDGE_DEFAULT_DEADLINE, HEDGE_MIN_SAMPLES, HedgeBudget, LatencyTracker, hedged
+from core.llm import get_llm
+
+
+def _tracker(seconds: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(HEDGE_MIN_SAMPLES):
+        tracker.record("parse.test", seconds)
+    return tracker
+
+
+def _slow(result, seconds):
+    def attempt():
+        time.sleep(seconds)
+        return result
+    return attempt
+
+
+def test_deadline_is_the_percentile_once_there_are_enough_samples():
+    tracker = LatencyTracker()
+    assert tracker.deadline("parse.test") == HEDGE_DEFAULT_DEADLINE
+    for i in range(100):
+        tracker.record("parse.test", i / 100)
+    assert tracker.deadline("parse.test", q=95) == 0.95
+
+
+def test_budget_allows_a_burst_then_earns_credit_per_primary():
+    budget = HedgeBudget(ratio=0.5, burst=1)
+    assert budget.spend()
+    assert not budget.spend()
+    budget.earn()
+    assert not budget.spend()
+    budget.earn()
+    assert budget.spend()
+    assert (budget.primaries, budget.hedges) == (2, 2)
+
+
+def test_slow_primary_is_hedged_after_the_deadline():
+    budget = HedgeBudget(ratio=0, burst=1)
+    started = time.perf_counter()
+
+    result = hedged("parse.test", [_slow("primary", 1), _slow("hedge", 0)], tracker=_tracker(0.05), budget=budget)
+
+    assert result == "hedge"
+    assert budget.hedges == 1
+    assert time.perf_counter() - started < 0.8
+
+
+def test_no_hedge_without_budget():
+    budget = HedgeBudget(ratio=0, burst=0)
+    result = hedged("parse.test", [_slow("primary", 0.2), _slow("hedge", 0)], tracker=_tracker(0.01), budget=budget)
+    assert result == "primary"
+    assert budget.hedges == 0
+
+
+def test_failed_attempt_falls_through_to_the_next():
+    def fails():
+        raise RuntimeError("invalid JSON")
+
+    assert hedged("parse.test", [fails, _slow("second", 0)], tracker=LatencyTracker()) == "second"
+
+
+def test_only_api_calls_are_timed(fakes):
+    tracker = LatencyTracker()
+    hedged("parse.test", [lambda: "cached"], tracker=tracker)
+    assert tracker.percentile("parse.test", 50) is None
+
+    llm = get_llm("fake/model")
+    for _ in range(HEDGE_MIN_SAMPLES):
+        hedged("parse.test", [lambda: llm.complete("Say hi").text], tracker=tracker)
+    assert tracker.percentile("parse.test", 50) is not None
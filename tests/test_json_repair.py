@@ -0,0 +1,54 @@
+from core.utils.json_repair import loads_lenient, repair_json
+
+
+def test_valid_json_is_unchanged():
+    assert loads_lenient('{"a": [1, 2], "b": "x"}') == {"a": [1, 2], "b": "x"}
+
+
+def test_code_fence_and_surrounding_prose():
+    raw = 'Here you go:\n```json\n{"a": 1}\n```\nAnything else?'
+    assert loads_lenient(raw) == {"a": 1}
+
+
+def test_first_complete_value_wins():
+    assert loads_lenient('{"a": 1} and later {"b": 2}') == {"a": 1}
+    assert repair_json('Result: [1, 2] (see also [3])') == "[1, 2]"
+    assert loads_lenient('```json\n{"a": "}"}\n{"b": 2}\n```') == {"a": "}"}
+
+
+def test_trailing_commas_are_removed():
+    assert loads_lenient('{"a": [1, 2,], "b": 3,}') == {"a": [1, 2], "b": 3}
+
+
+def test_commas_inside_strings_are_kept():
+    assert loads_lenient('{"a": "he said, }"') == {"a": "he said, }"}
+    assert loads_lenient('{"name": "a, ]", "k": 1,}') == {"name": "a, ]", "k": 1}
+    assert repair_json('{"a": ",]", "b": [1,],}') == '{"a": ",]", "b": [1]}'
+
+
+def test_escaped_quotes_do_not_end_strings():
+    assert loads_lenient('{"a": "say \\"hi\\", ]", "b": 1,}') == {"a": 'say "hi", ]', "b": 1}
+
+
+def test_truncated_string_value_is_dropped():
+    assert loads_lenient('{"a": {"b": "tru') == {"a": {}}
+    assert loads_lenient('{"email": "jane@exa') == {}
+    assert loads_lenient('{"name": "Jane", "email": "jane@exa') == {"name": "Jane"}
+
+
+def test_truncated_key_is_dropped():
+    assert loads_lenient('{"name": "Jane", "ema') == {"name": "Jane"}
+    assert loads_lenient('{"name": "Jane", "email":') == {"name": "Jane"}
+
+
+def test_truncated_list_keeps_complete_items():
+    assert loads_lenient('{"skills": ["Python", "Go", "Kube') == {"skills": ["Python", "Go"]}
+    assert loads_lenient('[{"a": 1}, {"a": 2}, {"a": "x') == [{"a": 1}, {"a": 2}, {}]
+
+
+def test_truncated_literal_is_dropped():
+    assert loads_lenient('{"a": 1, "b": tru') == {"a": 1}
+
+
+def test_nothing_parseable():
+    assert loads_lenient("no json here") is None
@@ -0,0 +1,88 @@
+import asyncio
+import random
+
+import pytest
+
+from bench.synthetic import resume_text
+from core.models import AnalysisState
+from core.pipeline import PipelineExecutor, Stage
+from core.workflow import PIPELINE_STAGES
+
+
+def _stage(name, reads=(), writes=(), func=None):
+    return Stage(name, func or (lambda state: state), reads=frozenset(reads), writes=frozenset(writes))
+
+
+def test_dependencies_follow_declared_fields():
+    executor = PipelineExecutor([
+        _stage("parse", reads={"raw_resume_text"}, writes={"structured_resume"}),
+        _stage("language", reads={"raw_resume_text"}, writes={"detected_language"}),
+        _stage("research", reads={"structured_resume.skills"}, writes={"market_research"}),
+        _stage("report", reads={"market_research", "detected_language"}, writes={"final_report"}),
+    ])
+
+    assert executor.dependencies == {
+        "parse": set(),
+        "language": set(),
+        "research": {"parse"},
+        "report": {"research", "language"},
+    }
+    assert executor.downstream(["parse"]) == {"parse", "research", "report"}
+
+
+def test_writers_of_the_same_field_keep_declaration_order():
+    executor = PipelineExecutor([
+        _stage("first", writes={"structured_resume.contact.email"}),
+        _stage("second", writes={"structured_resume"}),
+    ])
+    assert executor.dependencies["second"] == {"first"}
+
+
+def test_duplicate_and_unknown_stage_names_are_rejected():
+    with pytest.raises(ValueError):
+        PipelineExecutor([_stage("a"), _stage("a")])
+    with pytest.raises(ValueError):
+        PipelineExecutor([_stage("a")]).downstream(["b"])
+
+
+def test_independent_stages_overlap():
+    started = asyncio.Event()
+
+    async def waits_for_sibling(state):
+        await asyncio.wait_for(started.wait(), timeout=5)
+
+    async def starts(state):
+        started.set()
+
+    executor = PipelineExecutor([
+        _stage("waits", writes={"gap_analysis"}, func=waits_for_sibling),
+        _stage("starts", writes={"market_research"}, func=starts),
+    ])
+    events = []
+    asyncio.run(executor.run(AnalysisState(raw_resume_text=""), on_stage=lambda name, event: events.append((name, event))))
+
+    assert ("waits", "finished") in events and ("starts", "finished") in events
+
+
+def test_failed_stage_fails_the_run():
+    def boom(state):
+        raise RuntimeError("boom")
+
+    executor = PipelineExecutor([_stage("boom", writes={"gap_analysis"}, func=boom)])
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.run(AnalysisState(raw_resume_text="")))
+
+
+def test_agent_chain_runs_on_the_fakes(fakes):
+    executor = PipelineExecutor(PIPELINE_STAGES)
+    state = AnalysisState(raw_resume_text=resume_text(random.Random(5)))
+    events = []
+
+    asyncio.run(executor.run(state, on_stage=lambda name, event: events.append((name, event))))
+    executor.shutdown()
+
+    assert "parse" in executor.dependencies["research"]
+    assert "research" not in executor.downstream(["language"])
+    assert state.structured_resume.contact.full_name == state.raw_resume_text.splitlines()[0]
+    assert state.market_research and state.final_report
+    assert {name for name, event in events if event == "finished"} == {stage.name for stage in PIPELINE_STAGES}
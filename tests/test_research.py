@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from bench.fakes import install_fakes
+from core.research import MarketResearchCache, TavilySearchBackend, research_key
+from core.utils import DiskCache
+
+
+class CountingBackend(TavilySearchBackend):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query, max_results=3):
+        with self._lock:
+            self.calls += 1
+        return super().search(query, max_results)
+
+
+@pytest.fixture
+def cache(fakes, tmp_path):
+    return MarketResearchCache(backend=CountingBackend(), store=DiskCache(str(tmp_path / "cache.sqlite")))
+
+
+def test_profile_key_is_normalised():
+    assert research_key("Sr. Backend Eng", ["python", "Go"]) == research_key("senior backend engineer", ["Go", "Python"])
+    assert research_key("Backend Engineer", ["Go"], "stub") != research_key("Backend Engineer", ["Go"], "tavily")
+
+
+def test_concurrent_identical_lookups_share_one_search(cache):
+    install_fakes(llm_latency=0.01, search_latency=0.3, jitter=0.0)
+    start = threading.Barrier(8)
+    results = []
+
+    def lookup():
+        start.wait()
+        results.append(cache.lookup("Backend Engineer", ["Go", "Python"], "market for Go"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.backend.calls == 1
+    assert len(results) == 8 and len(set(results)) == 1
+
+
+def test_cached_result_is_reused_until_refreshed(cache):
+    first = cache.lookup("Backend Engineer", ["Go"], "market for Go")
+    assert cache.lookup("backend engineer", ["go"], "another query") == first
+    assert cache.backend.calls == 1
+    cache.lookup("Backend Engineer", ["Go"], "market for Go", refresh=True)
+    assert cache.backend.calls == 2
+
+
+def test_failed_search_is_not_cached(cache):
+    def down(query, max_results=3):
+        raise ConnectionError("search backend down")
+
+    cache.backend.search = down
+    with pytest.raises(ConnectionError):
+        cache.lookup("Backend Engineer", ["Go"], "market for Go")
+    del cache.backend.search
+    assert cache.lookup("Backend Engineer", ["Go"], "market for Go")
+    assert cache.backend.calls == 1
@@ -0,0 +1,45 @@
+import random
+
+from bench.synthetic import resume_text
+from core.agents.rule_parser import rule_parse
+
+THRESHOLD = 0.8
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 123 4567
+
+Experience
+Software Engineer | Acme Corp | Jan 2020 - Present
+• Built the billing service.
+Senior Engineer | Globex | Mar 2018 - Dec 2019
+• Ran the on-call rotation.
+Initech | 2015 - 2017
+• Maintained the TPS report generator.
+
+Skills
+Languages: Python, Go
+"""
+
+
+def test_synthetic_resume_is_fully_confident():
+    result = rule_parse(resume_text(random.Random(3), jobs=5, projects=4))
+    assert result.low_confidence_fields(THRESHOLD) == []
+
+
+def test_missing_title_is_left_unset():
+    jobs = rule_parse(RESUME).data["work_experience"]
+    assert jobs[2]["company"] == "Initech"
+    assert "title" not in jobs[2]
+
+
+def test_one_incomplete_item_marks_the_field_low_confidence():
+    result = rule_parse(RESUME)
+    assert "work_experience" in result.low_confidence_fields(THRESHOLD)
+    assert "skills" not in result.low_confidence_fields(THRESHOLD)
+
+
+def test_missing_issuer_is_left_unset():
+    text = RESUME + "\nCertifications\nCertified Kubernetes Administrator | 2021\n"
+    result = rule_parse(text)
+    assert "issuer" not in result.data["certifications"][0]
+    assert "certifications" in result.low_confidence_fields(THRESHOLD)